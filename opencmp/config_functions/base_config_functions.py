@@ -18,8 +18,11 @@
 from .expanded_config_parser import ConfigParser
 from ngsolve import CoefficientFunction, GridFunction, Mesh, Parameter
 from os import path
-from typing import Dict, Union, Optional, List
+from typing import Any, Dict, Union, Optional, List, Set, Tuple
 from .load_config import parse_str
+from ..helpers.expression_compiler import ExpressionCompiler
+import re
+import time
 
 
 class ConfigFunctions:
@@ -67,6 +70,20 @@ class ConfigFunctions:
         # Set the import file path.
         self.import_dir = import_dir
 
+        # The values of re-parsed string expressions together with the time parameters and model variable values they
+        # were evaluated with. Re-parsing an expression with the same objects would give the same coefficientfunctions,
+        # so the cached value is used instead.
+        self._re_parse_cache: Dict[str, Tuple[List[Any], Any]] = {}
+
+        # Compiles the re-parsed expressions if the model compiles its expressions. Set by the model.
+        self.expression_compiler: Optional[ExpressionCompiler] = None
+
+        # Number of re-parsed expressions and cache hits, and the time spent on each.
+        self.re_parses = 0
+        self.re_parse_hits = 0
+        self.re_parse_time = 0.0
+        self.re_parse_hit_time = 0.0
+
     def _find_rel_path_for_file(self, file_name: str) -> str:
         """
         Function to check if a file exists, returning a relative path to it.
@@ -94,6 +111,19 @@ class ConfigFunctions:
 
         return rel_file_path
 
+    @staticmethod
+    def _expression_names(expression: str) -> Set[str]:
+        """
+        Function to get the names (ex: variables, functions, constants) used in a string expression from a config file.
+
+        Args:
+            expression: The string expression.
+
+        Returns:
+            The set of names used in the expression.
+        """
+        return set(re.findall(r'[A-Za-z_]\w*', expression))
+
     def re_parse(self, param_dict: Dict[str, Union[str, float, CoefficientFunction, GridFunction, list]],
                  re_parse_dict: Dict[str, str], t_param: Optional[List[Parameter]],
                  updated_variables: List[Dict[str, Union[int, str, float, CoefficientFunction, GridFunction]]],
@@ -126,10 +156,41 @@ class ConfigFunctions:
                 # variable values.
                 param_dict[key] = [val(t_param, updated_variables, mesh, i) for i in range(len(t_param))]
             else:
+                start_time = time.perf_counter()
+
+                # The coefficientfunctions of the expression refer to the time parameters and model variables
+                # themselves, so they only need to be re-created if any of the objects it uses have been replaced.
+                names = self._expression_names(val)
+                handles = [t_param, mesh] + [var_dict.get(name) for var_dict in updated_variables
+                                             for name in sorted(names.intersection(var_dict.keys()))]
+                cached = self._re_parse_cache.get(val)
+                if cached is not None and len(cached[0]) == len(handles) \
+                        and all(handle is cached_handle for handle, cached_handle in zip(handles, cached[0])):
+                    param_dict[key] = list(cached[1]) if isinstance(cached[1], list) else cached[1]
+                    self.re_parse_hits += 1
+                    self.re_parse_hit_time += time.perf_counter() - start_time
+                    continue
+
                 # Re-parse the string expression and use to replace the parameter value in dict.
                 re_parse_val, variable_eval = parse_str(val, self.import_dir, t_param, updated_variables, mesh=mesh)
+                if self.expression_compiler is not None:
+                    re_parse_val = self.expression_compiler.compile(re_parse_val)
                 param_dict[key] = re_parse_val
 
+                self._re_parse_cache[val] = (handles, list(re_parse_val) if isinstance(re_parse_val, list)
+                                             else re_parse_val)
+                self.re_parses += 1
+                self.re_parse_time += time.perf_counter() - start_time
+
         return param_dict
 
+    def reset_re_parse_counters(self) -> None:
+        """
+        Function to reset the counters of re-parsed expressions and cache hits, ex: at the start of a new solve.
+        """
+        self.re_parses = 0
+        self.re_parse_hits = 0
+        self.re_parse_time = 0.0
+        self.re_parse_hit_time = 0.0
+
 
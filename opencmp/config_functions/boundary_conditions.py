@@ -18,7 +18,8 @@
 from .base_config_functions import ConfigFunctions
 import ngsolve as ngs
 from ngsolve import Parameter, CoefficientFunction, GridFunction, FESpace, Mesh
-from typing import Dict, Tuple, Union, List, Optional
+from ngsolve.comp import ProxyFunction
+from typing import Any, Dict, Tuple, Union, List, Optional
 
 
 class BCFunctions(ConfigFunctions):
@@ -50,6 +51,62 @@ class BCFunctions(ConfigFunctions):
         self.already_warned_about_dirichlet = set()
         self.already_warned_about_pinned = set()
 
+        # The strongly imposed Dirichlet BCs from the last call to set_dirichlet_boundary_conditions, kept so they only
+        # need to be rebuilt when the underlying BC values actually change. dirichlet_time_independent records which
+        # variables have Dirichlet BCs that depend neither on time nor on the model variables.
+        self._g_D: Dict[str, Tuple[List, List[CoefficientFunction]]] = {}
+        self.dirichlet_time_independent: Dict[str, bool] = {}
+
+        # The parsed BC values that depend neither on time nor on the model variables, keyed by BC type, variable, and
+        # mesh marker. Values that replace these later (ex: from a controller) aren't assumed to be time-independent.
+        self._time_independent_values: Dict[Tuple[str, str, str], Any] = self._find_time_independent_values()
+
+    def _find_time_independent_values(self) -> Dict[Tuple[str, str, str], Any]:
+        """
+        Function to find the BC values from the config file that depend neither on time nor on the model variables.
+
+        Expressions that use the model variables or imported Python functions are in the re-parse dictionary. Of the
+        other expressions only those that use the time variable "t" depend on time.
+
+        Returns:
+            Dictionary of the parsed values of the time-independent BCs, keyed by BC type, variable, and mesh marker.
+        """
+        time_independent = {}
+        for section in self.config.sections():
+            bc_type = section.lower()
+            if bc_type not in self.bc_dict:
+                continue
+
+            for var in self.config[section]:
+                re_parse_markers = self.bc_re_parse_dict[bc_type].get(var, {})
+
+                # Split the value string into its "marker -> expression" lines the same way it was parsed.
+                for line in self.config[section][var].replace('\t', '').replace(' ', '').split('\n'):
+                    if '->' not in line:
+                        continue
+                    marker, expression = line.split('->')
+
+                    if marker not in re_parse_markers and 't' not in self._expression_names(expression):
+                        time_independent[(bc_type, var, marker)] = self.bc_dict[bc_type][var][marker]
+
+        return time_independent
+
+    def time_independent(self, bc_type: str, var: str, marker_dict: Dict[str, Any]) -> bool:
+        """
+        Function to check if the BCs of one type for a model variable depend neither on time nor on the model variables.
+
+        Args:
+            bc_type: The type of BC, ex: "dirichlet".
+            var: The model variable the BCs are for.
+            marker_dict: The BC value on each mesh marker.
+
+        Returns:
+            True if none of the BC values can change between time steps.
+        """
+        return all(isinstance(val, GridFunction) or _is_constant(val)
+                   or self._time_independent_values.get((bc_type, var, marker)) is val
+                   for marker, val in marker_dict.items())
+
     def load_bc_gridfunctions(self, bc_dict: Dict, fes: FESpace, model_components: Dict[str, Optional[int]]) -> Dict:
         """
         Function to load any saved gridfunctions that should be used to specify BCs.
@@ -149,7 +206,7 @@ class BCFunctions(ConfigFunctions):
                                           bc_dict: Dict[str, Dict[str, Dict[str, Union[List[CoefficientFunction],
                                                                                        List[list], List[float],
                                                                                        List[GridFunction]]]]],
-                                          mesh: Mesh, gfu: GridFunction, model_components: Dict) \
+                                          mesh: Mesh, trial: List[ProxyFunction], model_components: Dict) \
             -> Dict[str, List[CoefficientFunction]]:
         """
         Function to load the strongly imposed Dirichlet BCs in order to apply them to the solution gridfunction.
@@ -158,12 +215,13 @@ class BCFunctions(ConfigFunctions):
             bc_dict: Dictionary specifying the BCs and their mesh markers for each variable. The BCs are all given as
                 floats, gridfunctions, or coefficientfunctions.
             mesh: The model's mesh.
-            gfu: A gridfunction constructed on the model's finite element space.
+            trial: The model's trial functions, used to get the dimension of each model variable.
             model_components: The model's model_components dictionary.
 
         Returns:
             Dictionary of coefficientfunctions used to set the strongly imposed Dirichlet BCs. Each dictionary entry
             holds a list, which gives the coefficientfunction for each time step in the time discretization scheme.
+            The coefficientfunctions from the previous call are returned again if none of the BC values changed.
         """
 
         # Initialize empty
@@ -189,14 +247,14 @@ class BCFunctions(ConfigFunctions):
                         # will later be overwritten when the other types of boundary conditions are imposed.
                         component = model_components[var]
 
-                        # TODO: This is a hack. There should be a better way of doing this, but ngs.FESpace doesn't seem
-                        #  to have a dim argument that corresponds to the dimension of the space.
+                        # ngs.FESpace doesn't have a dim argument that corresponds to the dimension of the space, but
+                        # the trial functions do.
                         alternate: Union[List[float], List[Tuple]] # Just for type-hinting.
 
-                        if gfu.components[component].dim == 1:
+                        if trial[component].dim == 1:
                             alternate = [0.0 for _ in self.t_param]
                         else:
-                            alternate = [tuple([0.0] * gfu.components[component].dim) for _ in self.t_param]
+                            alternate = [tuple([0.0] * trial[component].dim) for _ in self.t_param]
 
                         val_lst = bc_dict['dirichlet'][var].get(marker, alternate)
 
@@ -205,7 +263,8 @@ class BCFunctions(ConfigFunctions):
                             dirichlet_lst[i].append(val_lst[i])
 
                     # Format the list of mesh markers for the Dirichlet BCs.
-                    g_D[var] = [ngs.CoefficientFunction(tmp) for tmp in dirichlet_lst]
+                    g_D[var] = self._dirichlet_coefficientfunctions(
+                        var, dirichlet_lst, self.time_independent('dirichlet', var, bc_dict['dirichlet'][var]))
 
         if len(bc_dict.get('pinned', {})) > 0:
             for var in bc_dict['pinned']:
@@ -228,12 +287,10 @@ class BCFunctions(ConfigFunctions):
                     # will later be overwritten when the other types of boundary conditions are imposed.
                     component = model_components[var]
 
-                    # TODO: This is a hack. There should be a better way of doing this, but ngs.FESpace doesn't seem
-                    #  to have a dim argument that corresponds to the dimension of the space.
-                    if gfu.components[component].dim == 1:
+                    if trial[component].dim == 1:
                         alternate = [0.0 for _ in self.t_param]
                     else:
-                        alternate = [tuple([0.0] * gfu.components[component].dim) for _ in self.t_param]
+                        alternate = [tuple([0.0] * trial[component].dim) for _ in self.t_param]
 
                     val_lst = bc_dict['pinned'][var].get(marker, alternate)
 
@@ -242,10 +299,37 @@ class BCFunctions(ConfigFunctions):
                         pinned_lst[i].append(val_lst[i])
 
                 # Format the list of mesh markers for the pinned BCs.
-                g_D[var] = [ngs.CoefficientFunction(tmp) for tmp in pinned_lst]
+                g_D[var] = self._dirichlet_coefficientfunctions(
+                    var, pinned_lst, self.time_independent('pinned', var, bc_dict['pinned'][var]))
 
         return g_D
 
+    def _dirichlet_coefficientfunctions(self, var: str, val_lst: List[List], time_independent: bool) \
+            -> List[CoefficientFunction]:
+        """
+        Function to combine the per-marker values of a strongly imposed BC into one coefficientfunction per time step.
+
+        The coefficientfunctions are only rebuilt if the values differ from those used in the previous call. Re-parsed
+        expressions come from the re-parse cache, so the values of BCs that depend on time or on the model variables are
+        usually the same objects from one time step to the next.
+
+        Args:
+            var: The model variable the BC is for.
+            val_lst: List of the values of the BC on each mesh marker, for each time step.
+            time_independent: If the values depend neither on time nor on the model variables.
+
+        Returns:
+            List of coefficientfunctions, one for each time step in the time discretization scheme.
+        """
+        if var in self._g_D and _same_value(self._g_D[var][0], val_lst):
+            return self._g_D[var][1]
+
+        cf_lst = [ngs.CoefficientFunction(tmp) for tmp in val_lst]
+        self._g_D[var] = (val_lst, cf_lst)
+        self.dirichlet_time_independent[var] = time_independent
+
+        return cf_lst
+
     def update_boundary_conditions(self, t_param: List[Parameter],
                                    updated_variables: List[Dict[str, Union[float, CoefficientFunction, GridFunction]]],
                                    mesh: Mesh) -> None:
@@ -263,3 +347,43 @@ class BCFunctions(ConfigFunctions):
             for k2, v2 in self.bc_re_parse_dict[k1].items():
                 self.bc_dict[k1][k2] = self.re_parse(self.bc_dict[k1][k2], self.bc_re_parse_dict[k1][k2],
                                                      t_param,updated_variables, mesh)
+
+
+def _is_constant(val: Any) -> bool:
+    """
+    Function to check if a (possibly nested list of) BC value is made of numbers only.
+
+    Args:
+        val: The value.
+
+    Returns:
+        True if the value only contains numbers.
+    """
+    if isinstance(val, (list, tuple)):
+        return all(_is_constant(item) for item in val)
+    else:
+        return isinstance(val, (int, float))
+
+
+def _same_value(val_1: Any, val_2: Any) -> bool:
+    """
+    Function to check if two (possibly nested lists of) BC values are the same.
+
+    Coefficientfunctions and gridfunctions are compared by identity since comparing them with == gives a new
+    coefficientfunction instead of a boolean.
+
+    Args:
+        val_1: The first value.
+        val_2: The second value.
+
+    Returns:
+        True if the values are the same.
+    """
+    if val_1 is val_2:
+        return True
+    elif isinstance(val_1, (list, tuple)) and isinstance(val_2, (list, tuple)):
+        return len(val_1) == len(val_2) and all(_same_value(item_1, item_2) for item_1, item_2 in zip(val_1, val_2))
+    elif isinstance(val_1, (int, float)) and isinstance(val_2, (int, float)):
+        return val_1 == val_2
+    else:
+        return False
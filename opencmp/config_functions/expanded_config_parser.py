@@ -30,22 +30,43 @@ config_defaults: Dict = {
                              'interpolant_order': 'REQUIRED',
                              'no_constrained_dofs': False},
     'DG': {'DG': False,
+           'HDG': False,
            'interior_penalty_coefficient': 10.0},
     'SOLVER': {'linear_solver': 'default',
                'preconditioner': 'default',
+               'velocity_preconditioner': 'default',
+               'preconditioner_update_interval': 1,
+               'preconditioner_iteration_growth': 0.0,
+               'preconditioner_dt_change': 0.0,
                'linear_tolerance': 1e-15,
                'linear_max_iterations': 100,
+               'zero_guess_reference': False,
+               'static_condensation': False,
+               'reuse_factorization': True,
+               'numeric_refactorization': True,
+               'factorization_cache_size': 1,
+               'factorization_cache_memory': 0.0,
+               'split_bilinear_forms': False,
                'linearization_method': 'Oseen',
                'nonlinear_solver': 'default',
                'nonlinear_tolerance': {'absolute': 0.0, 'relative': 'REQUIRED'},
-               'nonlinear_max_iterations': 10},
+               'nonlinear_max_iterations': 10,
+               'mixing_parameter': 0.0,
+               'anderson_vectors': 5,
+               'anderson_regularization': 0.01,
+               'adaptive_linear_tolerance': False},
     'TRANSIENT': {'transient': False,
                   'scheme': 'implicit euler',
                   'time_range': [0.0, 5.0],
                   'dt': 0.001,
                   'dt_tolerance': {'absolute': 0.0, 'relative': 'REQUIRED'},
                   'dt_range': [1e-6, 0.1],
-                  'maximum_rejected_solves': 1000},
+                  'maximum_rejected_solves': 1000,
+                  'dt_ladder_steps': 0,
+                  'dt_controller_gains': [0.7, 0.4],
+                  'predictor_order': 0,
+                  'steady_state_tolerance': {'absolute': 0.0, 'relative': 0.0},
+                  'steady_state_check_interval': 10},
     'ERROR ANALYSIS': {'check_error': False,
                        'check_error_every_timestep': False,
                        'save_error_every_timestep': False,
@@ -58,6 +79,9 @@ config_defaults: Dict = {
               'component_names': [],
               'parameter_names': [],
               'velocity_fixed': False,
+              'compile_expressions': False,
+              'realcompile_expressions': False,
+              'parse_cache_dir': '',
               'run_dir': 'REQUIRED'},
     'VISUALIZATION': {'save_to_file': False,
                       'save_type': '.sol',
@@ -25,14 +25,47 @@
 ########################################################################################################################
 
 import pyparsing as pp
+import hashlib
+import importlib.util
+import inspect
+import json
+import logging
 import math
+import os
 import ngsolve as ngs
 from ngsolve import Mesh, Parameter, CoefficientFunction
 import operator
-from typing import List, Tuple, Union, Dict, Any, Optional, Callable
+from pathlib import Path
+from typing import List, Tuple, Union, Dict, Any, Optional, Callable, Set
 from ..helpers.math import tanh, sig, H_s, ramp_cos
 import sys
 
+# The parsed arithmetic operations of every string that has been parsed, so that strings that are parsed again (ex: to
+# re-evaluate them at every time step or with new model variable values) don't need to be tokenized again.
+_parsed_expressions: Dict[str, List[Union[str, Tuple[str, int]]]] = {}
+
+# The strings whose parsed arithmetic operations are already in the file written by save_parsed_expressions.
+_stored_expressions: Set[str] = set()
+
+# The strings parsed or evaluated by this process. These are kept when save_parsed_expressions has to drop stored
+# parsed expressions to stay within _MAX_STORED_EXPRESSIONS.
+_used_expressions: Set[str] = set()
+
+# Maximum number of parsed expressions stored in one file, so a directory shared by many runs doesn't grow without
+# bound. The parsed expressions that were stored least recently are dropped first.
+_MAX_STORED_EXPRESSIONS = 10000
+
+# Version of the format of the parsed arithmetic operations. Must be increased whenever the evaluation of the parsed
+# arithmetic operations changes so that parsed expressions stored on disk by older versions aren't used.
+_PARSED_EXPRESSIONS_VERSION = 1
+
+# The parser is only created once. It parses into _parser_stack, which is copied after every parse.
+_parser: Optional[Any] = None
+_parser_stack: List[Union[str, Tuple[str, int]]] = []
+
+# The imported files of Python functions, keyed by their paths, and the hashes of their contents when imported.
+_imported_files: Dict[str, Tuple[str, Any]] = {}
+
 
 def parse_to_arith(expr_stack: List[Union[str, Tuple[str, int]]]) -> Any:
     """
@@ -248,8 +281,7 @@ def evaluate_arith_stack(stack: List[Union[str, Tuple[str, int]]], import_dir: s
 
         # Confirm that the import file exists and import it, then import the desired method from it. Evaluate the method
         # using the current values of the new variables to obtain an initial value.
-        sys.path.append(import_dir)
-        import import_functions
+        import_functions = _import_functions(import_dir)
 
         variable_eval = getattr(import_functions, import_name)
         assert callable(variable_eval)
@@ -268,6 +300,190 @@ def evaluate_arith_stack(stack: List[Union[str, Tuple[str, int]]], import_dir: s
             return float(op), variable_eval
 
 
+def _parse(string: str) -> List[Union[str, Tuple[str, int]]]:
+    """
+    Parse a string into the list of arithmetic operations evaluated by evaluate_arith_stack.
+
+    Args:
+        string: The string of interest.
+
+    Returns:
+        The parsed arithmetic operations.
+    """
+    global _parser
+
+    if _parser is None:
+        _parser = parse_to_arith(_parser_stack)
+
+    _parser_stack.clear()
+    _parser.parseString(string, parseAll=True)
+
+    return list(_parser_stack)
+
+
+def _import_functions(import_dir: str) -> Any:
+    """
+    Import the file of Python functions from the main run directory.
+
+    The file is imported again if its contents have changed since it was last imported, ex: when runs of a parameter
+    sweep in the same Python session use different versions of the file.
+
+    Args:
+        import_dir: The path to the main run directory containing the file from which to import any Python functions.
+
+    Returns:
+        The imported module.
+    """
+    # The imported file may import other files from the main run directory.
+    if import_dir not in sys.path:
+        sys.path.append(import_dir)
+
+    file_name = os.path.join(import_dir, 'import_functions.py')
+    if not os.path.isfile(file_name):
+        # Use whichever import_functions module can be found.
+        import import_functions
+        return import_functions
+
+    with open(file_name, 'rb') as f:
+        content_hash = hashlib.sha256(f.read()).hexdigest()
+
+    imported = _imported_files.get(os.path.abspath(file_name))
+    if imported is None or imported[0] != content_hash:
+        spec = importlib.util.spec_from_file_location('import_functions', file_name)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        imported = (content_hash, module)
+        _imported_files[os.path.abspath(file_name)] = imported
+
+    return imported[1]
+
+
+def _parsed_expressions_file(cache_dir: str) -> str:
+    """
+    Get the path of the file holding the parsed expressions stored in the given directory.
+
+    The name of the file contains a hash of the parser, so a different parser never uses the parsed expressions stored
+    by another.
+
+    Args:
+        cache_dir: The directory the parsed expressions are stored in.
+
+    Returns:
+        The path of the file.
+    """
+    try:
+        parser_source = inspect.getsource(parse_to_arith)
+    except OSError:
+        parser_source = ''
+
+    parser_hash = hashlib.sha256('{}\n{}\n{}'.format(_PARSED_EXPRESSIONS_VERSION, pp.__version__,
+                                                       parser_source).encode()).hexdigest()
+
+    return os.path.join(cache_dir, 'parsed_expressions_{}.json'.format(parser_hash[:16]))
+
+
+def _read_parsed_expressions(file_name: str) -> Dict[str, List[Union[str, Tuple[str, int]]]]:
+    """
+    Read the parsed expressions stored in a file by save_parsed_expressions.
+
+    A file that can't be read or doesn't hold a dictionary of parsed arithmetic operations is ignored, the expressions
+    then just get parsed again.
+
+    Args:
+        file_name: The path of the file.
+
+    Returns:
+        The parsed expressions in the order they were stored, empty if the file couldn't be used.
+    """
+    try:
+        with open(file_name, 'r') as f:
+            stored_expressions = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logging.warning('Could not load the parsed expressions from {}: {}'.format(file_name, e))
+        return {}
+
+    if not isinstance(stored_expressions, dict) \
+            or not all(isinstance(string, str) and isinstance(expr_stack, list)
+                       and all(isinstance(item, (str, list)) for item in expr_stack)
+                       for string, expr_stack in stored_expressions.items()):
+        logging.warning('Could not load the parsed expressions from {}: unexpected contents.'.format(file_name))
+        return {}
+
+    # JSON stores the (function, number of arguments) tuples as lists.
+    return {string: [tuple(item) if isinstance(item, list) else item for item in expr_stack]
+            for string, expr_stack in stored_expressions.items()}
+
+
+def load_parsed_expressions(cache_dir: str) -> int:
+    """
+    Load parsed expressions stored by earlier runs, so that those expressions don't need to be parsed again.
+
+    The parsed expressions are keyed by the strings themselves. They only hold the arithmetic operations, any values
+    (time parameters, model variables, imported Python functions) are still looked up whenever they are evaluated.
+
+    Args:
+        cache_dir: The directory the parsed expressions are stored in.
+
+    Returns:
+        The number of stored parsed expressions.
+    """
+    stored_expressions = _read_parsed_expressions(_parsed_expressions_file(cache_dir))
+
+    for string, expr_stack in stored_expressions.items():
+        if string not in _parsed_expressions:
+            _parsed_expressions[string] = expr_stack
+        _stored_expressions.add(string)
+
+    return len(stored_expressions)
+
+
+def save_parsed_expressions(cache_dir: str) -> int:
+    """
+    Store the parsed expressions so that later runs can load them with load_parsed_expressions.
+
+    The parsed expressions used by this run are added to those already in the file. If that makes more than
+    _MAX_STORED_EXPRESSIONS, the ones that were stored least recently are dropped.
+
+    Runs that store parsed expressions in the same directory at the same time may drop each other's new parsed
+    expressions, since each writes the file it merged with what it read. This only means that those expressions get
+    parsed again by later runs.
+
+    Args:
+        cache_dir: The directory to store the parsed expressions in.
+
+    Returns:
+        The number of parsed expressions that weren't stored yet.
+    """
+    num_new_expressions = len([string for string in _parsed_expressions if string not in _stored_expressions])
+    if num_new_expressions == 0:
+        return 0
+
+    # Other runs (ex: of the same parameter sweep) may have stored parsed expressions since they were last loaded. The
+    # parsed expressions used by this run are moved to the end, which holds the most recently stored ones.
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    file_name = _parsed_expressions_file(cache_dir)
+    stored_expressions = _read_parsed_expressions(file_name)
+    for string in _used_expressions:
+        stored_expressions.pop(string, None)
+        stored_expressions[string] = _parsed_expressions[string]
+
+    num_dropped = max(len(stored_expressions) - _MAX_STORED_EXPRESSIONS, 0)
+    stored_expressions = dict(list(stored_expressions.items())[num_dropped:])
+
+    # Write to a temporary file first so that runs loading the file at the same time never see a partial file.
+    tmp_file_name = '{}.{}.tmp'.format(file_name, os.getpid())
+    with open(tmp_file_name, 'w') as f:
+        json.dump(stored_expressions, f)
+    os.replace(tmp_file_name, file_name)
+
+    _stored_expressions.update(_parsed_expressions)
+
+    return num_new_expressions
+
+
 def eval_item(string: str, import_dir: str, t_param: Optional[List[Parameter]], new_variables: List[Dict[str, Any]],
               mesh: Optional[Mesh] = None, time_step: Optional[int] = None) \
         -> Tuple[Union[str, float, CoefficientFunction, bool, None], Union[str, bool, Callable]]:
@@ -294,8 +510,12 @@ def eval_item(string: str, import_dir: str, t_param: Optional[List[Parameter]],
     # parse_to_arith sets up expr_stack to contain the parsed string as a nested list of strings corresponding to
     # different operations with the operations in the correct order of operations. Then evaluate_arith_stack is called
     # recursively on expr_stack to actually evaluate all of these nested lists.
-    expr_stack: Any = []
-    parse_to_arith(expr_stack).parseString(string, parseAll=True)
+    expr_stack = _parsed_expressions.get(string)
+    if expr_stack is None:
+        expr_stack = _parse(string)
+        _parsed_expressions[string] = expr_stack
+    _used_expressions.add(string)
+
     val, variable_eval = evaluate_arith_stack(expr_stack[:], import_dir, t_param, new_variables, mesh, time_step)
 
     if callable(variable_eval):
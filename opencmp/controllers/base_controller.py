@@ -69,30 +69,49 @@ class Controller(ABC):
         # [[name_1, pos_1, val_1, index_1],[...],...]
         self.vars_control = self.config_func.get_control_variables()
 
-    def _apply_dynamics_equation(self, next_control_action: float, prev_control_action: float, t_param: Parameter)\
-            -> CoefficientFunction:
+    def _create_dynamics_equation(self, control_action: float, t_param: Parameter) \
+            -> Tuple[CoefficientFunction, List[Parameter]]:
         """
-        Function add dynamics to the transition between two control actions.
+        Function to create the transition between two control actions.
+
+        The transition is a coefficientfunction of parameters, so a new control action only needs to change the values
+        of the parameters instead of replacing the coefficientfunction (and every weak form that uses it).
 
         Args:
-            next_control_action: float representing the new control action
-            prev_control_action: float representing the previous control action
+            control_action: float representing the initial control action
             t_param: Parameter representing time
 
         Return:
-            ~: Coefficient function
+            Tuple[CoefficientFunction, List[Parameter]]:
+                - The coefficientfunction of the transition.
+                - The parameters holding the new control action, the difference between the previous and the new
+                  control action, and the time of the control action. Used by _set_dynamics_equation.
         """
+        next_control_action = Parameter(control_action)
+        delta_control_action = Parameter(0.0)
+        t_control_action = Parameter(t_param.Get())
 
-        # TODO: add more documentation, espcially with the t_param - t_param.Get()
-        # TODO: rename delta_... to make the equation more readable
+        # Shift exponential so that t=0 is defined as the time of the control action
+        t_zeroed = t_param - t_control_action
 
-        # Define helper variable to make equation easier to read
-        delta_control_action = prev_control_action - next_control_action
+        return CoefficientFunction(next_control_action + delta_control_action * exp(- t_zeroed / self.tau)), \
+            [next_control_action, delta_control_action, t_control_action]
 
-        # Shift exponential so that t=0 is defined as the present
-        t_zeroed = t_param - t_param.Get()
+    @staticmethod
+    def _set_dynamics_equation(params: List[Parameter], next_control_action: float, prev_control_action: float,
+                               t_param: Parameter) -> None:
+        """
+        Function to start a new transition between two control actions, starting at the current time.
 
-        return CoefficientFunction(next_control_action + delta_control_action * exp(- t_zeroed / self.tau))
+        Args:
+            params: The parameters of the transition returned by _create_dynamics_equation
+            next_control_action: float representing the new control action
+            prev_control_action: float representing the previous control action
+            t_param: Parameter representing time
+        """
+        params[0].Set(next_control_action)
+        params[1].Set(prev_control_action - next_control_action)
+        params[2].Set(t_param.Get())
 
     def _evaluate_control_variables(self, soln: GridFunction) -> List[Tuple[float]]:
         """
@@ -147,6 +166,19 @@ class Controller(ABC):
         """
         self.t_next_action += self.dt_control
 
+    def get_manipulated_bcs(self) -> Dict[str, Dict[str, Dict[str, List[Optional[CoefficientFunction]]]]]:
+        """
+        Function to get the values that the BCs representing the manipulated variables should be replaced with once,
+        before the first control action.
+
+        Controllers that act by changing the values of parameters used in these BC values don't need to replace the BCs
+        again afterwards.
+
+        Return:
+            bc_dict_patch: Dictionary containing new values for the BCs representing the manipulated variables
+        """
+        return {}
+
     @abstractmethod
     def calculate_control_action(self, soln: GridFunction, rk_scheme: bool)\
             -> Dict[str, Dict[str, Dict[str, List[Optional[CoefficientFunction]]]]]:
@@ -158,5 +190,6 @@ class Controller(ABC):
             rk_scheme: bool indicating if the time scheme being used is an RK scheme, and thus requiring the
                 recalculation of control actions for all values in t_params
         Return:
-            bc_dict_patch: Dictionary containing new values for the BCs representing the manipulated variables
+            bc_dict_patch: Dictionary containing new values for the BCs representing the manipulated variables. Empty if
+                the control action only changed the values of parameters used in the BCs.
         """
@@ -58,6 +58,15 @@ class ControllerGroup:
 
             self.controllers.append(get_controller(controller_type, t_params, model, controller_rel_path))
 
+        # The controllers act by changing the values of parameters used in the BCs of the manipulated variables, so
+        # those BCs only need to be replaced once, before the weak forms are created.
+        bc_dict_patch: Dict[str, Dict[str, Dict[str, List[Optional[CoefficientFunction]]]]] = {}
+        for controller in self.controllers:
+            bc_dict_patch = merge_bc_dict(bc_dict_patch, controller.get_manipulated_bcs())
+
+        if len(bc_dict_patch) > 0:
+            model.update_bcs(bc_dict_patch)
+
     def calculate_control_all_actions(self, soln: GridFunction, rk_scheme: bool = False) \
             -> Dict[str, Dict[str, Dict[str, List[Optional[CoefficientFunction]]]]]:
         """
@@ -74,7 +83,8 @@ class ControllerGroup:
                 recalculation of control actions for all values in t_params
 
         Return:
-            bc_dict_patch: Dictionary containing new values for the BCs representing the manipulated variables
+            bc_dict_patch: Dictionary containing new values for the BCs representing the manipulated variables. Empty if
+                the control actions only changed the values of parameters used in the BCs.
         """
         bc_dict_patch: Dict[str, Dict[str, Dict[str, List[Optional[CoefficientFunction]]]]] = {}
 
@@ -69,6 +69,20 @@ class PID(Controller):
         else:
             raise ValueError('Specified BC value does exist')
 
+        # The manipulated BC follows the control actions through parameters, so a control action only needs to change
+        # their values. The last entry of t_params is never given a control action (see calculate_control_action).
+        self.control_actions: List[CoefficientFunction] = []
+        self.control_action_params: List[List[Parameter]] = []
+        for t_param in self.t_params[:-1]:
+            control_action, params = self._create_dynamics_equation(self.prev_control_action_val, t_param)
+            self.control_actions.append(control_action)
+            self.control_action_params.append(params)
+
+    def get_manipulated_bcs(self) -> Dict[str, Dict[str, Dict[str, List[Optional[CoefficientFunction]]]]]:
+        tmp_list: List[Optional[CoefficientFunction]] = [*self.control_actions, None]
+
+        return {self.bc_type: {self.bc_var: {self.bc_location: tmp_list}}}
+
     def calculate_control_action(self, soln: GridFunction, rk_scheme: bool) \
             -> Dict[str, Dict[str, Dict[str, List[Optional[CoefficientFunction]]]]]:
 
@@ -108,31 +122,22 @@ class PID(Controller):
             # Derivative portion
             control_action_val += self.K_c * self.tau_D * self._error_derivative()
 
-            tmp_list: List[Optional[CoefficientFunction]] = [None for _ in range(len(self.t_params))]
-
             if rk_scheme:
                 # TODO: Expand on below comments
                 # Do not use the last entry for t_params for an RK scheme.
                 for i in range(len(self.t_params)-1):
-                    control_action = self._apply_dynamics_equation(control_action_val, self.prev_control_action_val,
-                                                                   self.t_params[i])
-                    tmp_list[i] = control_action
+                    self._set_dynamics_equation(self.control_action_params[i], control_action_val,
+                                                self.prev_control_action_val, self.t_params[i])
 
             else:
                 # Rather than a perfect step change, the control action now follows a smoothed step change
-                control_action = self._apply_dynamics_equation(control_action_val, self.prev_control_action_val,
-                                                               self.t_params[0])
-
-                tmp_list[0] = control_action
+                self._set_dynamics_equation(self.control_action_params[0], control_action_val,
+                                            self.prev_control_action_val, self.t_params[0])
 
-            # TODO: add to the correct location, merge correctly
-            # TODO: for RK scheme, all BUT THE LAST positions get filled in
-            # len(BC_list) == scheme_order + 1
-            # DO NOT add values to BC_list[end]
+            # The BC values from get_manipulated_bcs now follow the new control action, so the BCs don't need to be
+            # replaced and control_action_dict stays empty.
             # if RK and self.scheme_order == 3 [ca_1, ca_2, ca_3, None] -> [t^n_1, t^int_2, t^int_1, t^n]
-            # if not RK only modify BC_list[0]
-            # Package control action into format needed to apply as BC
-            control_action_dict = {self.bc_type: {self.bc_var: {self.bc_location: tmp_list}}}
+            # if not RK only BC_list[0] follows the control actions
 
             # Store this control action for later use
             self.prev_control_action_val = control_action_val
@@ -0,0 +1,230 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+import math
+import numpy as np
+from scipy.linalg import solve_triangular
+from typing import List, Optional
+
+"""
+Module for accelerating fixed-point iterations with Anderson mixing.
+"""
+
+
+class AndersonAccelerator:
+    """
+    Class to accelerate a fixed-point iteration x = g(x) with Anderson mixing.
+
+    Each update takes the current iterate x and its residual f = g(x) - x and replaces x with the mixed iterate. The
+    step taken and the change in the residual of the last keep_vectors iterations are kept in a ring buffer, and the
+    Gram matrix of the residual changes is updated one row and column at a time instead of being rebuilt. Cholesky
+    factors of the Gram matrix and of its regularized version are also updated incrementally, oldest entry first, so
+    the conditioning is read off the diagonal of the first and the mixing coefficients are found by forward and back
+    substitution with the second. The mixing follows V. Eyert, J. Comp. Phys. 124 (1996) 271.
+
+    All arrays are allocated once per problem size, so the updates themselves don't allocate any vector-sized memory.
+    """
+
+    def __init__(self, keep_vectors: int = 5, regularization: float = 0.01, mixing_parameter: float = 0.0,
+                 singular_tolerance: float = 1e-6) -> None:
+        """
+        Initializer
+
+        Args:
+            keep_vectors: The number of previous iterations to mix.
+            regularization: Regularization of the Gram matrix for numerical stability, usually on the order of 0.01.
+            mixing_parameter: How much of the residual to add to the iterate, related to the Jacobian by
+                J ~ -1/mixing_parameter. Values <= 0 estimate it from the size of the first residual.
+            singular_tolerance: The mixing history is discarded once the determinant of the Gram matrix, scaled to have
+                a unit diagonal, drops below this value. The determinant is the product of the squared diagonal of the
+                Cholesky factor divided by the diagonal of the Gram matrix.
+        """
+        if keep_vectors < 1:
+            raise ValueError('Anderson mixing must keep at least one vector.')
+
+        self.keep_vectors = keep_vectors
+        self.regularization = regularization
+        self.mixing_parameter = mixing_parameter
+        self.singular_tolerance = singular_tolerance
+
+        self.size: Optional[int] = None
+        self.reset(0)
+
+    def reset(self, size: int) -> None:
+        """
+        Function to start a new fixed-point iteration.
+
+        Args:
+            size: The length of the iterates, the arrays are only re-allocated if it changed.
+        """
+        if size != self.size:
+            self._allocate(size)
+
+        self.alpha: Optional[float] = None
+        self._num_vectors = 0
+        self._head = 0
+        self._has_previous = False
+
+    def update(self, x: np.ndarray, f: np.ndarray) -> None:
+        """
+        Function to replace the current iterate by the mixed iterate.
+
+        Args:
+            x: The current iterate, modified in place.
+            f: The residual of the current iterate, g(x) - x.
+        """
+        if self.alpha is None:
+            if self.mixing_parameter > 0.0:
+                self.alpha = self.mixing_parameter
+            else:
+                # Based on the dominant eigenvalue estimate of the SciPy mixing solvers, which don't exceed 1 either.
+                f_norm = np.linalg.norm(f)
+                self.alpha = min(1.0, 0.5 * max(1.0, np.linalg.norm(x)) / f_norm) if f_norm > 0.0 else 1.0
+
+        if self._has_previous:
+            if self._num_vectors == self.keep_vectors:
+                # The oldest entry is about to be overwritten, it is the first one in the Cholesky factors.
+                _drop_first(self._chol_gram, self._num_vectors)
+                _drop_first(self._chol_mat, self._num_vectors)
+                self._num_vectors -= 1
+
+            # The previous step and the change in the residual it caused replace the oldest entry of the ring buffer.
+            slot = self._head
+            self._dx_hist[slot] = self._dx
+            np.subtract(f, self._f_prev, out=self._df_hist[slot])
+            self._head = (self._head + 1) % self.keep_vectors
+            self._num_vectors += 1
+
+            # Only the row and column of the new entry change in the Gram matrix.
+            num = self._num_vectors
+            np.dot(self._df_hist[:num], self._df_hist[slot], out=self._gram_col[:num])
+            self._gram[slot, :num] = self._gram_col[:num]
+            self._gram[:num, slot] = self._gram_col[:num]
+
+            # The ring buffer slots from the oldest to the newest entry, the order of the Cholesky factors.
+            order = self._order(num)
+            col = self._gram[order[:-1], slot]
+            _append(self._chol_gram, num - 1, col, self._gram[slot, slot])
+            _append(self._chol_mat, num - 1, col, self._gram[slot, slot] * (1.0 + self.regularization ** 2))
+
+            # The determinant of the Gram matrix after scaling its diagonal to one only measures how close to linearly
+            # dependent the residual changes are and not how small they are. NOTE: The comparison is written so that
+            # NaN values from a residual change of zero also start the mixing over.
+            pivots = self._chol_gram.diagonal()[:num]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scaled_det = np.prod(pivots ** 2 / self._gram[order, order])
+            if not scaled_det >= self.singular_tolerance:
+                self._num_vectors = 0
+                self._head = 0
+                np.multiply(self.alpha, f, out=self._dx)
+            else:
+                rhs = self._rhs[:num]
+                np.dot(self._df_hist[:num], f, out=rhs)
+                mat = self._chol_mat[:num, :num]
+                gamma = solve_triangular(mat, rhs[order], lower=True)
+                gamma = solve_triangular(mat, gamma, lower=True, trans='T')
+                self._gamma[order] = gamma
+
+                # dx = alpha * f - sum_k gamma_k * (dx_k + alpha * df_k)
+                np.dot(self._gamma[:num], self._df_hist[:num], out=self._dx)
+                np.subtract(f, self._dx, out=self._dx)
+                self._dx *= self.alpha
+                np.dot(self._gamma[:num], self._dx_hist[:num], out=self._work)
+                self._dx -= self._work
+        else:
+            np.multiply(self.alpha, f, out=self._dx)
+            self._has_previous = True
+
+        self._f_prev[:] = f
+        x += self._dx
+
+    def _order(self, num: int) -> List[int]:
+        """
+        Function to get the ring buffer slots of the entries from the oldest to the newest.
+
+        Args:
+            num: The number of entries.
+
+        Returns:
+            The slots of the entries.
+        """
+        start = (self._head - num) % self.keep_vectors
+        return [(start + i) % self.keep_vectors for i in range(num)]
+
+    def _allocate(self, size: int) -> None:
+        """
+        Function to allocate the ring buffers and work arrays.
+
+        Args:
+            size: The length of the iterates.
+        """
+        self.size = size
+
+        self._dx_hist = np.zeros((self.keep_vectors, size))
+        self._df_hist = np.zeros((self.keep_vectors, size))
+        self._dx = np.zeros(size)
+        self._f_prev = np.zeros(size)
+        self._work = np.zeros(size)
+
+        self._gram = np.zeros((self.keep_vectors, self.keep_vectors))
+        self._chol_gram = np.zeros((self.keep_vectors, self.keep_vectors))
+        self._chol_mat = np.zeros((self.keep_vectors, self.keep_vectors))
+        self._gram_col = np.zeros(self.keep_vectors)
+        self._rhs = np.zeros(self.keep_vectors)
+        self._gamma = np.zeros(self.keep_vectors)
+
+
+def _append(chol: np.ndarray, num: int, col: np.ndarray, diag: float) -> None:
+    """
+    Function to add a row and column to a matrix given by its lower triangular Cholesky factor.
+
+    Args:
+        chol: The Cholesky factor, its leading num x num block is updated in place to the (num + 1) x (num + 1) factor.
+        num: The size of the matrix before the row and column are added.
+        col: The off-diagonal entries of the new column.
+        diag: The diagonal entry of the new column.
+    """
+    if num > 0:
+        chol[num, :num] = solve_triangular(chol[:num, :num], col, lower=True)
+    chol[num, num + 1:] = 0.0
+
+    # A residual change that depends linearly on the others leaves nothing for the new diagonal entry.
+    chol[num, num] = math.sqrt(max(diag - np.dot(chol[num, :num], chol[num, :num]), 0.0))
+
+
+def _drop_first(chol: np.ndarray, num: int) -> None:
+    """
+    Function to remove the first row and column of a matrix given by its lower triangular Cholesky factor.
+
+    The remaining matrix is the trailing block of the old one, L_22 L_22^T + l l^T, so its factor is a rank one update of
+    L_22 done with Givens rotations.
+
+    Args:
+        chol: The Cholesky factor, its leading num x num block is updated in place to the (num - 1) x (num - 1) factor.
+        num: The size of the matrix before the row and column are removed.
+    """
+    vec = chol[1:num, 0].copy()
+    chol[:num - 1, :num - 1] = chol[1:num, 1:num]
+    chol[num - 1, :num] = 0.0
+    chol[:num, num - 1] = 0.0
+
+    for k in range(num - 1):
+        r = math.hypot(chol[k, k], vec[k])
+        c = r / chol[k, k]
+        s = vec[k] / chol[k, k]
+        chol[k, k] = r
+        chol[k + 1:num - 1, k] = (chol[k + 1:num - 1, k] + s * vec[k + 1:num - 1]) / c
+        vec[k + 1:num - 1] = c * vec[k + 1:num - 1] - s * chol[k + 1:num - 1, k]
@@ -15,7 +15,7 @@
 # <https://www.gnu.org/licenses/>.                                                                                     #
 ########################################################################################################################
 
-from ngsolve import CoefficientFunction, Grad
+from ngsolve import CoefficientFunction, Grad, InnerProduct
 from ngsolve.comp import ProxyFunction
 
 
@@ -81,3 +81,18 @@ def grad_avg(q: CoefficientFunction) -> CoefficientFunction:
         return 0.5 * (Grad(q) + Grad(q.Other()))
     else:
         return 0.5 * (Grad(q) + Grad(q).Other())
+
+
+def tangential(q: CoefficientFunction, n: CoefficientFunction) -> CoefficientFunction:
+    """
+    Returns the tangential component of a vector field.
+
+    Args:
+        q: The vector field.
+        n: The unit normal.
+
+    Returns:
+        The component of q tangential to every facet of the mesh.
+    """
+
+    return q - InnerProduct(q, n) * n
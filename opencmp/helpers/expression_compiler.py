@@ -0,0 +1,159 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+import logging
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from ngsolve import CoefficientFunction, GridFunction, Parameter
+from ngsolve.comp import ProxyFunction
+
+"""
+Module for compiling the coefficientfunctions parsed from the config files.
+"""
+
+
+class ExpressionCompiler:
+    """
+    Class to compile the coefficientfunctions of model functions, model parameters, BCs, and reference solutions.
+
+    Expressions parsed from the config files become trees of coefficientfunctions that are interpreted node by node at
+    every integration point of every assembly. Compiling a tree turns it into a flat list of evaluation steps, and
+    compiling it to C++ code (realcompile) removes the interpretation altogether. The C++ code is compiled in the
+    background, the uncompiled tree is evaluated until it is ready.
+
+    A compiled coefficientfunction still refers to the same Parameters and GridFunctions as the original tree, so it
+    follows any change of their values. Every coefficientfunction is only compiled once, later requests to compile it
+    return the cached compiled coefficientfunction. The cache only holds weak references to the original
+    coefficientfunctions, so an entry is dropped as soon as its original is no longer used elsewhere (ex: when a
+    re-parse replaces it) and the cache doesn't grow over a simulation.
+    """
+
+    def __init__(self, realcompile: bool = False) -> None:
+        """
+        Initializer
+
+        Args:
+            realcompile: If True compile to C++ code, which needs a C++ compiler, instead of only flattening the trees.
+        """
+        self.realcompile = realcompile
+
+        # Number of compiled coefficientfunctions, number of times a compiled coefficientfunction was reused, and the
+        # time spent compiling (excluding the background compilation of C++ code).
+        self.compilations = 0
+        self.reuses = 0
+        self.compile_time = 0.0
+
+        # Keyed by the id of the original coefficientfunction. A weak reference to the original is stored with the
+        # compiled coefficientfunction, the entry is removed when the original is garbage collected so its id can't be
+        # reused by a different object while the entry exists.
+        self._compiled: Dict[int, Tuple[weakref.ref, Optional[CoefficientFunction]]] = {}
+
+        # Weak references to the compiled coefficientfunctions keyed by their id, to recognize values that have already
+        # been compiled.
+        self._outputs: Dict[int, Tuple[weakref.ref, Optional[CoefficientFunction]]] = {}
+
+    def compile(self, val: Any) -> Any:
+        """
+        Function to compile any coefficientfunctions in a value parsed from a config file.
+
+        Dictionaries and lists are updated in place so that any other references to them also get the compiled
+        coefficientfunctions. Parameters, gridfunctions, trial functions, and values that aren't coefficientfunctions
+        are left as is.
+
+        Args:
+            val: The parsed value, ex: a coefficientfunction, a list with one value per time step, or a dictionary of
+                such values.
+
+        Returns:
+            The value with every coefficientfunction replaced by its compiled version.
+        """
+        if isinstance(val, dict):
+            for key in val:
+                val[key] = self.compile(val[key])
+            return val
+
+        if isinstance(val, list):
+            for i in range(len(val)):
+                val[i] = self.compile(val[i])
+            return val
+
+        if isinstance(val, tuple):
+            return tuple(self.compile(item) for item in val)
+
+        if not isinstance(val, CoefficientFunction) or isinstance(val, (GridFunction, Parameter, ProxyFunction)):
+            return val
+
+        entry = self._compiled.get(id(val))
+        if entry is not None and entry[0]() is val:
+            self.reuses += 1
+            return entry[1]
+
+        entry = self._outputs.get(id(val))
+        if entry is not None and entry[0]() is val:
+            # Already compiled.
+            self.reuses += 1
+            return val
+
+        start_time = time.perf_counter()
+        try:
+            compiled = val.Compile(realcompile=self.realcompile, wait=False)
+        except Exception as e:
+            # Keep evaluating the uncompiled coefficientfunction if it can't be compiled.
+            logging.debug('Could not compile a coefficientfunction: {}'.format(e))
+            compiled = val
+        self.compile_time += time.perf_counter() - start_time
+
+        _store(self._compiled, val, compiled)
+        _store(self._outputs, compiled, None)
+        self.compilations += 1
+
+        return compiled
+
+    def summary(self) -> str:
+        """
+        Function to summarize the compilations.
+
+        Returns:
+            A one line summary of the number of compiled and reused coefficientfunctions.
+        """
+        return 'Compiled expressions: {0} compilations ({1:.3f}s), {2} reuses.'.format(self.compilations,
+                                                                                     self.compile_time, self.reuses)
+
+
+def _store(cache: Dict[int, Tuple[weakref.ref, Optional[CoefficientFunction]]], key_cf: CoefficientFunction,
+           value: Optional[CoefficientFunction]) -> None:
+    """
+    Function to add an entry keyed by a coefficientfunction to one of the caches of the expression compiler.
+
+    Only a weak reference to the key coefficientfunction is kept. The entry is removed once it is garbage collected.
+
+    Args:
+        cache: The cache to add the entry to.
+        key_cf: The coefficientfunction whose id is used as the key.
+        value: The value to store with the weak reference.
+    """
+    key = id(key_cf)
+
+    def _drop(ref: weakref.ref) -> None:
+        # Only remove the entry if it hasn't already been replaced by one for a new object with the same id.
+        entry = cache.get(key)
+        if entry is not None and entry[0] is ref:
+            del cache[key]
+
+    cache[key] = (weakref.ref(key_cf, _drop), value)
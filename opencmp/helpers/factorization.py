@@ -0,0 +1,282 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from ngsolve import BaseMatrix, BilinearForm
+from pyngcore import BitArray
+
+"""
+Module for caching sparse direct factorizations between linear solves.
+"""
+
+
+class _CachedFactorization:
+    """
+    Class to hold the factorization of an assembled bilinear form for one operator state.
+    """
+
+    def __init__(self, a_assembled: BilinearForm, inv: BaseMatrix) -> None:
+        """
+        Initializer
+
+        Args:
+            a_assembled: The assembled bilinear form.
+            inv: The factorization of the bilinear form's matrix.
+        """
+        # The bilinear form and its matrix are stored so that the id of the bilinear form can't be reused by a different
+        # object while the entry exists and so that a reallocated matrix can be detected.
+        self.a_assembled = a_assembled
+        self.mat = a_assembled.mat
+        self.inv = inv
+
+        # Whether the factorization matches the current values of the matrix for this operator state.
+        self.valid = True
+
+        # Memory used by the factorization in bytes.
+        self.memory = sum(usage.host for usage in inv.GetMemoryUsage())
+
+
+class FactorizationCache:
+    """
+    Class to hold the sparse direct factorizations of assembled bilinear forms so they can be reused for as long as the
+    values of the underlying matrices are unchanged, and cheaply refactorized when only the values have changed.
+
+    The cache does not inspect the matrices itself. The solver decides whether reuse is valid (e.g. the bilinear form is
+    time-invariant) and tells the cache which operator state the matrix values currently correspond to with
+    set_state() (e.g. the current time step sizes). A bilinear form can keep factorizations for several operator states
+    so that returning to an earlier state, such as a dt on the time step ladder of an adaptive solver, reuses its
+    factorization instead of refactorizing. The least recently used factorizations are discarded once a bilinear form
+    has max_states of them or the cache uses more than max_memory bytes. invalidate() must be called whenever the values
+    of the operators may have changed for the same operator state (controller BC update).
+
+    The sparsity pattern of a bilinear form's matrix is fixed for a given finite element space, so a stale or discarded
+    factorization is refactorized numerically with Update(), which lets the direct solver reuse its fill-reducing
+    ordering and symbolic analysis. clear() must be called whenever the sparsity pattern may have changed (new mesh or
+    finite element space, recreated weak forms).
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializer
+        """
+        # Whether factorizations should be kept between linear solves. Set by the solver.
+        self.enabled = False
+
+        # Whether stale factorizations should be numerically refactorized instead of factorized from scratch. Set by
+        # the solver.
+        self.numeric_refactorization = False
+
+        # The maximum number of operator states to keep factorizations for per bilinear form, and the maximum memory in
+        # bytes of all cached factorizations (no limit if 0). Set by the solver.
+        self.max_states = 1
+        self.max_memory = 0
+
+        # The operator state that the values of the assembled matrices currently correspond to. Only used if enabled.
+        self.state: Hashable = None
+
+        # Number of linear solves that reused an existing factorization, number that only had to refactorize
+        # numerically, and number that had to do the full symbolic and numeric factorization. Also the number of cached
+        # factorizations that were discarded to stay within the limits.
+        self.hits = 0
+        self.refactorizations = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Keyed by the id of the bilinear form and the operator state, ordered from least to most recently used.
+        self._factorizations: OrderedDict[Tuple[int, Hashable], _CachedFactorization] = OrderedDict()
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of the direct solves so far that reused a cached factorization.
+        """
+        total = self.hits + self.refactorizations + self.misses
+
+        return self.hits / total if total > 0 else 0.0
+
+    @property
+    def memory(self) -> int:
+        """
+        The memory in bytes used by all cached factorizations.
+        """
+        return sum(entry.memory for entry in self._factorizations.values())
+
+    def __len__(self) -> int:
+        return len(self._factorizations)
+
+    def set_state(self, state: Hashable) -> None:
+        """
+        Function to set the operator state that the values of the assembled matrices correspond to from now on.
+
+        Args:
+            state: Any hashable value that determines the values of the cached matrices (ex: the time step sizes).
+        """
+        self.state = state
+
+    def get_inverse(self, a_assembled: BilinearForm, freedofs: Optional[BitArray], inverse_solver: str) -> BaseMatrix:
+        """
+        Function to get the inverse of an assembled bilinear form, factorizing it only if no valid factorization is
+        cached.
+
+        Args:
+            a_assembled: The assembled bilinear form.
+            freedofs: The free DOFs of the finite element space.
+            inverse_solver: The name of the sparse direct solver to use (ex: "pardiso" or "umfpack").
+
+        Returns:
+            The inverse of the bilinear form's matrix.
+        """
+        # Without reuse enabled the values of the matrix must be assumed to have changed since the last solve, so there
+        # is only ever one factorization per bilinear form.
+        key = (id(a_assembled), self.state if self.enabled else None)
+        mat = a_assembled.mat
+        entry = self._factorizations.pop(key, None)
+
+        # A factorization can only be updated in place if the bilinear form still uses the same matrix, otherwise the
+        # sparsity pattern may be different.
+        if entry is not None and entry.mat is not mat:
+            entry = None
+
+        if entry is not None and self.enabled and entry.valid:
+            self.hits += 1
+        else:
+            if entry is None and self.numeric_refactorization:
+                # Take over the factorization of the least recently used other state of the bilinear form if it already
+                # has as many as allowed.
+                entry = self._evict_state(a_assembled, self.max_states - 1)
+                if entry is not None and entry.mat is not mat:
+                    entry = None
+
+            if entry is not None and self.numeric_refactorization:
+                self.refactorizations += 1
+                entry.inv.Update()
+                entry.valid = True
+            else:
+                self.misses += 1
+                entry = _CachedFactorization(a_assembled, mat.Inverse(freedofs=freedofs, inverse=inverse_solver))
+
+        if self.enabled or self.numeric_refactorization:
+            # Make room before adding the entry as the most recently used one.
+            self._evict_state(a_assembled, self.max_states - 1)
+            self._factorizations[key] = entry
+            self._evict_memory()
+
+        return entry.inv
+
+    def invalidate(self) -> None:
+        """
+        Function to mark all cached factorizations as out of date. Must be called whenever the values of any cached
+        matrix may have changed for the same operator state. The factorizations are kept so they can be refactorized
+        numerically.
+        """
+        for entry in self._factorizations.values():
+            entry.valid = False
+
+    def clear(self) -> None:
+        """
+        Function to discard all cached factorizations. Must be called whenever the sparsity pattern of any cached matrix
+        may have changed.
+        """
+        self._factorizations.clear()
+
+    def reset_counters(self) -> None:
+        """
+        Function to reset the hit, refactorization, miss, and eviction counters.
+        """
+        self.hits = 0
+        self.refactorizations = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def summary(self) -> str:
+        """
+        Function to summarize the reuse of the cached factorizations.
+
+        Returns:
+            A one line summary of the counters and the current size of the cache.
+        """
+        return 'Factorization cache: {0} hits ({1:.0%} hit rate), {2} numeric refactorizations, {3} misses, {4} ' \
+               'evictions, {5} factorizations using {6:.2f} MB.'.format(self.hits, self.hit_rate, self.refactorizations,
+                                                                      self.misses, self.evictions, len(self),
+                                                                      self.memory / 1e6)
+
+    def _evict_state(self, a_assembled: BilinearForm, max_remaining: int) -> Optional[_CachedFactorization]:
+        """
+        Function to discard the least recently used factorization of a bilinear form if it has more than the given
+        number of factorizations cached.
+
+        Args:
+            a_assembled: The assembled bilinear form.
+            max_remaining: The number of factorizations the bilinear form may keep.
+
+        Returns:
+            The discarded factorization, or None if none was discarded.
+        """
+        keys = [key for key in self._factorizations if key[0] == id(a_assembled)]
+        if len(keys) <= max(max_remaining, 0):
+            return None
+
+        self.evictions += 1
+
+        return self._factorizations.pop(keys[0])
+
+    def _evict_memory(self) -> None:
+        """
+        Function to discard the least recently used factorizations until the cache is within its memory limit. The most
+        recently used factorization is always kept.
+        """
+        if self.max_memory <= 0:
+            return
+
+        memory = self.memory
+        while memory > self.max_memory and len(self._factorizations) > 1:
+            _, entry = self._factorizations.popitem(last=False)
+            memory -= entry.memory
+            self.evictions += 1
+
+
+def assembled_forms_match(a_1: BilinearForm, a_2: BilinearForm, rtol: float = 1e-12) -> bool:
+    """
+    Function to check whether two assembled bilinear forms represent the same operator, in which case a single
+    assembled matrix, preconditioner, and factorization can be used for both.
+
+    Statically condensed forms are never considered to match since the condensed matrix does not determine the
+    element-interior blocks that are needed to recover the full solution.
+
+    Args:
+        a_1: The first assembled bilinear form.
+        a_2: The second assembled bilinear form.
+        rtol: The relative tolerance used to compare the matrix values.
+
+    Returns:
+        True if both bilinear forms have the same matrix sparsity pattern and the same matrix values, else False.
+    """
+    if a_1.condense or a_2.condense or a_1.space is not a_2.space:
+        return False
+
+    vec_1 = a_1.mat.AsVector()
+    vec_2 = a_2.mat.AsVector()
+
+    if len(vec_1) != len(vec_2):
+        return False
+
+    diff = vec_1.CreateVector()
+    diff.data = vec_1 - vec_2
+
+    return diff.Norm() <= rtol * vec_2.Norm()
@@ -0,0 +1,76 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+from typing import Optional
+
+"""
+Module for choosing the linear solver tolerance of each iteration of an inexact nonlinear solve.
+"""
+
+
+class ForcingTerm:
+    """
+    Class to choose the relative tolerance (forcing term) of each linear solve in an inexact Picard or Newton iteration.
+
+    Early nonlinear iterations are far from the solution, so solving their linear systems accurately is wasted work.
+    The forcing term follows choice 2 of Eisenstat and Walker, "Choosing the forcing terms in an inexact Newton
+    method", SIAM J. Sci. Comput. 17 (1996), with the norm of the nonlinear update standing in for the norm of the
+    nonlinear residual.
+    """
+
+    def __init__(self, minimum: float, maximum: float = 0.1, gamma: float = 0.9, alpha: float = 2.0) -> None:
+        """
+        Initializer
+
+        Args:
+            minimum: The smallest forcing term to use, usually the tolerance of an exact linear solve.
+            maximum: The largest forcing term to use, this is also the forcing term of the first iteration.
+            gamma: Scales the forcing term.
+            alpha: How quickly the forcing term decreases as the nonlinear iteration converges.
+        """
+        self.minimum = min(minimum, maximum)
+        self.maximum = maximum
+        self.gamma = gamma
+        self.alpha = alpha
+
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Function to start a new nonlinear solve.
+        """
+        self.tolerance = self.maximum
+        self._previous_update: Optional[float] = None
+
+    def update(self, update_norm: float) -> None:
+        """
+        Function to choose the forcing term of the next iteration.
+
+        Args:
+            update_norm: The norm of the change in the solution over the iteration that just finished.
+        """
+        if self._previous_update is not None and self._previous_update > 0.0:
+            tolerance = self.gamma * (update_norm / self._previous_update) ** self.alpha
+
+            # Don't let the forcing term drop much faster than the nonlinear iteration converges.
+            safeguard = self.gamma * self.tolerance ** self.alpha
+            if safeguard > 0.1:
+                tolerance = max(tolerance, safeguard)
+
+            self.tolerance = min(max(tolerance, self.minimum), self.maximum)
+
+        self._previous_update = update_norm
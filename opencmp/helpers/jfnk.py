@@ -0,0 +1,88 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+import numpy as np
+from typing import Callable
+
+from ngsolve import BaseMatrix, BaseVector, Projector
+from pyngcore import BitArray
+
+"""
+Module for the Jacobian-free Newton-Krylov nonlinear solver.
+"""
+
+# Evaluates the nonlinear residual of the first argument into the second argument.
+Residual = Callable[[BaseVector, BaseVector], None]
+
+
+class FiniteDifferenceJacobian(BaseMatrix):
+    """
+    The Jacobian of a nonlinear residual R at a fixed iterate x, applied to a vector v by the forward difference
+    (R(x + eps * v) - R(x)) / eps. The Jacobian is never assembled, so each product costs one residual evaluation.
+
+    The step eps = sqrt(machine epsilon) * (1 + |x|) / |v| balances the truncation error of the forward difference
+    against the round-off error of the residual evaluation.
+    """
+
+    def __init__(self, residual: Residual, x: BaseVector, residual_x: BaseVector, freedofs: BitArray) -> None:
+        """
+        Initializer
+
+        Args:
+            residual: Function to evaluate the nonlinear residual.
+            x: The iterate the Jacobian is evaluated at. It must not be changed while the Jacobian is used.
+            residual_x: The residual at x.
+            freedofs: The free DOFs of the finite element space. The Jacobian is zero on all other DOFs.
+        """
+        super().__init__()
+
+        self.residual = residual
+        self.x = x
+        self.residual_x = residual_x
+        self.projector = Projector(freedofs, True)
+
+        # Number of residual evaluations.
+        self.num_evaluations = 0
+
+        self._perturbed = x.CreateVector()
+
+    def Mult(self, v: BaseVector, y: BaseVector) -> None:
+        v_norm = v.Norm()
+        if v_norm == 0.0:
+            y[:] = 0.0
+            return
+
+        eps = np.sqrt(np.finfo(float).eps) * (1.0 + self.x.Norm()) / v_norm
+
+        self._perturbed.data = self.x + eps * v
+        self.residual(self._perturbed, y)
+        self.num_evaluations += 1
+
+        y.data -= self.residual_x
+        y.data *= 1.0 / eps
+        self.projector.Project(y)
+
+    def Height(self) -> int:
+        return self.x.size
+
+    def Width(self) -> int:
+        return self.x.size
+
+    def CreateColVector(self) -> BaseVector:
+        return self.x.CreateVector()
+
+    def CreateRowVector(self) -> BaseVector:
+        return self.x.CreateVector()
@@ -0,0 +1,160 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+from typing import Dict, List, Optional, Union
+
+"""
+Module for recording the status of linear solves and nonlinear iterations and aggregating it per time step and per run.
+"""
+
+
+class LinearSolveResult:
+    """
+    Class to hold the status of a single linear solve.
+    """
+
+    def __init__(self, solver: str, iterations: int, residual: float, converged: bool, wall_time: float,
+                 residuals: Optional[List[float]] = None) -> None:
+        """
+        Initializer
+
+        Args:
+            solver: The name of the linear solver (ex: "direct" or "CG").
+            iterations: The number of iterations taken by an iterative solver, zero for a direct solve.
+            residual: The final residual. For an iterative solver this is the residual measure used by the solver for
+                its stopping criterion, for a direct solve it is zero since it is exact up to round-off.
+            converged: Whether the solver reached its stopping tolerance.
+            wall_time: The wall time of the solve in seconds.
+            residuals: The residual history of an iterative solver, starting with the initial residual.
+        """
+        self.solver = solver
+        self.iterations = iterations
+        self.residual = residual
+        self.converged = converged
+        self.wall_time = wall_time
+        self.residuals = residuals if residuals is not None else []
+
+    def __repr__(self) -> str:
+        return 'LinearSolveResult(solver={}, iterations={}, residual={:.3e}, converged={}, wall_time={:.3e})'\
+            .format(self.solver, self.iterations, self.residual, self.converged, self.wall_time)
+
+
+class LinearSolveStatistics:
+    """
+    Class to aggregate the results of linear solves over each time step and over the whole run.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializer
+        """
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Function to discard all recorded results.
+        """
+        # Totals over the whole run.
+        self.num_solves = 0
+        self.num_unconverged = 0
+        self.total_iterations = 0
+        self.max_iterations = 0
+        self.total_wall_time = 0.0
+        self.nonlinear_iterations = 0
+
+        # Totals over the current time step (including any rejected attempts at it).
+        self.step_solves = 0
+        self.step_unconverged = 0
+        self.step_iterations = 0
+        self.step_wall_time = 0.0
+        self.step_nonlinear_iterations = 0
+
+        # The most recent result and a record of the totals of each time step.
+        self.last_result: Optional[LinearSolveResult] = None
+        self.steps: List[Dict[str, Union[float, int, bool]]] = []
+
+    def record(self, result: LinearSolveResult) -> None:
+        """
+        Function to add the result of a linear solve to the totals.
+
+        Args:
+            result: The result of the linear solve.
+        """
+        self.last_result = result
+
+        self.num_solves += 1
+        self.total_iterations += result.iterations
+        self.max_iterations = max(self.max_iterations, result.iterations)
+        self.total_wall_time += result.wall_time
+
+        self.step_solves += 1
+        self.step_iterations += result.iterations
+        self.step_wall_time += result.wall_time
+
+        if not result.converged:
+            self.num_unconverged += 1
+            self.step_unconverged += 1
+
+    def record_nonlinear_iteration(self) -> None:
+        """
+        Function to count one iteration (one linearized solve) of a nonlinear solver.
+        """
+        self.nonlinear_iterations += 1
+        self.step_nonlinear_iterations += 1
+
+    def end_step(self, time: float, dt: float, accepted: bool) -> None:
+        """
+        Function to store the totals of the current time step and start a new one.
+
+        Args:
+            time: The time the time step solved for.
+            dt: The time step used.
+            accepted: Whether the time step was accepted.
+        """
+        self.steps.append({'time': time,
+                           'dt': dt,
+                           'accepted': accepted,
+                           'solves': self.step_solves,
+                           'iterations': self.step_iterations,
+                           'unconverged': self.step_unconverged,
+                           'wall_time': self.step_wall_time,
+                           'nonlinear_iterations': self.step_nonlinear_iterations})
+
+        self.step_solves = 0
+        self.step_unconverged = 0
+        self.step_iterations = 0
+        self.step_wall_time = 0.0
+        self.step_nonlinear_iterations = 0
+
+    def summary(self) -> str:
+        """
+        Function to summarize the totals over the whole run.
+
+        Returns:
+            A one line summary of the linear solves.
+        """
+        if self.num_solves == 0:
+            return 'No linear solves.'
+
+        summary = '{0} linear solves in {1:.3f}s, {2} iterations (mean {3:.1f}, max {4}), {5} not converged.'\
+            .format(self.num_solves, self.total_wall_time, self.total_iterations,
+                    self.total_iterations / self.num_solves, self.max_iterations, self.num_unconverged)
+
+        if self.nonlinear_iterations > 0:
+            summary += ' {} nonlinear iterations.'.format(self.nonlinear_iterations)
+
+        return summary
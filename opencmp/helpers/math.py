@@ -15,8 +15,9 @@
 # <https://www.gnu.org/licenses/>.                                                                                     #
 ########################################################################################################################
 
-from typing import Union
+from typing import List, Union
 from ngsolve import CoefficientFunction, Parameter, exp, IfPos, cos
+import math
 from math import pi
 
 
@@ -219,3 +220,102 @@ def Min(a: Union[CoefficientFunction, float], b: Union[CoefficientFunction, floa
             )
         )
     )
+
+
+def extrapolation_coefficients(times: List[float], t: float) -> List[float]:
+    """
+    Function to get the weights that extrapolate values known at the given times to a new time.
+
+    The weights are the Lagrange basis polynomials through the given times evaluated at the new time, so the
+    extrapolation is exact for polynomials of degree len(times) - 1.
+
+    Args:
+        times: The distinct times at which the values are known.
+        t: The time to extrapolate to.
+
+    Return:
+        The weight of the value at each of the given times, in the same order as times.
+    """
+    coefficients = []
+
+    for j in range(len(times)):
+        coefficient = 1.0
+        for k in range(len(times)):
+            if k != j:
+                coefficient *= (t - times[k]) / (times[j] - times[k])
+        coefficients.append(coefficient)
+
+    return coefficients
+
+
+def bdf_coefficients(times: List[float]) -> List[float]:
+    """
+    Function to get the weights of a variable-step backward differentiation formula.
+
+    The weights are the derivatives of the Lagrange basis polynomials through the given times evaluated at the first of
+    them, so the time derivative at that time is approximated by the weighted sum of the values at the given times. The
+    approximation is exact for polynomials of degree len(times) - 1.
+
+    Args:
+        times: The distinct times at which the values are known, starting with the time to differentiate at.
+
+    Return:
+        The weight of the value at each of the given times, in the same order as times.
+    """
+    coefficients = [sum(1.0 / (times[0] - times[k]) for k in range(1, len(times)))]
+
+    for j in range(1, len(times)):
+        coefficient = 1.0 / (times[j] - times[0])
+        for k in range(1, len(times)):
+            if k != j:
+                coefficient *= (times[0] - times[k]) / (times[j] - times[k])
+        coefficients.append(coefficient)
+
+    return coefficients
+
+
+def bdf_error_coefficient(times: List[float], t: float) -> float:
+    """
+    Function to get the factor that turns the difference between a variable-step BDF solution and the extrapolation of
+    the previous solutions into an estimate of the local error of the BDF solution (Milne's device).
+
+    The BDF scheme of order k uses the new time and the first k of the given times, the extrapolation uses all k + 1 of
+    the given times. Both errors are proportional to the (k + 1)th derivative of the solution, the BDF error with the
+    constant dt_eff * prod_{j<k}(t - times[j]) and the extrapolation error with prod_{j<=k}(t - times[j]), where
+    dt_eff is the inverse of the BDF weight of the new time. For constant time steps the factor is 1/3, 2/11 and 3/25
+    for orders one to three.
+
+    Args:
+        times: The distinct times of the previous solutions, starting with the most recent one.
+        t: The new time.
+
+    Return:
+        The factor to multiply the difference between the solution and the extrapolation by.
+    """
+    dt_eff = 1.0 / bdf_coefficients([t] + times[:-1])[0]
+
+    return dt_eff / (dt_eff + t - times[-1])
+
+
+def dt_ladder_value(dt: float, dt_max: float, steps_per_doubling: int) -> float:
+    """
+    Function to round a time step size down onto a geometric ladder of allowed time step sizes.
+
+    The allowed time step sizes are dt_max * 2^(-k / steps_per_doubling) for integers k >= 0. A time step size that is
+    already on the ladder (up to round-off) is mapped to exactly the same value every time, so it can be used as a key.
+
+    Args:
+        dt: The time step size to round down.
+        dt_max: The largest allowed time step size.
+        steps_per_doubling: The number of allowed time step sizes per factor of two.
+
+    Return:
+        The largest allowed time step size that is not larger than dt, or dt_max if dt is larger than dt_max.
+    """
+    if dt >= dt_max:
+        return dt_max
+
+    # Tolerate round-off so that a value on the ladder isn't rounded down to the next one.
+    k = math.ceil(steps_per_doubling * math.log2(dt_max / dt) - 1e-9)
+
+    return dt_max * 2.0 ** (-k / steps_per_doubling)
@@ -15,6 +15,7 @@
 # <https://www.gnu.org/licenses/>.                                                                                     #
 ########################################################################################################################
 
+import math
 import ngsolve as ngs
 from typing import List, Optional, Tuple, Callable
 from ngsolve import CoefficientFunction, Mesh, GridFunction, Parameter
@@ -45,6 +46,25 @@ def construct_identity_mat(dim: int) -> CoefficientFunction:
     return ngs.CoefficientFunction(tuple(lst), dims=(dim, dim))
 
 
+def rms_norm(vec: ngs.BaseVector) -> float:
+    """
+    Function to measure a DOF vector by the root mean square of its values.
+
+    This is used wherever solutions or their changes are compared by their DOF values instead of norms integrated over
+    the mesh, so that the measure doesn't grow with the number of DOFs.
+
+    Args:
+        vec: The DOF vector.
+
+    Returns:
+        The root mean square of the DOF values, 0 for an empty vector.
+    """
+    if len(vec) == 0:
+        return 0.0
+
+    return ngs.Norm(vec) / math.sqrt(len(vec))
+
+
 def get_special_functions(mesh: Mesh, nu: float) \
         -> Tuple[CoefficientFunction, CoefficientFunction, CoefficientFunction, CoefficientFunction]:
     """
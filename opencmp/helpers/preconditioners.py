@@ -0,0 +1,535 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+import hashlib
+import logging
+import numpy as np
+import scipy.sparse as sp
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+from ngsolve import BaseMatrix, BaseVector, BilinearForm, Parameter
+from ngsolve.la import DofRange
+from pyngcore import BitArray
+from .misc import can_import_module
+
+missing_pyamg = not can_import_module('pyamg')
+if not missing_pyamg:
+    import pyamg
+
+"""
+Module for preconditioners that are not built into NGSolve and the registry that makes them available by name.
+"""
+
+# Constructors of the preconditioners that can be selected by name in the config file in addition to the NGSolve
+# preconditioners. Each constructor takes the model, the assembled bilinear form, and the time step parameter (None for
+# stationary solves) and returns the preconditioner. It is called before the bilinear form is first assembled, so any
+# setup that needs the matrix values must be done in the preconditioner's Update() function.
+PreconditionerConstructor = Callable[[Any, BilinearForm, Optional[Parameter]], BaseMatrix]
+preconditioner_registry: Dict[str, PreconditionerConstructor] = {}
+
+
+def register_preconditioner(name: str, constructor: PreconditionerConstructor) -> None:
+    """
+    Function to make a preconditioner available by name in the config file.
+
+    Args:
+        name: The name used to select the preconditioner in the config file.
+        constructor: Function that constructs the preconditioner from the model, the assembled bilinear form, and the
+            time step parameter.
+    """
+    if name in ['None', 'default']:
+        raise ValueError('{} is reserved and can not be used as the name of a preconditioner.'.format(name))
+
+    preconditioner_registry[name] = constructor
+
+
+class SaddlePointPreconditioner(BaseMatrix):
+    """
+    Block preconditioner for a velocity-pressure saddle point system of the form [A B^T; B -C].
+
+    The velocity block A is approximated by an NGSolve preconditioner (ex: BDDC or multigrid) of an auxiliary
+    velocity-only bilinear form and the inverse of the Schur complement S = B A^-1 B^T + C is approximated by
+    preconditioners of auxiliary pressure-only bilinear forms (ex: a scaled pressure mass matrix). The block diagonal
+    version diag(A, S)^-1 is symmetric positive definite, so it can be used with MinRes. The upper block triangular
+    version [A B^T; 0 -S]^-1 takes the off-diagonal block B^T from the assembled system and must be used with GMRes.
+
+    Both are spectrally equivalent to the inverse of the Stokes system as long as the velocity and pressure
+    preconditioners are spectrally equivalent to the inverses of their auxiliary forms, so the number of iterations is
+    independent of the mesh size.
+    """
+
+    def __init__(self, a_assembled: BilinearForm, velocity_range: DofRange, pressure_range: DofRange,
+                 velocity_pre: BaseMatrix, schur_pre: BaseMatrix, aux_forms: List[BilinearForm], triangular: bool,
+                 dt: Optional[Parameter] = None, time_varying: bool = False) -> None:
+        """
+        Initializer
+
+        Args:
+            a_assembled: The bilinear form of the full saddle point system.
+            velocity_range: The range of the velocity DOFs in the full system.
+            pressure_range: The range of the pressure DOFs in the full system.
+            velocity_pre: Approximate inverse of the velocity block, acting on velocity vectors.
+            schur_pre: Approximate inverse of the Schur complement, acting on pressure vectors.
+            aux_forms: The auxiliary bilinear forms that velocity_pre and schur_pre are built from. Assembling them
+                updates the preconditioners registered on them.
+            triangular: If True use the upper block triangular preconditioner, otherwise use the block diagonal one.
+            dt: The time step used in the auxiliary forms, if any.
+            time_varying: If True the auxiliary forms contain coefficients that change with time and must be
+                re-assembled on every update. Otherwise they are only re-assembled when dt changes.
+        """
+        super().__init__()
+
+        self.a_assembled = a_assembled
+        self.velocity_range = velocity_range
+        self.pressure_range = pressure_range
+        self.velocity_pre = velocity_pre
+        self.schur_pre = schur_pre
+        self.aux_forms = aux_forms
+        self.triangular = triangular
+        self.dt = dt
+        self.time_varying = time_varying
+
+        # Whether the auxiliary forms have been assembled and the dt value they were last assembled with.
+        self._assembled = False
+        self._assembled_dt: Optional[float] = None
+
+        # Work vector for the block triangular version, allocated on first use instead of every application.
+        self._tmp: Optional[BaseVector] = None
+
+    def Update(self) -> None:
+        """
+        Function to re-assemble the auxiliary forms, which also updates their preconditioners. Skipped if nothing that
+        the auxiliary forms depend on has changed since the last update.
+        """
+        dt_value = None if self.dt is None else self.dt.Get()
+
+        if self.time_varying or not self._assembled or dt_value != self._assembled_dt:
+            for form in self.aux_forms:
+                form.Assemble()
+            self._assembled = True
+            self._assembled_dt = dt_value
+
+    def Mult(self, x: BaseVector, y: BaseVector) -> None:
+        """
+        Function to apply the preconditioner.
+
+        Args:
+            x: The vector to apply the preconditioner to.
+            y: Vector to store the result in.
+        """
+        y[:] = 0.0
+
+        x_u = x[self.velocity_range]
+        x_p = x[self.pressure_range]
+        y_u = y[self.velocity_range]
+        y_p = y[self.pressure_range]
+
+        if self.triangular:
+            # Back substitution with [A B^T; 0 -S].
+            y_p.data = -1.0 * (self.schur_pre * x_p)
+
+            # Apply B^T to the pressure part of the result using the full system matrix.
+            tmp = self._work_vector(y)
+            tmp.data = self.a_assembled.mat * y
+            tmp_u = tmp[self.velocity_range]
+
+            # NOTE: tmp_u.data = x_u - tmp_u would overwrite tmp_u with x_u before subtracting it.
+            tmp_u *= -1.0
+            tmp_u.data += x_u
+
+            y_u.data = self.velocity_pre * tmp_u
+        else:
+            y_u.data = self.velocity_pre * x_u
+            y_p.data = self.schur_pre * x_p
+
+    def _work_vector(self, template: BaseVector) -> BaseVector:
+        """
+        Function to get a work vector of the size of the full system.
+
+        Args:
+            template: A vector of the size of the full system.
+
+        Returns:
+            The work vector.
+        """
+        if self._tmp is None:
+            self._tmp = template.CreateVector()
+
+        return self._tmp
+
+    def Height(self) -> int:
+        return self.a_assembled.space.ndof
+
+    def Width(self) -> int:
+        return self.a_assembled.space.ndof
+
+    def CreateColVector(self) -> BaseVector:
+        return self.a_assembled.mat.CreateColVector()
+
+    def CreateRowVector(self) -> BaseVector:
+        return self.a_assembled.mat.CreateRowVector()
+
+
+class AMGPreconditioner(BaseMatrix):
+    """
+    Algebraic multigrid preconditioner that applies one V-cycle of a pyamg smoothed aggregation hierarchy built from the
+    assembled matrix restricted to the free DOFs.
+
+    Smoothed aggregation is intended for symmetric positive definite systems such as the Poisson equation or the
+    species transport equations with small Peclet numbers. It does not work for saddle point systems, use the block
+    preconditioners for those.
+
+    Building the hierarchy is much more expensive than applying it, so it is kept for as long as the values of the
+    matrix are unchanged (ex: for a time-invariant bilinear form with a constant time step). Update() compares a digest
+    of the matrix values to the digest of the values the hierarchy was built from, without copying or slicing the
+    matrix. How often Update() is called at all is decided by the preconditioner update policy.
+    """
+
+    def __init__(self, a_assembled: BilinearForm, freedofs: BitArray) -> None:
+        """
+        Initializer
+
+        Args:
+            a_assembled: The bilinear form whose matrix the hierarchy is built from.
+            freedofs: The free DOFs of the finite element space. The preconditioner is zero on all other DOFs.
+        """
+        if missing_pyamg:
+            raise ImportError('pyamg module is not installed. Install it with `pip install pyamg`.')
+
+        super().__init__()
+
+        self.a_assembled = a_assembled
+        self.free_indices = np.flatnonzero(np.array(freedofs, dtype=bool))
+
+        # Number of times the hierarchy has been built.
+        self.num_builds = 0
+
+        # The matrix and the digest of its values that the hierarchy was built from.
+        self._built_from: Optional[BaseMatrix] = None
+        self._built_digest: Optional[bytes] = None
+        self._precond: Optional[Any] = None
+
+    def Update(self) -> None:
+        """
+        Function to rebuild the hierarchy, skipped if the matrix values are unchanged since it was last built.
+        """
+        mat = self.a_assembled.mat
+        digest = hashlib.blake2b(mat.AsVector().FV().NumPy(), digest_size=16).digest()
+
+        # A reassembled bilinear form may have a new matrix, in which case the sparsity pattern may have changed too.
+        if mat is self._built_from and digest == self._built_digest:
+            return
+
+        vals, cols, row_ptr = mat.CSR()
+        csr = sp.csr_matrix((np.asarray(vals), np.asarray(cols), np.asarray(row_ptr)), shape=(mat.height, mat.width))
+        csr = csr[self.free_indices][:, self.free_indices]
+
+        self._precond = pyamg.smoothed_aggregation_solver(csr.tocsr()).aspreconditioner(cycle='V')
+        self._built_from = mat
+        self._built_digest = digest
+        self.num_builds += 1
+
+    def Mult(self, x: BaseVector, y: BaseVector) -> None:
+        """
+        Function to apply the preconditioner.
+
+        Args:
+            x: The vector to apply the preconditioner to.
+            y: Vector to store the result in.
+        """
+        if self._precond is None:
+            self.Update()
+
+        y_np = y.FV().NumPy()
+        y_np[:] = 0.0
+        y_np[self.free_indices] = self._precond * x.FV().NumPy()[self.free_indices]
+
+    def Height(self) -> int:
+        return self.a_assembled.space.ndof
+
+    def Width(self) -> int:
+        return self.a_assembled.space.ndof
+
+    def CreateColVector(self) -> BaseVector:
+        return self.a_assembled.mat.CreateColVector()
+
+    def CreateRowVector(self) -> BaseVector:
+        return self.a_assembled.mat.CreateRowVector()
+
+
+class _RebuildState:
+    """
+    Class to hold what a preconditioner was last rebuilt with.
+    """
+
+    def __init__(self, preconditioner: weakref.ref, dt: Optional[Parameter], reusable: bool) -> None:
+        """
+        Initializer
+
+        Args:
+            preconditioner: Weak reference to the preconditioner.
+            dt: The time step used in the preconditioner's bilinear form, None for a stationary solve.
+            reusable: Whether the preconditioner can be reused after its bilinear form has been re-assembled.
+        """
+        self.preconditioner = preconditioner
+        self.dt = dt
+        self.reusable = reusable
+
+        # Whether the preconditioner has been rebuilt since it was constructed, the number of updates since it was last
+        # rebuilt, and the time step it was last rebuilt with.
+        self.built = False
+        self.updates = 0
+        self.built_dt: Optional[float] = None
+
+        # Number of iterations of the first linear solve after the last rebuild and of the latest linear solve.
+        self.reference_iterations: Optional[int] = None
+        self.latest_iterations: Optional[int] = None
+
+
+class PreconditionerUpdatePolicy:
+    """
+    Class to decide whether a preconditioner must be rebuilt when its bilinear form is re-assembled or if the previous
+    preconditioner can be reused.
+
+    Rebuilding a preconditioner (ex: a new BDDC coarse space factorization or AMG hierarchy) can cost much more than the
+    linear solve itself, while the matrix often only drifts slightly between time steps or nonlinear iterations. A
+    preconditioner built from a slightly different matrix is still a good preconditioner, it only costs a few extra
+    iterations. A preconditioner is rebuilt every interval updates, when the time step has changed by more than the
+    dt_change fraction since it was last rebuilt, or when the number of iterations of a linear solve has grown by more
+    than the iteration_growth factor compared to the first linear solve after it was last rebuilt. With the default
+    interval of one every update rebuilds the preconditioner.
+    """
+
+    def __init__(self, interval: int = 1, iteration_growth: float = 0.0, dt_change: float = 0.0) -> None:
+        """
+        Initializer
+
+        Args:
+            interval: Rebuild a preconditioner every interval updates. Zero to only rebuild on time step changes or
+                iteration count growth.
+            iteration_growth: Rebuild a preconditioner once a linear solve takes more than this factor times the
+                iterations of the first linear solve after it was last rebuilt. Zero to disable.
+            dt_change: Rebuild a preconditioner once the time step differs from the time step it was last rebuilt with
+                by more than this fraction.
+        """
+        if interval < 0:
+            raise ValueError('The preconditioner update interval can not be negative.')
+        if iteration_growth < 0.0 or dt_change < 0.0:
+            raise ValueError('The preconditioner iteration growth and dt change can not be negative.')
+
+        self.interval = interval
+        self.iteration_growth = iteration_growth
+        self.dt_change = dt_change
+
+        # Number of updates that rebuilt a preconditioner and number that reused the previous one.
+        self.rebuilds = 0
+        self.reuses = 0
+
+        # Keyed by the id of the preconditioner. Only weak references to the preconditioners are stored and an entry is
+        # dropped once its preconditioner is garbage collected, so preconditioners (and the bilinear forms they hold on
+        # to) that are replaced are not kept alive by the policy and the id of a dead preconditioner is never reused.
+        self._states: Dict[int, _RebuildState] = {}
+
+    @property
+    def lagged(self) -> bool:
+        """
+        Whether preconditioners may be reused after their bilinear form has been re-assembled.
+        """
+        return self.interval != 1
+
+    def track(self, preconditioner: Optional[BaseMatrix], dt: Optional[Parameter] = None,
+              reusable: bool = True) -> None:
+        """
+        Function to start tracking a newly constructed preconditioner.
+
+        Args:
+            preconditioner: The preconditioner, may be None.
+            dt: The time step used in the preconditioner's bilinear form, None for a stationary solve.
+            reusable: Whether the preconditioner can be reused after its bilinear form has been re-assembled. If False
+                it is rebuilt on every update regardless of the policy.
+        """
+        if preconditioner is not None:
+            self._states[id(preconditioner)] = self._new_state(preconditioner, dt, reusable)
+
+    def untrack(self, preconditioner: Optional[BaseMatrix]) -> None:
+        """
+        Function to stop tracking a preconditioner that won't be used again, ex: the preconditioner of a startup step.
+
+        Args:
+            preconditioner: The preconditioner, may be None.
+        """
+        state = self._states.get(id(preconditioner))
+
+        if state is not None and state.preconditioner() is preconditioner:
+            del self._states[id(preconditioner)]
+
+    def update(self, preconditioner: Optional[BaseMatrix]) -> bool:
+        """
+        Function to call after the preconditioner's bilinear form has been re-assembled. Rebuilds the preconditioner if
+        required by the policy.
+
+        Args:
+            preconditioner: The preconditioner, may be None.
+
+        Returns:
+            True if the preconditioner was rebuilt, False if the previous preconditioner is reused.
+        """
+        if preconditioner is None:
+            return False
+
+        state = self._state(preconditioner)
+        state.updates += 1
+        dt_value = None if state.dt is None else state.dt.Get()
+
+        reason = self._rebuild_reason(state, dt_value)
+        if reason is None:
+            self.reuses += 1
+            return False
+
+        if self.lagged and state.reusable:
+            logging.info('Rebuilding preconditioner: {}.'.format(reason))
+
+        preconditioner.Update()
+        self.rebuilds += 1
+
+        state.built = True
+        state.updates = 0
+        state.built_dt = dt_value
+        state.reference_iterations = None
+        state.latest_iterations = None
+
+        return True
+
+    def record_iterations(self, preconditioner: Optional[BaseMatrix], iterations: int) -> None:
+        """
+        Function to record the number of iterations of a linear solve that used the preconditioner.
+
+        Args:
+            preconditioner: The preconditioner, may be None.
+            iterations: The number of iterations of the linear solve.
+        """
+        if preconditioner is None:
+            return
+
+        state = self._state(preconditioner)
+        if state.reference_iterations is None:
+            state.reference_iterations = iterations
+        state.latest_iterations = iterations
+
+    def clear(self) -> None:
+        """
+        Function to stop tracking all preconditioners. Must be called whenever the preconditioners are recreated.
+        """
+        self._states.clear()
+
+    def reset_counters(self) -> None:
+        """
+        Function to reset the rebuild and reuse counters.
+        """
+        self.rebuilds = 0
+        self.reuses = 0
+
+    def _state(self, preconditioner: BaseMatrix) -> _RebuildState:
+        """
+        Function to get the state of a preconditioner, tracking it without a time step if it isn't tracked yet.
+
+        Args:
+            preconditioner: The preconditioner.
+
+        Returns:
+            The state of the preconditioner.
+        """
+        state = self._states.get(id(preconditioner))
+
+        if state is None or state.preconditioner() is not preconditioner:
+            state = self._new_state(preconditioner, None, True)
+            self._states[id(preconditioner)] = state
+
+        return state
+
+    def _new_state(self, preconditioner: BaseMatrix, dt: Optional[Parameter], reusable: bool) -> _RebuildState:
+        """
+        Function to create the state of a preconditioner that is dropped from the tracked preconditioners once the
+        preconditioner is garbage collected.
+
+        Args:
+            preconditioner: The preconditioner.
+            dt: The time step used in the preconditioner's bilinear form, None for a stationary solve.
+            reusable: Whether the preconditioner can be reused after its bilinear form has been re-assembled.
+
+        Returns:
+            The state of the preconditioner.
+        """
+        key = id(preconditioner)
+        states = self._states
+
+        def _drop(ref: weakref.ref) -> None:
+            # The entry may already belong to a newer preconditioner that was given the same id.
+            state = states.get(key)
+            if state is not None and state.preconditioner is ref:
+                del states[key]
+
+        return _RebuildState(weakref.ref(preconditioner, _drop), dt, reusable)
+
+    def _rebuild_reason(self, state: _RebuildState, dt_value: Optional[float]) -> Optional[str]:
+        """
+        Function to decide whether a preconditioner must be rebuilt.
+
+        Args:
+            state: The state of the preconditioner.
+            dt_value: The current time step, None for a stationary solve.
+
+        Returns:
+            The reason for rebuilding the preconditioner, None if it can be reused.
+        """
+        if not state.built:
+            return 'first assembly'
+
+        if not state.reusable:
+            return 'rebuilt on every assembly'
+
+        if self.interval > 0 and state.updates >= self.interval:
+            return '{} updates since the last rebuild'.format(state.updates)
+
+        if dt_value is not None and state.built_dt is not None \
+                and abs(dt_value - state.built_dt) > self.dt_change * abs(state.built_dt):
+            return 'dt changed from {0} to {1}'.format(state.built_dt, dt_value)
+
+        if self.iteration_growth > 0.0 and state.reference_iterations is not None \
+                and state.latest_iterations > self.iteration_growth * max(state.reference_iterations, 1):
+            return 'linear iterations grew from {0} to {1}'.format(state.reference_iterations,
+                                                                   state.latest_iterations)
+
+        return None
+
+
+def _construct_block_diagonal(model: Any, a_assembled: BilinearForm, dt: Optional[Parameter]) -> BaseMatrix:
+    return model._construct_block_preconditioner(a_assembled, False, dt)
+
+
+def _construct_block_triangular(model: Any, a_assembled: BilinearForm, dt: Optional[Parameter]) -> BaseMatrix:
+    return model._construct_block_preconditioner(a_assembled, True, dt)
+
+
+def _construct_amg(model: Any, a_assembled: BilinearForm, dt: Optional[Parameter]) -> BaseMatrix:
+    return AMGPreconditioner(a_assembled, model.fes.FreeDofs(a_assembled.condense))
+
+
+register_preconditioner('block diagonal', _construct_block_diagonal)
+register_preconditioner('block triangular', _construct_block_triangular)
+register_preconditioner('amg', _construct_amg)
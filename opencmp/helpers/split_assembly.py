@@ -0,0 +1,191 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+import logging
+from typing import Dict, Optional
+
+from ngsolve import BaseMatrix, BaseVector, BilinearForm, Parameter
+
+"""
+Module for assembling time-invariant bilinear forms from a constant part and a part proportional to the time step.
+"""
+
+
+class _SplitForm:
+    """
+    Class to hold the assembled parts of a bilinear form.
+    """
+
+    def __init__(self, a_assembled: BilinearForm, dt: Parameter) -> None:
+        """
+        Initializer
+
+        Args:
+            a_assembled: The bilinear form.
+            dt: The time step the bilinear form is affine in.
+        """
+        self.a_assembled = a_assembled
+        self.dt = dt
+        self.mat: Optional[BaseMatrix] = None
+
+        # The matrix values of the bilinear form are constant + dt * scaled. Both are None if the bilinear form turned
+        # out not to be affine in dt, in which case it is always assembled in full.
+        self.constant: Optional[BaseVector] = None
+        self.scaled: Optional[BaseVector] = None
+
+        # The value of dt that the matrix currently holds the values for.
+        self.assembled_dt: Optional[float] = None
+
+
+class SplitAssemblyCache:
+    """
+    Class to assemble the bilinear forms of a time-invariant linear model without re-assembling them every time step.
+
+    The bilinear form of a linear model whose parameters don't change in time is A(dt) = M + dt * K for the time step dt
+    used in the time integration scheme, with constant M (ex: the mass matrix) and K (ex: the stiffness matrix).
+    The models fold dt into their integrands, so M and K are extracted by assembling the bilinear form once with dt = 0
+    and once with the actual dt. Afterwards the bilinear form only has to be re-assembled if dt changes, and then its
+    matrix is formed as a linear combination of the matrix values of M and K instead.
+
+    The solver decides whether this is valid (the model is linear and time-invariant) and calls clear() whenever the
+    bilinear forms are recreated. Bilinear forms with static condensation are always assembled in full since the
+    condensed matrix is not a linear combination of the condensed M and K.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializer
+        """
+        # Whether bilinear forms should be split into their constant and dt-proportional parts. Set by the solver.
+        self.enabled = False
+
+        # Number of full assemblies, number of times the matrix was formed from its parts, and number of times the
+        # matrix already held the values for the current dt.
+        self.assemblies = 0
+        self.combinations = 0
+        self.reuses = 0
+
+        # Keyed by the id of the bilinear form, which is also stored so the id can't be reused by a different object
+        # while the entry exists.
+        self._forms: Dict[int, _SplitForm] = {}
+
+    def assemble(self, a_assembled: BilinearForm, dt: Optional[Parameter]) -> None:
+        """
+        Function to assemble a bilinear form, using its constant and dt-proportional parts if possible.
+
+        Args:
+            a_assembled: The bilinear form.
+            dt: The time step used in the bilinear form, None if it doesn't depend on a time step.
+        """
+        if not self.enabled or dt is None or a_assembled.condense:
+            self._assemble_in_full(a_assembled)
+            return
+
+        entry = self._forms.get(id(a_assembled))
+
+        # The parts of a bilinear form are only valid for as long as it uses the same matrix.
+        if entry is None or entry.a_assembled is not a_assembled or entry.mat is not a_assembled.mat:
+            self._split(a_assembled, dt)
+            return
+
+        if entry.constant is None:
+            self._assemble_in_full(a_assembled)
+            return
+
+        dt_value = dt.Get()
+        if dt_value == entry.assembled_dt:
+            self.reuses += 1
+            return
+
+        a_assembled.mat.AsVector().data = entry.constant + dt_value * entry.scaled
+        entry.assembled_dt = dt_value
+        self.combinations += 1
+
+    def clear(self) -> None:
+        """
+        Function to discard the parts of all bilinear forms. Must be called whenever the bilinear forms are recreated.
+        """
+        self._forms.clear()
+
+    def reset_counters(self) -> None:
+        """
+        Function to reset the assembly, combination, and reuse counters.
+        """
+        self.assemblies = 0
+        self.combinations = 0
+        self.reuses = 0
+
+    def _assemble_in_full(self, a_assembled: BilinearForm) -> None:
+        """
+        Function to assemble a bilinear form in full.
+
+        Args:
+            a_assembled: The bilinear form.
+        """
+        a_assembled.Assemble()
+        self.assemblies += 1
+
+    def _split(self, a_assembled: BilinearForm, dt: Parameter) -> None:
+        """
+        Function to assemble the constant and dt-proportional parts of a bilinear form, and then the bilinear form
+        itself.
+
+        Args:
+            a_assembled: The bilinear form.
+            dt: The time step the bilinear form is affine in.
+        """
+        entry = _SplitForm(a_assembled, dt)
+        dt_value = dt.Get()
+
+        if dt_value == 0.0:
+            # The dt-proportional part can't be extracted, try again once there is a time step.
+            self._assemble_in_full(a_assembled)
+            return
+
+        try:
+            dt.Set(0.0)
+            self._assemble_in_full(a_assembled)
+            entry.constant = a_assembled.mat.AsVector().CreateVector()
+            entry.constant.data = a_assembled.mat.AsVector()
+
+            # Used below to check that the bilinear form really is affine in dt.
+            dt.Set(2.0 * dt_value)
+            self._assemble_in_full(a_assembled)
+            check = a_assembled.mat.AsVector().CreateVector()
+            check.data = a_assembled.mat.AsVector()
+        finally:
+            dt.Set(dt_value)
+
+        self._assemble_in_full(a_assembled)
+        entry.mat = a_assembled.mat
+        entry.assembled_dt = dt_value
+
+        # Extract the dt-proportional part from the bilinear form at the actual time step, which keeps the round-off
+        # error of the linear combinations small for time steps close to it.
+        entry.scaled = entry.constant.CreateVector()
+        entry.scaled.data = (1.0 / dt_value) * (a_assembled.mat.AsVector() - entry.constant)
+
+        # Check that the bilinear form really is affine in dt, ex: it does not contain 1/dt or dt^2 terms. NOTE: The
+        # comparison is written so that NaN values from dividing by dt = 0 also fail the check.
+        difference = check.CreateVector()
+        difference.data = check - entry.constant - (2.0 * dt_value) * entry.scaled
+        if not difference.Norm() <= 1e-10 * check.Norm():
+            logging.info('The bilinear form is not affine in dt, it will be re-assembled in full every time step.')
+            entry.constant = None
+            entry.scaled = None
+
+        self._forms[id(a_assembled)] = entry
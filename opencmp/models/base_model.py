@@ -17,16 +17,23 @@
 
 from abc import ABC, abstractmethod
 import logging
+import time
 from typing import Dict, List, Optional, Tuple, Union, cast
 
 import ngsolve as ngs
-from ngsolve.comp import ProxyFunction, FESpace, DifferentialSymbol
-from ngsolve import Parameter, GridFunction, BilinearForm, LinearForm, Preconditioner, CoefficientFunction
+from ngsolve.comp import ProxyFunction, FESpace, DifferentialSymbol, SumOfIntegrals
+from ngsolve import Parameter, GridFunction, BilinearForm, LinearForm, Preconditioner, CoefficientFunction, BaseMatrix
+from ngsolve.krylovspace import RichardsonSolver
 from pyngcore import BitArray
 
 from ..helpers import merge_bc_dict
+from ..helpers.anderson import AndersonAccelerator
+from ..helpers.expression_compiler import ExpressionCompiler
+from ..helpers.factorization import FactorizationCache
+from ..helpers.forcing_term import ForcingTerm
+from ..helpers.linear_solve_stats import LinearSolveResult, LinearSolveStatistics
+from ..helpers.preconditioners import PreconditionerUpdatePolicy, preconditioner_registry
 from ..config_functions import ConfigParser, BCFunctions, ICFunctions, ModelFunctions, RefSolFunctions
-from ..config_functions.load_config import parse_str
 from ..diffuse_interface import DIM
 from ..helpers.io import load_mesh
 from ..helpers.error import norm, mean
@@ -119,6 +126,27 @@ class Model(ABC):
             self.DIM_dir = self.config.get_item(['DIM', 'dim_dir'], str)
             self.DIM_solver = DIM(self.DIM_dir, self.run_dir, self.t_param)
 
+        # Cache of direct solver factorizations. It is disabled until the solver decides that the factorizations can
+        # safely be reused between linear solves.
+        self.factorization_cache = FactorizationCache()
+
+        # When the preconditioners are rebuilt after their bilinear forms are re-assembled. Otherwise the previous
+        # preconditioners are reused.
+        self.preconditioner_policy = PreconditionerUpdatePolicy(
+            self.config.get_item(['SOLVER', 'preconditioner_update_interval'], int, quiet=True),
+            self.config.get_item(['SOLVER', 'preconditioner_iteration_growth'], float, quiet=True),
+            self.config.get_item(['SOLVER', 'preconditioner_dt_change'], float, quiet=True))
+
+        # Record of the status of every linear solve, aggregated per time step and per run by the solver.
+        self.linear_solve_stats = LinearSolveStatistics()
+
+        # Indicator functions of the mesh markers, used to integrate HDG boundary terms.
+        self._boundary_indicators: Dict[str, GridFunction] = {}
+
+        # The GridFunctions the Dirichlet BC values are projected onto and the projectors onto the Dirichlet DOFs, for
+        # each model variable and component of the finite element space.
+        self._dirichlet_values: Dict[Tuple[str, Optional[int]], List] = {}
+
         # Load the mesh. If the diffuse interface method is being used the mesh will be constructed/loaded by the DIM
         # solver.
         self.load_mesh_fes(mesh=True, fes=False)
@@ -142,6 +170,21 @@ class Model(ABC):
             self.ipc = self.config.get_item(['DG', 'interior_penalty_coefficient'], float, quiet=True)
             logging.info('Using continuous Galerkin method')
 
+        # Check if the hybridized variant of DG should be used.
+        self.HDG = self.config.get_item(['DG', 'HDG'], bool, quiet=True)
+        if self.HDG:
+            if not self.DG:
+                logging.error('HDG is a DG method, set DG = True to use HDG.')
+                raise ValueError('HDG is a DG method, set DG = True to use HDG.')
+            if not self.allows_hdg():
+                logging.error('HDG is not implemented for the {} model.'.format(self.__class__.__name__))
+                raise ValueError('HDG is not implemented for the {} model.'.format(self.__class__.__name__))
+            logging.info('Using hybridized DIScontinuous Galerkin method')
+
+        # Dictionary to map variable name to the index of its facet unknowns inside fes/gridfunctions. Only HDG has
+        # facet unknowns, the models fill this in when constructing the finite element space.
+        self.facet_components: Dict[str, int] = {}
+
         self.no_constrained_dofs = self.config.get_item(['FINITE ELEMENT SPACE', 'no_constrained_dofs'],
                                                         bool, quiet=True)
 
@@ -185,9 +228,40 @@ class Model(ABC):
                     logging.error('Preconditioner cannot be None if using CG or MinRes solvers.')
                     raise ValueError('Preconditioner cannot be None if using CG or MinRes solvers.')
 
+        # The preconditioner type for the velocity block of the block preconditioners. BDDC does not work with the
+        # element-wise DOFs of DG, so DG defaults to a direct solve of the velocity block.
+        self.velocity_preconditioner = self.config.get_item(['SOLVER', 'velocity_preconditioner'], str, quiet=True)
+        if self.velocity_preconditioner == 'default':
+            self.velocity_preconditioner = 'direct' if self.DG else 'bddc'
+
         self.linear_tolerance = self.config.get_item(['SOLVER', 'linear_tolerance'], float, quiet=True)
         self.linear_max_iterations = self.config.get_item(['SOLVER', 'linear_max_iterations'], int, quiet=True)
 
+        # Whether the relative linear tolerance is measured against the residual of a zero initial guess instead of the
+        # residual of the actual initial guess.
+        self.zero_guess_reference = self.config.get_item(['SOLVER', 'zero_guess_reference'], bool, quiet=True)
+
+        # Whether the linear solves of a nonlinear solve only need to be as accurate as the current nonlinear iterate.
+        self.adaptive_linear_tolerance = self.config.get_item(['SOLVER', 'adaptive_linear_tolerance'], bool,
+                                                              quiet=True)
+        self.forcing_term = ForcingTerm(self.linear_tolerance)
+
+        # Anderson mixing of the iterates of a nonlinear solve.
+        self.anderson = AndersonAccelerator(
+            self.config.get_item(['SOLVER', 'anderson_vectors'], int, quiet=True),
+            self.config.get_item(['SOLVER', 'anderson_regularization'], float, quiet=True),
+            self.config.get_item(['SOLVER', 'mixing_parameter'], float, quiet=True))
+
+        # Whether to eliminate the element-interior DOFs before the linear solve. DG couples the DOFs of neighbouring
+        # elements through the jump terms so there are no element-interior DOFs to eliminate.
+        self.static_condensation = self.config.get_item(['SOLVER', 'static_condensation'], bool, quiet=True)
+        if self.HDG:
+            # HDG only couples the elements through the facet unknowns, so the element unknowns are always eliminated.
+            self.static_condensation = True
+        elif self.static_condensation and self.DG:
+            logging.warning('Static condensation is not supported with DG, turning it off.')
+            self.static_condensation = False
+
         # assume model is linear by default
         self.nonlinear = False
 
@@ -229,8 +303,16 @@ class Model(ABC):
         # Now that we have the FES, we can load in the bc gridfunctions
         # Load any boundary conditions saved as gridfunctions.
         self.BC = self.bc_functions.load_bc_gridfunctions(self.BC, self.fes, self.model_components)
+
+        # Optionally compile the coefficientfunctions parsed from the config files before they are used anywhere.
+        self.expression_compiler: Optional[ExpressionCompiler] = None
+        if self.config.get_item(['OTHER', 'compile_expressions'], bool, quiet=True):
+            self.expression_compiler = ExpressionCompiler(self.config.get_item(['OTHER', 'realcompile_expressions'],
+                                                                               bool, quiet=True))
+            self._compile_expressions()
+
         # TODO: Give good description of this variable here
-        self.g_D = self.bc_functions.set_dirichlet_boundary_conditions(self.BC, self.mesh, self.construct_gfu_ic(),
+        self.g_D = self.bc_functions.set_dirichlet_boundary_conditions(self.BC, self.mesh, self._trial,
                                                                        self.model_components)
 
         # Load the model functions and model parameters.
@@ -252,6 +334,9 @@ class Model(ABC):
             self.DIM_bc_functions = BCFunctions(self.DIM_dir + '/bc_dir/dim_bc_config', self.run_dir, self.mesh,
                                                 self._define_bc_types(),
                                                 self.t_param, self.update_variables)
+            if self.expression_compiler is not None:
+                self.DIM_bc_functions.expression_compiler = self.expression_compiler
+                self.expression_compiler.compile(self.DIM_bc_functions.bc_dict)
             self.DIM_BC, DIM_dirichlet_names = self.DIM_bc_functions.set_boundary_conditions(self._define_bc_types())
             self.DIM_BC = self.DIM_bc_functions.load_bc_gridfunctions(self.DIM_BC, self.fes, self.model_components)
 
@@ -323,6 +408,60 @@ class Model(ABC):
         """
         return ngs.ds(skeleton=self.DG, definedon=self.mesh.Boundaries(marker))
 
+    def _reference_residual(self, a_assembled: BilinearForm, rhs: ngs.BaseVector, precond: Optional[Preconditioner],
+                            freedofs: BitArray, gfu: GridFunction) -> float:
+        """
+        Function to get the squared preconditioned residual of the initial guess that is zero on the free DOFs.
+
+        Args:
+            a_assembled: The assembled bilinear form.
+            rhs: The right-hand side of the linear system.
+            precond: The preconditioner, None if the iterative solver is unpreconditioned.
+            freedofs: The free DOFs of the linear system.
+            gfu: The gridfunction holding the Dirichlet BC values.
+
+        Returns:
+            The squared preconditioned residual, as measured by NGSolve's iterative solvers.
+        """
+        x0 = gfu.vec.CreateVector()
+        x0.data = ngs.Projector(freedofs, False) * gfu.vec
+
+        r0 = rhs.CreateVector()
+        r0.data = rhs - a_assembled.mat * x0
+
+        w0 = rhs.CreateVector()
+        if precond is None:
+            w0.data = ngs.Projector(freedofs, True) * r0
+        else:
+            w0.data = precond * r0
+
+        return abs(ngs.InnerProduct(w0, r0))
+
+    def _bilinear_boundary_term(self, integrand: CoefficientFunction, marker: str) -> SumOfIntegrals:
+        """
+        Function to integrate a bilinear form term over the given mesh marker.
+
+        HDG finite element spaces do not include the DG couplings that ds(skeleton=True) needs in a bilinear form, so
+        for HDG the term is integrated over the element boundaries and restricted to the marker by an indicator
+        function.
+
+        Args:
+            integrand: The integrand of the bilinear form term.
+            marker: String representing the mesh marker(s) to integrate over.
+
+        Returns:
+            The integrated term, to be added to a bilinear form.
+        """
+        if self.HDG:
+            if marker not in self._boundary_indicators:
+                indicator = ngs.GridFunction(ngs.FacetFESpace(self.mesh, order=0))
+                indicator.Set(1.0, definedon=self.mesh.Boundaries(marker))
+                self._boundary_indicators[marker] = indicator
+
+            return self._boundary_indicators[marker] * integrand * ngs.dx(element_boundary=True)
+
+        return integrand * self._ds(marker)
+
     def apply_dirichlet_bcs_to(self, gfu: GridFunction, time_step: int = 0) -> None:
         """
         Function to set the Dirichlet boundary conditions within the solution GridFunction.
@@ -335,15 +474,54 @@ class Model(ABC):
         # NOTE: DO NOT change from definedon=self.mesh.Boundaries(marker) to definedon=marker.
         if len(self.g_D) > 0:
             if len(gfu.components) == 0:  # Single trial functions
-                # TODO: IDE is complaining that we don't specify parameter VOL_OR_BND for .Set()
-                gfu.Set(self.g_D['u'][time_step], definedon=self.mesh.Boundaries(self.dirichlet_names['u']))
+                self._set_boundary_values(gfu, 'u', None, time_step)
             else:  # Multiple trial functions.
                 for component_name in self.g_D.keys():
                     i = self.model_components[component_name]
                     # Apply Dirichlet or pinned BCs, but only to non-L2 space
                     if 'L2' not in self.fes.components[i].name:
-                        gfu.components[i].Set(self.g_D[component_name][time_step],
-                                              definedon=self.mesh.Boundaries(self.dirichlet_names[component_name]))
+                        self._set_boundary_values(gfu.components[i], component_name, i, time_step)
+                    # HDG applies the Dirichlet BCs to the facet unknowns.
+                    if component_name in self.facet_components:
+                        j = self.facet_components[component_name]
+                        self._set_boundary_values(gfu.components[j], component_name, j, time_step)
+
+    def _set_boundary_values(self, gfu: GridFunction, var: str, component: Optional[int], time_step: int) -> None:
+        """
+        Function to set the Dirichlet boundary condition values of a GridFunction without changing its other values.
+
+        GridFunction.Set zeros every DOF outside of the region it is defined on, which would throw away the initial
+        guess that iterative linear solvers start from. So the values are projected onto a separate GridFunction, which
+        is kept for the next call along with the boundary DOFs. If the boundary condition depends neither on time nor on
+        the model variables the projection itself is also reused until the boundary condition changes.
+
+        Args:
+            gfu: The GridFunction (or component of a GridFunction) to set the boundary values of.
+            var: The model variable whose Dirichlet boundary condition should be applied.
+            component: The component of the finite element space gfu belongs to, None for single trial functions.
+            time_step: Specifies which time step's boundary condition values to use.
+        """
+        value = self.g_D[var][time_step]
+        time_independent = self.bc_functions.dirichlet_time_independent.get(var, False)
+
+        cached = self._dirichlet_values.get((var, component))
+        if cached is None or len(cached[2].vec) != gfu.space.ndof:
+            boundary = self.mesh.Boundaries(self.dirichlet_names[var])
+            boundary_dofs = gfu.space.GetDofs(boundary)
+            cached = [None, boundary, GridFunction(gfu.space), ngs.Projector(boundary_dofs, False),
+                      ngs.Projector(boundary_dofs, True)]
+            self._dirichlet_values[(var, component)] = cached
+
+        g_D_lst, boundary, boundary_values, interior_projector, boundary_projector = cached
+
+        # The values of a time-independent boundary condition are the same at every time step, so they only need to be
+        # projected again if the boundary condition was rebuilt.
+        if not time_independent or g_D_lst is not self.g_D[var]:
+            # TODO: IDE is complaining that we don't specify parameter VOL_OR_BND for .Set()
+            boundary_values.Set(value, definedon=boundary)
+            cached[0] = self.g_D[var] if time_independent else None
+
+        gfu.vec.data = interior_projector * gfu.vec + boundary_projector * boundary_values.vec
 
     def construct_gfu(self) -> GridFunction:
         """
@@ -367,26 +545,205 @@ class Model(ABC):
 
         return gfu
 
-    def construct_preconditioners(self, a_assembled: List[BilinearForm]) -> List[Preconditioner]:
+    def construct_preconditioners(self, a_assembled: List[BilinearForm], dt: Optional[Parameter] = None) \
+            -> List[Union[Preconditioner, BaseMatrix]]:
         """
         Function to construct the preconditioners needed by the model.
 
+        Preconditioners registered with helpers.preconditioners.register_preconditioner take precedence over the NGSolve
+        preconditioners of the same name.
+
         Args:
             a_assembled: A list of the assembled bilinear form.
+            dt: The time step used in the bilinear forms, None for a stationary solve. Only used by the registered
+                preconditioners.
 
         Returns:
             A list of the constructed preconditioners.
         """
-        contructed_preconditioners: List[Preconditioner] = []
+        contructed_preconditioners: List[Union[Preconditioner, BaseMatrix]] = []
 
         for i in range(len(self.preconditioners)):
             if self.preconditioners[i] is None:
                 contructed_preconditioners.append(None)
+            elif self.preconditioners[i] in preconditioner_registry:
+                constructor = preconditioner_registry[self.preconditioners[i]]
+                contructed_preconditioners.append(constructor(self, a_assembled[i], dt))
+            elif not self._updated_on_assembly(self.preconditioners[i]):
+                # The preconditioner policy decides when to update the preconditioner, so it must not be updated
+                # automatically every time the bilinear form is assembled.
+                contructed_preconditioners.append(ngs.Preconditioner(a_assembled[i], self.preconditioners[i],
+                                                                     not_register_for_auto_update=True))
             else:
+                # Other NGSolve preconditioners (ex: bddc, h1amg) are built from the element matrices while the bilinear
+                # form is assembled, so they are rebuilt on every assembly and can't be reused.
                 contructed_preconditioners.append(ngs.Preconditioner(a_assembled[i], self.preconditioners[i]))
+                self.preconditioner_policy.track(contructed_preconditioners[-1], dt, reusable=False)
+                continue
+
+            self.preconditioner_policy.track(contructed_preconditioners[-1], dt)
 
         return contructed_preconditioners
 
+    def preconditioners_require_assembly(self) -> bool:
+        """
+        Function to check whether any of the model's preconditioners are built while the bilinear form is assembled, in
+        which case the bilinear form must be assembled in full for the preconditioner to see new matrix values.
+
+        Returns:
+            True if any of the preconditioners are built during assembly, else False.
+        """
+        return any(self._updated_on_assembly(name) for name in self.preconditioners)
+
+    @staticmethod
+    def _updated_on_assembly(name: Optional[str]) -> bool:
+        """
+        Function to check whether a preconditioner is an NGSolve preconditioner that is built from the element matrices
+        while the bilinear form is assembled (ex: bddc, h1amg).
+
+        Args:
+            name: The name of the preconditioner type.
+
+        Returns:
+            True if the preconditioner is built during assembly, else False.
+        """
+        return name is not None and name not in preconditioner_registry and name not in ['local', 'direct', 'multigrid']
+
+    def _construct_block_preconditioner(self, a_assembled: BilinearForm, triangular: bool,
+                                        dt: Optional[Parameter]) -> BaseMatrix:
+        """
+        Function to construct a block preconditioner for the assembled bilinear form.
+
+        Only models whose weak form has a block structure (ex: velocity-pressure saddle point systems) can implement
+        this.
+
+        Args:
+            a_assembled: The assembled bilinear form.
+            triangular: If True construct a block triangular preconditioner, otherwise a block diagonal one.
+            dt: The time step used in the bilinear form, None for a stationary solve.
+
+        Returns:
+            The block preconditioner.
+        """
+        raise ValueError('Block preconditioners are not implemented for the {} model.'.format(self.__class__.__name__))
+
+    def bilinear_form_is_time_invariant(self) -> bool:
+        """
+        Function to check whether the model's bilinear form(s) only change when dt changes.
+
+        This is used by the solver to decide if the factorization of the assembled bilinear form can be reused between
+        time steps. The check is conservative: any nonlinearity, moving phase field, model parameter that is not a plain
+        number, or model function or BC in the bilinear form that may depend on time or on the model variables marks the
+        bilinear form as time-varying.
+
+        Returns:
+            True if the bilinear form(s) are time-invariant (aside from dt), else False.
+        """
+        if self.nonlinear:
+            return False
+
+        return self._model_data_is_time_invariant()
+
+    def _model_data_is_time_invariant(self) -> bool:
+        """
+        Helper function for bilinear_form_is_time_invariant that checks everything except the linearity of the model.
+
+        Returns:
+            True if the phase field, the model parameters, and the model functions and BCs that appear in the bilinear
+            form(s) are fixed in time, else False.
+        """
+        if self.DIM and self.DIM_solver.rigid_body_motion:
+            # The phase field moves with time.
+            return False
+
+        if self.expressions_depend_on_model_variables():
+            return False
+
+        # Time-dependent expressions are parsed into coefficientfunctions of the time parameter, while constants are
+        # parsed into plain numbers.
+        for var_dict in self.model_functions.model_parameters_dict.values():
+            for val_lst in var_dict.values():
+                if not all(isinstance(val, (int, float)) for val in val_lst):
+                    return False
+
+        for function in self._bilinear_form_model_functions():
+            for val_lst in self.model_functions.model_functions_dict.get(function, {}).values():
+                # Gridfunctions are loaded from file.
+                if not all(isinstance(val, (int, float, GridFunction)) for val in val_lst):
+                    return False
+
+        # The BC functions know which BC values were parsed from expressions that don't use the time.
+        bc_lst = [(self.bc_functions, self.BC)]
+        if self.DIM:
+            bc_lst.append((self.DIM_bc_functions, self.DIM_BC))
+
+        for bc_functions, bc_dict in bc_lst:
+            for bc_type in self._bilinear_form_bc_types():
+                for var, marker_dict in bc_dict.get(bc_type, {}).items():
+                    if not bc_functions.time_independent(bc_type, var, marker_dict):
+                        return False
+
+        return True
+
+    def _bilinear_form_model_functions(self) -> List[str]:
+        """
+        Function to specify which model functions can appear in the bilinear form(s) of the model.
+
+        Used to check if the bilinear form(s) are time-invariant. By default every model function is assumed to.
+
+        Returns:
+            List of the names of the model functions.
+        """
+        return list(self.model_functions.model_functions_dict.keys())
+
+    def _bilinear_form_bc_types(self) -> List[str]:
+        """
+        Function to specify the types of BCs whose values can appear in the bilinear form(s) of the model.
+
+        Used to check if the bilinear form(s) are time-invariant. By default the values of every type of BC are assumed
+        to. BCs whose mesh markers, but not values, appear in the bilinear form(s) (ex: strongly imposed Dirichlet BCs)
+        don't need to be included.
+
+        Returns:
+            List of the BC types.
+        """
+        return self._define_bc_types()
+
+    def _compile_expressions(self) -> None:
+        """
+        Function to compile the coefficientfunctions of the BCs, model parameters and functions, and reference solutions.
+
+        The initial conditions are only evaluated once, so they aren't compiled. Expressions that are re-parsed with new
+        model variable values are compiled as they are re-parsed.
+        """
+        for config_functions in [self.bc_functions, self.model_functions, self.ref_sol_functions]:
+            config_functions.expression_compiler = self.expression_compiler
+
+        self.expression_compiler.compile(self.bc_functions.bc_dict)
+        self.expression_compiler.compile(self.model_functions.model_parameters_dict)
+        self.expression_compiler.compile(self.model_functions.model_functions_dict)
+        self.expression_compiler.compile(self.ref_sol_functions.ref_sol_dict)
+
+    def expressions_depend_on_model_variables(self) -> bool:
+        """
+        Function to check whether any model parameter, model function, or BC depends on the model variables.
+
+        Such expressions are re-parsed every time step with the model variable values of each time level, so weak forms
+        that contain them are tied to the gridfunctions that held those values when the weak forms were created.
+
+        Returns:
+            True if any expression is re-parsed when the model variables are updated, else False.
+        """
+        if any(len(re_parse) > 0 for re_parse in self.model_functions.model_parameters_re_parse_dict.values()):
+            return True
+        if any(len(re_parse) > 0 for re_parse in self.model_functions.model_functions_re_parse_dict.values()):
+            return True
+        if any(len(re_parse) > 0 for var_dict in self.bc_functions.bc_re_parse_dict.values()
+               for re_parse in var_dict.values()):
+            return True
+
+        return False
+
     def get_trial_and_test_functions(self) -> Tuple[List[ProxyFunction], List[ProxyFunction]]:
         """
         Function return the trial and test (weighting) function(s) for the model.
@@ -419,6 +776,13 @@ class Model(ABC):
             # Load/reload the finite element space.
             self.fes = self._construct_fes()
 
+        # Any cached factorizations, preconditioners, boundary indicators and Dirichlet BC projections were for the old
+        # mesh/finite element space.
+        self.factorization_cache.clear()
+        self.preconditioner_policy.clear()
+        self._boundary_indicators = {}
+        self._dirichlet_values = {}
+
     # TODO: Move to time_integration_schemes.py
     def time_derivative_terms(self, gfu_lst: List[List[GridFunction]], scheme: str, step: int = 1) \
             -> Tuple[List[CoefficientFunction], List[CoefficientFunction]]:
@@ -464,10 +828,10 @@ class Model(ABC):
             a_tmp = ngs.CoefficientFunction(0.0)
             L_tmp = ngs.CoefficientFunction(0.0)
 
-            # Loop over each trial function
+            # Loop over each trial function, the HDG facet unknowns have no time derivative of their own
             for i in range(len(U)):
                 # TODO: WHY DOES THIS GET OUT OF BOUNDS
-                if i not in ignore_indices[j]:
+                if i not in ignore_indices[j] and i not in self.facet_components.values():
                     # TODO: Figure out a better way to do this so that the string is stored elsewhere. Maybe a named tuple.
                     if scheme == 'explicit euler':
                         a_tmp += U[i] * V[i]
@@ -515,9 +879,12 @@ class Model(ABC):
 
         # Reload everything as grid functions
         self.BC = self.bc_functions.load_bc_gridfunctions(self.BC, self.fes, self.model_components)
-        self.g_D = self.bc_functions.set_dirichlet_boundary_conditions(self.BC, self.mesh, self.construct_gfu(),
+        self.g_D = self.bc_functions.set_dirichlet_boundary_conditions(self.BC, self.mesh, self._trial,
                                                                        self.model_components)
 
+        # The new BC values may appear in the bilinear form, so any cached factorizations may be out of date.
+        self.factorization_cache.invalidate()
+
     def update_model_variables(self, updated_gfu: Union[GridFunction, List[ProxyFunction]], ic_update: bool = False,
                                ref_sol_update: bool = False, time_step: Optional[int] = None) -> None:
         """
@@ -568,9 +935,10 @@ class Model(ABC):
             # to update the model variable values with information from previous time steps.
             assert len(self.update_variables) > 1
 
-            # First shift values at previous time steps to reflect that a new time step has started.
-            for i in range(1, len(self.update_variables)-1):
-                self.update_variables[-i] = self.update_variables[-(i + 1)].copy()
+            # First shift values at previous time steps to reflect that a new time step has started. The dictionary of
+            # the oldest time step is reused for the just solved time step, every value in it is overwritten below.
+            if len(self.update_variables) > 2:
+                self.update_variables.insert(1, self.update_variables.pop())
 
             # Then get the values for the just solved time step.
             for key in self.model_components.keys():
@@ -597,8 +965,9 @@ class Model(ABC):
                     val_lst = [re_parse_expression(self.t_param, self.update_variables, self.mesh, i) for i in range(len(self.t_param))]
 
                 else:
-                    val_lst, _ = parse_str(self.model_functions.model_parameters_re_parse_dict[parameter][var],
-                                           self.run_dir, self.t_param, self.update_variables, mesh=self.mesh)
+                    # Use the model functions' cache of re-parsed expressions.
+                    val_lst = self.model_functions.re_parse({}, {var: re_parse_expression}, self.t_param,
+                                                            self.update_variables, self.mesh)[var]
 
             else:
                 # Just grab the value of the parameter from model_functions.model_parameters_dict. Note that this needs
@@ -615,7 +984,7 @@ class Model(ABC):
         # Start with the boundary conditions.
         self.bc_functions.update_boundary_conditions(self.t_param, self.update_variables, self.mesh)
         self.BC, dirichlet_names = self.bc_functions.set_boundary_conditions(self.BC)
-        self.g_D = self.bc_functions.set_dirichlet_boundary_conditions(self.BC, self.mesh, self.construct_gfu(),
+        self.g_D = self.bc_functions.set_dirichlet_boundary_conditions(self.BC, self.mesh, self._trial,
                                                                        self.model_components)
 
         # Also update the DIM boundary conditions if they exist.
@@ -659,6 +1028,16 @@ class Model(ABC):
             True if the model can be used with fully explicit time integration schemes, else False.
         """
 
+    @staticmethod
+    def allows_hdg() -> bool:
+        """
+        Function to specify whether a given model implements the hybridized DG (HDG) discretization.
+
+        Returns:
+            True if the model can be used with HDG, else False.
+        """
+        return False
+
     @abstractmethod
     def _construct_fes(self) -> FESpace:
         """
@@ -871,18 +1250,50 @@ class Model(ABC):
             time_step: What time step values to use if _apply_dirichlet_bcs_to must be called.
         """
 
+    def direct_inverse(self, a_assembled: BilinearForm, freedofs: Optional[BitArray]) -> BaseMatrix:
+        """
+        Function to get the sparse direct inverse of an assembled bilinear form.
+
+        Reuses the previous factorization if the solver has determined that the matrix values are unchanged, otherwise
+        only refactorizes numerically if the sparsity pattern is unchanged.
+
+        Args:
+            a_assembled: The assembled bilinear form.
+            freedofs: The free DOFs of the finite element space.
+
+        Returns:
+            The inverse of the bilinear form's matrix.
+        """
+        # prefer PARDISO if available, else use UMFPACK, note that pip version of NGSolve does
+        # does not seem to populate the ngsolve.config.USE_PARDISO etc. variables correctly
+        if ngs.config.USE_PARDISO or ngs.config.USE_MKL:
+            inverse_solver = "pardiso"
+        elif ngs.config.USE_UMFPACK:
+            inverse_solver = "umfpack"
+        else:
+            raise NameError("NGSolve compiled without PARDISO or UMFPACK support.")
+
+        return self.factorization_cache.get_inverse(a_assembled, freedofs, inverse_solver)
+
     def linear_solve(self, a_assembled: BilinearForm, L_assembled: LinearForm, precond: Preconditioner,
-                                 gfu: GridFunction) -> None:
+                                 gfu: GridFunction, relative_tolerance: Optional[float] = None) -> LinearSolveResult:
         """
         Function to solve of the linear system associated with the model.
 
-        This function performs a linear solve of the linear system associated with the model.
+        This function performs a linear solve of the linear system associated with the model. The status of the solve
+        is returned and also recorded in self.linear_solve_stats.
+
         Args:
             a_assembled: The assembled bilinear form.
             L_assembled: The assembled linear form.
             precond: The preconditioner.
             gfu: The gridfunction holding information about any Dirichlet BCs which will be updated to hold the
                 solution.
+            relative_tolerance: If given, iterative solvers stop once the residual of the initial guess has been
+                reduced by this factor (or linear_tolerance is reached). Used by inexact nonlinear solves.
+
+        Returns:
+            The number of iterations, final residual, convergence status, and wall time of the solve.
         """
 
         if precond is None:
@@ -891,48 +1302,113 @@ class Model(ABC):
             if self.no_constrained_dofs:
                 raise ValueError('Must constrain Dirichlet DOFs if not providing a preconditioner.')
 
-        freedofs: Optional[BitArray] = self.fes.FreeDofs()
+        # With static condensation the solve only involves the DOFs that couple between elements.
+        condense = a_assembled.condense
+        freedofs: Optional[BitArray] = self.fes.FreeDofs(condense)
 
-        if self.linear_solver == 'direct':
-            # prefer PARDISO if available, else use UMFPACK, note that pip version of NGSolve does
-            # does not seem to populate the ngsolve.config.USE_PARDISO etc. variables correctly
-            if ngs.config.USE_PARDISO or ngs.config.USE_MKL:
-                inverse_solver = "pardiso"
-            elif ngs.config.USE_UMFPACK:
-                inverse_solver = "umfpack"
-            else:
-                raise NameError("NGSolve compiled without PARDISO or UMFPACK support.")
+        start_time = time.perf_counter()
+
+        if condense:
+            # The element-interior DOFs are rebuilt from the coupling DOFs after the solve, so clear any old values.
+            ngs.Projector(self.fes.FreeDofs() & ~freedofs, False).Project(gfu.vec)
 
-            inv = a_assembled.mat.Inverse(freedofs=freedofs, inverse=inverse_solver)
+            # Condense the element-interior contributions into the right-hand side.
+            rhs = L_assembled.vec.CreateVector()
+            rhs.data = L_assembled.vec
+            rhs.data += a_assembled.harmonic_extension_trans * rhs
+        else:
+            rhs = L_assembled.vec
+
+        if self.linear_solver == 'direct':
+            inv = self.direct_inverse(a_assembled, freedofs)
 
-            r = L_assembled.vec.CreateVector()
-            r.data = L_assembled.vec - a_assembled.mat * gfu.vec
+            r = rhs.CreateVector()
+            r.data = rhs - a_assembled.mat * gfu.vec
             gfu.vec.data += inv * r
 
-        elif self.linear_solver == 'CG':
-            solver = ngs.solvers.CG(mat=a_assembled.mat, rhs=L_assembled.vec, pre=precond, sol=gfu.vec,
-                           tol=self.linear_tolerance, maxsteps=self.linear_max_iterations, printrates=self.verbose,
-                           initialize=False)
-
-        elif self.linear_solver == 'MinRes':
-            ngs.solvers.MinRes(mat=a_assembled.mat, rhs=L_assembled.vec, pre=precond, sol=gfu.vec,
-                               tol=self.linear_tolerance, maxsteps=self.linear_max_iterations,
-                               printrates=self.verbose)
-
-        elif self.linear_solver == 'GMRes':
-            ngs.solvers.GMRes(A=a_assembled.mat, b=L_assembled.vec, pre=precond, freedofs=freedofs,
-                              x=gfu.vec, tol=self.linear_tolerance, maxsteps=self.linear_max_iterations,
-                              printrates=self.verbose)
-
-        elif self.linear_solver == 'Richardson':
-            # TODO: User should be able to set a damping factor.
-            ret = ngs.solvers.PreconditionedRichardson(a=a_assembled, rhs=L_assembled.vec, pre=precond,
-                                                       freedofs=freedofs, tol=self.linear_tolerance,
-                                                       maxit=self.linear_max_iterations, printing=self.verbose)
-            gfu.vec.data = ret
+            # The residual of a direct solve is only nonzero due to round-off, so it isn't computed.
+            result = LinearSolveResult(self.linear_solver, 0, 0.0, True, time.perf_counter() - start_time)
+
         else:
-            logging.error('No linear solver specified.')
-            raise ValueError("No linear solver specified.")
+            # When a preconditioner is given it already acts only on the free DOFs.
+            solver_freedofs = freedofs if precond is None else None
+
+            # All iterative solves start from gfu, which holds the Dirichlet BC values. The solvers only update the free
+            # DOFs, so the Dirichlet BC values are kept.
+
+            # The relative tolerances are measured against the residual of the initial guess unless they should be
+            # measured against the residual of an initial guess that is zero on the free DOFs. Measuring against the
+            # residual of the actual initial guess makes a good initial guess give a more accurate solve instead of a
+            # cheaper one, but the zero guess residual costs an extra matrix-vector product and preconditioner
+            # application.
+            tol, atol, reference = self.linear_tolerance, None, 0.0
+            if self.zero_guess_reference:
+                reference = self._reference_residual(a_assembled, rhs, precond, freedofs, gfu)
+                if reference > 0.0:
+                    tol, atol = None, self.linear_tolerance * ngs.sqrt(reference)
+
+            # An inexact solve only needs to reduce the residual of its initial guess, but never solves more
+            # accurately than an exact solve would.
+            if relative_tolerance is not None:
+                tol = relative_tolerance
+
+            if self.linear_solver == 'CG':
+                solver = ngs.solvers.CGSolver(mat=a_assembled.mat, pre=precond, freedofs=solver_freedofs,
+                                              tol=tol, atol=atol, maxiter=self.linear_max_iterations,
+                                              printrates=self.verbose)
+                solver.Solve(rhs=rhs, sol=gfu.vec, initialize=False)
+
+            elif self.linear_solver == 'MinRes':
+                solver = ngs.solvers.MinResSolver(mat=a_assembled.mat, pre=precond, freedofs=solver_freedofs,
+                                                  tol=tol, atol=atol, maxiter=self.linear_max_iterations,
+                                                  printrates=self.verbose)
+                solver.Solve(rhs=rhs, sol=gfu.vec, initialize=False)
+
+            elif self.linear_solver == 'GMRes':
+                solver = ngs.solvers.GMResSolver(mat=a_assembled.mat, pre=precond, freedofs=solver_freedofs,
+                                                 tol=tol, atol=atol, maxiter=self.linear_max_iterations,
+                                                 printrates=self.verbose)
+                solver.Solve(rhs=rhs, sol=gfu.vec, initialize=False)
+
+            elif self.linear_solver == 'Richardson':
+                # TODO: User should be able to set a damping factor.
+                # NGSolve's Richardson solver measures the squared residual.
+                solver = RichardsonSolver(mat=a_assembled.mat, pre=precond, freedofs=solver_freedofs,
+                                          tol=tol if relative_tolerance is None else relative_tolerance ** 2,
+                                          atol=None if atol is None else self.linear_tolerance * reference,
+                                          maxiter=self.linear_max_iterations, printrates=self.verbose)
+                solver.Solve(rhs=rhs, sol=gfu.vec, initialize=False)
+
+            else:
+                logging.error('No linear solver specified.')
+                raise ValueError("No linear solver specified.")
+
+            # The first entry of the residual history is the initial residual. A solver that stopped early without
+            # reaching its tolerance (ex: GMRes breakdown) did not converge.
+            residuals = list(solver.residuals)
+            residual = residuals[-1] if residuals else 0.0
+            target = solver.atol if solver.atol is not None else 0.0
+            if solver.tol is not None and residuals:
+                target = max(target, solver.tol * residuals[0])
+            converged = residual <= target
+
+            result = LinearSolveResult(self.linear_solver, max(len(residuals) - 1, 0), residual, converged,
+                                       time.perf_counter() - start_time, residuals)
+
+            if not converged:
+                logging.warning('{0} did not converge in {1} iterations (residual {2:.3e}).'
+                                .format(self.linear_solver, result.iterations, residual))
+
+        if condense:
+            # Recover the element-interior DOFs.
+            gfu.vec.data += a_assembled.harmonic_extension * gfu.vec
+            gfu.vec.data += a_assembled.inner_solve * rhs
+            result.wall_time = time.perf_counter() - start_time
+
+        self.linear_solve_stats.record(result)
+        self.preconditioner_policy.record_iterations(precond, result.iterations)
+
+        return result
 
     def linearized_solve(self, a_assembled: BilinearForm, L_assembled: LinearForm, precond: Preconditioner, gfu: GridFunction) -> Tuple[float, float]:
         """
@@ -954,10 +1430,8 @@ class Model(ABC):
         # assume linear model, will be overriden for nonlinear models
         self.linear_solve(a_assembled, L_assembled, precond, gfu)
 
-        # currently NGSolve's linear solver implementations do not expose the linear solver status, including residuals,
-        # number of iterations to convergence, etc.
-        # Assume that the linear solver converged and error is within numerical precision and the norm of the solution
-        # is irrelevant
+        # The status of the linear solve (iterations, residual, etc.) is recorded in self.linear_solve_stats. A linear
+        # model needs no further iterations, so the nonlinear error is zero and the norm of the solution is irrelevant.
         return(0., 0.)
 
     def update_linearization(self, gfu: GridFunction):
@@ -973,3 +1447,15 @@ class Model(ABC):
 
         # assuming linear model
         pass
+
+    def linear_form_depends_on_linearization(self) -> bool:
+        """
+        Function to check whether the model's linear form(s) change when the linearization variables are updated.
+
+        The JFNK nonlinear solver only re-assembles the linear form for every residual evaluation if it does. The check
+        is conservative, models whose linear forms never use the linearization variables should override it.
+
+        Returns:
+            True if the linear form(s) depend on the linearization variables, else False.
+        """
+        return True
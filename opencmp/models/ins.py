@@ -20,14 +20,15 @@ from typing import Dict, List, Tuple, Optional, Union
 
 import ngsolve
 from ngsolve.comp import ProxyFunction
-from ngsolve import Grad, HDiv, IfPos, InnerProduct, Norm, OuterProduct, Parameter, GridFunction, FESpace, BilinearForm, \
-    LinearForm, \
-    Preconditioner, div, dx
+from ngsolve import Grad, H1, HDiv, L2, IfPos, InnerProduct, Norm, OuterProduct, Parameter, GridFunction, FESpace, \
+    BilinearForm, LinearForm, TangentialFacetFESpace, \
+    Preconditioner, div, dx, BaseMatrix
 
-from ..helpers.ngsolve_ import get_special_functions
-from ..helpers.dg import avg, jump, grad_avg
-from . import Model
+from ..helpers.ngsolve_ import get_special_functions, rms_norm
 from ..helpers.error import norm, mean
+from ..helpers.dg import avg, jump, grad_avg, tangential
+from . import Model
+from ..helpers.preconditioners import SaddlePointPreconditioner
 
 
 class INS(Model):
@@ -46,11 +47,17 @@ class INS(Model):
         self.nonlinear = True
 
         self.linearize = self.config.get_item(['SOLVER', 'linearization_method'], str)
-        if self.linearize not in ['Oseen', 'IMEX']:
+        if self.linearize not in ['Oseen', 'Newton', 'IMEX']:
             self.linearize = 'Oseen'
             logging.info('Linearization method not specified, using Oseen by default.')
 
-        if self.linearize == 'Oseen':
+        if self.linearize == 'Newton':
+            if not self.allows_newton():
+                raise NotImplementedError('Newton linearization is not yet implemented for this model.')
+            if self.DG:
+                raise NotImplementedError('DG Newton linearization is not yet implemented.')
+
+        if self.linearize in ['Oseen', 'Newton']:
             nonlinear_tolerance = self.config.get_dict(['SOLVER', 'nonlinear_tolerance'], self.run_dir, None)
             self.abs_nonlinear_tolerance = nonlinear_tolerance['absolute']
             self.rel_nonlinear_tolerance = nonlinear_tolerance['relative']
@@ -60,6 +67,14 @@ class INS(Model):
                                  'at least 1.')
             self.W = self._construct_linearization_terms()
 
+        # Whether the Oseen iterations of each time step mix the new velocities into the wind with Anderson mixing
+        # instead of using them directly.
+        self.anderson_picard = self.linearize == 'Oseen' and \
+            self.config.get_item(['SOLVER', 'nonlinear_solver'], str, quiet=True) == 'Anderson'
+
+        if self.HDG and self.linearize == 'IMEX':
+            raise NotImplementedError('HDG IMEX is not yet implemented.')
+
     def _define_model_components(self) -> Dict[str, Optional[int]]:
         return {'u': 0,
                 'p': 1}
@@ -80,11 +95,33 @@ class INS(Model):
     def _define_bc_types(self) -> List[str]:
         return ['dirichlet', 'stress', 'parallel', 'pinned']
 
+    def _bilinear_form_model_functions(self) -> List[str]:
+        # The source only appears in the linear form.
+        return []
+
+    def _bilinear_form_bc_types(self) -> List[str]:
+        # Only the markers of the BCs appear in the bilinear form, not their values.
+        return []
+
     @staticmethod
     def allows_explicit_schemes() -> bool:
         # INS cannot work with explicit schemes
         return False
 
+    @staticmethod
+    def allows_hdg() -> bool:
+        return True
+
+    @staticmethod
+    def allows_newton() -> bool:
+        """
+        Function to specify whether a given model implements the Newton linearization of the convection term.
+
+        Returns:
+            True if the model can be used with Newton linearization, else False.
+        """
+        return True
+
     def _set_model_parameters(self) -> None:
         self.kv: Dict = self.model_functions.model_parameters_dict['kinematic_viscosity']['all']
         self.f: Dict  = self.model_functions.model_functions_dict['source']
@@ -93,7 +130,12 @@ class INS(Model):
             self.f.pop('u')
 
     def _construct_fes(self) -> FESpace:
-        return FESpace(self._construct_fes_helper(), dgjumps=self.DG)
+        fes_total = self._construct_fes_helper()
+
+        if self.HDG:
+            fes_total += self._construct_facet_fes_helper(len(fes_total))
+
+        return FESpace(fes_total, dgjumps=self.DG and not self.HDG)
 
     def _construct_fes_helper(self) -> List[FESpace]:
         """
@@ -111,6 +153,18 @@ class INS(Model):
             if self.element['p'] == 'L2':
                 print('We recommended that you NOT use L2 spaces without DG due to numerical issues.')
 
+        if self.HDG:
+            # The normal velocity is continuous and the tangential velocity is hybridized with facet unknowns. The
+            # lowest order pressure DOFs must couple between elements or the element-local problems are singular.
+            if self.element['u'] not in ['HDiv', 'RT'] or self.element['p'] != 'L2':
+                raise ValueError('HDG requires HDiv or RT elements for velocity and L2 elements for pressure.')
+
+            fes_u = HDiv(self.mesh, order=self.interp_ord, dirichlet=self.dirichlet_names.get('u', ''),
+                         RT=self.element['u'] == 'RT')
+            fes_p = L2(self.mesh, order=self.interp_ord - 1, lowest_order_wb=True)
+
+            return [fes_u, fes_p]
+
         if self.element['u'] == 'RT':
             # Raviart-Thomas elements are a type of HDiv finite element.
             fes_u = HDiv(self.mesh, order=self.interp_ord, dirichlet=self.dirichlet_names.get('u', ''),
@@ -127,6 +181,23 @@ class INS(Model):
 
         return [fes_u, fes_p]
 
+    def _construct_facet_fes_helper(self, first_index: int) -> List[FESpace]:
+        """
+        Helper function for creating the FESpaces of the HDG facet unknowns.
+
+        This function also records the position of each facet space within the full finite element space in
+        self.facet_components.
+
+        Args:
+            first_index: The index the first facet space will have within the full finite element space.
+
+        Returns:
+            A list containing the individual facet finite element spaces.
+        """
+        self.facet_components = {'u': first_index}
+
+        return [TangentialFacetFESpace(self.mesh, order=self.interp_ord, dirichlet=self.dirichlet_names.get('u', ''))]
+
     def _construct_linearization_terms(self) -> Optional[List[GridFunction]]:
         tmp = GridFunction(self._construct_ic_fes().components[0])  # Read a new FES
         tmp.vec.data = self.IC.components[0].vec
@@ -146,7 +217,7 @@ class INS(Model):
             The wind/linearization term used for linearizing the convection term.
         """
 
-        if self.linearize == 'Oseen':
+        if self.linearize in ['Oseen', 'Newton']:
             # gfu = None: intermediary step from adaptive_three_step requires w from W when time_step > 0
             if time_step > 0 and gfu is not None:
                 # Using known values from a previous time step, so no need to iteratively solve for a wind.
@@ -160,8 +231,24 @@ class INS(Model):
 
         return w
 
+    def _uses_newton_terms(self, gfu: Union[List[ProxyFunction], List[GridFunction], None], time_step: int) -> bool:
+        """
+        Function to check whether the weak forms need the additional terms of the Newton linearization.
+
+        The additional terms are only needed when the convection term is linearized about the wind in W. If the wind is
+        a known value from a previous time step the convection term is simply evaluated explicitly.
+
+        Args:
+            gfu:        The same argument as passed to _get_wind.
+            time_step:  The same argument as passed to _get_wind.
+
+        Returns:
+            True if the Newton linearization terms should be added, else False.
+        """
+        return self.linearize == 'Newton' and not (time_step > 0 and gfu is not None)
+
     def update_linearization(self, gfu: GridFunction) -> None:
-        if self.linearize == 'Oseen':
+        if self.linearize in ['Oseen', 'Newton']:
             # Update the velocity linearization term.
             try:
                 # First try just updating the value of the term.
@@ -175,6 +262,88 @@ class INS(Model):
             # Do nothing, no linearization term to update.
             pass
 
+    def linear_form_depends_on_linearization(self) -> bool:
+        if self.linearize == 'Newton':
+            return True
+
+        # Only the Oseen DG Dirichlet BC terms use the wind.
+        return self.linearize == 'Oseen' and self.DG and not self.HDG \
+            and len(self.BC.get('dirichlet', {}).get('u', {})) > 0
+
+    def _construct_block_preconditioner(self, a_assembled: BilinearForm, triangular: bool,
+                                        dt: Optional[Parameter]) -> BaseMatrix:
+        if set(self.model_components) != {'u', 'p'}:
+            raise ValueError('Block preconditioners are only implemented for velocity-pressure systems.')
+        if self.HDG:
+            raise ValueError('Block preconditioners are not implemented for HDG.')
+
+        fes_u = self.fes.components[self.model_components['u']]
+        fes_p = self.fes.components[self.model_components['p']]
+        u, v = fes_u.TnT()
+        p, q = fes_p.TnT()
+
+        # The weak form is scaled by dt, except for the time derivative term. A stationary solve uses dt = 1.
+        dt_coef = 1.0 if dt is None else dt
+
+        n, _, alpha, _ = get_special_functions(self.mesh, self.nu)
+
+        # The velocity block is approximated by the viscous term (and time derivative term). The linearized convection
+        # term is left out so the auxiliary form is symmetric positive definite.
+        a_u = BilinearForm(fes_u, condense=self.static_condensation)
+        a_u += dt_coef * self.kv[0] * InnerProduct(Grad(u), Grad(v)) * dx
+        if dt is not None:
+            a_u += InnerProduct(u, v) * dx
+
+        if self.DG:
+            a_u += dt_coef * self.kv[0] * (
+                    alpha * InnerProduct(jump(u), jump(v))
+                    - InnerProduct(grad_avg(u), OuterProduct(jump(v), n))
+                    - InnerProduct(grad_avg(v), OuterProduct(jump(u), n))
+            ) * dx(skeleton=True)
+
+            if self.dirichlet_names.get('u', None) is not None:
+                a_u += dt_coef * self.kv[0] * (
+                        alpha * InnerProduct(u, v)
+                        - InnerProduct(Grad(u), OuterProduct(v, n))
+                        - InnerProduct(Grad(v), OuterProduct(u, n))
+                ) * self._ds(self.dirichlet_names['u'])
+
+        velocity_pre = Preconditioner(a_u, self.velocity_preconditioner)
+
+        # The inverse Schur complement is approximated by the inverse pressure mass matrix scaled by viscosity/dt,
+        # which is spectrally equivalent for stationary and viscous dominated flows. The L2 basis functions are
+        # orthogonal, so Jacobi inverts the L2 mass matrix. Jacobi is a poor approximation of the inverse H1 mass
+        # matrix for high order elements, so BDDC is used instead.
+        m_p = BilinearForm(fes_p, condense=self.static_condensation)
+        m_p += dt_coef / self.kv[0] * p * q * dx
+        schur_pre = Preconditioner(m_p, 'bddc' if self.element['p'] == 'H1' else 'local')
+        aux_forms = [a_u, m_p]
+
+        if dt is not None and self.element['p'] == 'H1':
+            # For small time steps the time derivative term dominates the velocity block and the Schur complement
+            # approaches a pressure Laplacian, so add the inverse pressure Laplacian (Cahouet-Chabard). The pressure
+            # Laplacian is given Dirichlet conditions wherever the pressure is determined by the BCs.
+            dirichlet_p = list(self.BC.get('stress', {}).get('u', {}))
+            if self.dirichlet_names.get('p', None) is not None:
+                dirichlet_p.append(self.dirichlet_names['p'])
+
+            fes_k = H1(self.mesh, order=self.interp_ord - 1, dirichlet='|'.join(dirichlet_p), dgjumps=self.DG)
+            p_k, q_k = fes_k.TnT()
+
+            k_p = BilinearForm(fes_k, condense=self.static_condensation)
+            k_p += dt_coef * dt_coef * Grad(p_k) * Grad(q_k) * dx
+            if not dirichlet_p:
+                # Enclosed flow, the pressure is only determined up to a constant.
+                k_p += 1e-6 * dt_coef * dt_coef * p_k * q_k * dx
+
+            schur_pre = schur_pre + Preconditioner(k_p, self.velocity_preconditioner)
+            aux_forms.append(k_p)
+
+        return SaddlePointPreconditioner(a_assembled, self.fes.Range(self.model_components['u']),
+                                         self.fes.Range(self.model_components['p']), velocity_pre, schur_pre,
+                                         aux_forms, triangular, dt,
+                                         time_varying=not self._model_data_is_time_invariant())
+
     def construct_bilinear_time_ODE(self, U: Union[List[ProxyFunction], List[GridFunction]], V: List[ProxyFunction],
                                     dt: Parameter = Parameter(1.0), time_step: int = 0) -> List[BilinearForm]:
 
@@ -190,11 +359,15 @@ class INS(Model):
         # Domain integrals. Newtonian Stress
         a = dt * (self.kv[time_step] * InnerProduct(Grad(u), Grad(v))) * dx
 
-        if self.linearize == 'Oseen':
+        if self.linearize in ['Oseen', 'Newton']:
             # Linearized convection term.
             a += -dt * InnerProduct(OuterProduct(u, w), Grad(v)) * dx
 
-        if self.DG:
+        if self._uses_newton_terms(U, time_step):
+            # The rest of the Jacobian of the convection term, (u·∇)w.
+            a += -dt * InnerProduct(OuterProduct(w, u), Grad(v)) * dx
+
+        if self.DG and not self.HDG:
             # Penalty for dirichlet BCs
             if self.dirichlet_names.get('u', None) is not None:
                 a += dt * (
@@ -207,18 +380,23 @@ class INS(Model):
                     # Additional 1/2 of uw^ (convection term)
                     a += dt * v * (0.5 * w * n * u + 0.5 * Norm(w * n) * u) * self._ds(self.dirichlet_names['u'])
 
-        if self.linearize == 'Oseen':
+        if self.linearize in ['Oseen', 'Newton']:
             # Stress needs a no-backflow component in the bilinear form.
             for marker in self.BC.get('stress', {}).get('u', {}):
                 if self.DG:
-                    a += dt * v * (IfPos(w * n, w * n, 0.0) * u) * self._ds(marker)
+                    a += self._bilinear_boundary_term(dt * v * (IfPos(w * n, w * n, 0.0) * u), marker)
                 else:
                     a += dt * v.Trace() * (IfPos(w * n, w * n, 0.0) * u.Trace()) * self._ds(marker)
 
+                    if self._uses_newton_terms(U, time_step):
+                        # The rest of the Jacobian of the no-backflow component.
+                        a += dt * v.Trace() * (IfPos(w * n, 1.0, 0.0) * InnerProduct(u.Trace(), n) * w) \
+                             * self._ds(marker)
+
         # Parallel Flow BC
         for marker in self.BC.get('parallel', {}).get('u', {}):
             if self.DG:
-                a += dt * v * (u - n * InnerProduct(u, n)) * self._ds(marker)
+                a += self._bilinear_boundary_term(dt * v * (u - n * InnerProduct(u, n)), marker)
             else:
                 a += dt * v.Trace() * (u.Trace() - n * InnerProduct(u.Trace(), n)) * self._ds(marker)
 
@@ -243,7 +421,36 @@ class INS(Model):
                 - 1e-10 * p * q  # Stabilization term   TODO: This should not be needed (at least not for DG)
         ) * dx
 
-        if self.DG:
+        if self.HDG:
+            # Only the tangential component of the facet unknowns is meaningful.
+            uhat = tangential(U[self.facet_components['u']], n)
+            vhat = tangential(V[self.facet_components['u']], n)
+
+            # The tangential velocity jumps between the elements and the facets.
+            jump_u = tangential(u, n) - uhat
+            jump_v = tangential(v, n) - vhat
+
+            # Viscous flux through the element boundaries.
+            a += dt * self.kv[time_step] * (
+                    alpha * InnerProduct(jump_u, jump_v)  # Penalty term for u=uhat on the element boundaries
+                    - InnerProduct(Grad(u) * n, jump_v)  # Stress
+                    - InnerProduct(Grad(v) * n, jump_u)  # U
+            ) * dx(element_boundary=True)
+
+            if self.linearize == 'Oseen':
+                # Upwinded convection term. The normal velocity is continuous, the inflow tangential velocity is uhat.
+                u_up = IfPos(w * n, u, InnerProduct(u, n) * n + uhat)
+                convection = w * n * InnerProduct(u_up, v - vhat)
+                a += dt * convection * dx(element_boundary=True)
+
+                # The convection term through all boundaries without a Dirichlet BC is instead set by the BCs (see
+                # construct_bilinear_time_ODE), so remove it there.
+                natural_markers = set(self.mesh.GetBoundaries()).difference(self.BC.get('dirichlet', {}).get('u', {}),
+                                                                            [''])
+                if natural_markers:
+                    a += self._bilinear_boundary_term(-dt * convection, '|'.join(sorted(natural_markers)))
+
+        elif self.DG:
             avg_u = avg(u)
             jump_u = jump(u)
             avg_grad_u = grad_avg(u)
@@ -283,8 +490,8 @@ class INS(Model):
         # Domain integrals.
         L = dt * v * self.f['u'][time_step] * dx
 
-        # Dirichlet BC for u
-        if self.DG:
+        # Dirichlet BC for u. HDG applies them strongly to the facet unknowns.
+        if self.DG and not self.HDG:
             for marker in self.BC.get('dirichlet', {}).get('u', {}):
                 g = self.BC['dirichlet']['u'][marker][time_step]
                 L += dt * (
@@ -304,6 +511,14 @@ class INS(Model):
             else:
                 L += dt * v.Trace() * h * self._ds(marker)
 
+        if self._uses_newton_terms(gfu_0, time_step):
+            # The convection term is quadratic in the velocity, so the Newton linearization about w leaves the
+            # convection term evaluated at w on the right-hand side.
+            L += -dt * InnerProduct(OuterProduct(w, w), Grad(v)) * dx
+
+            for marker in self.BC.get('stress', {}).get('u', {}):
+                L += dt * v.Trace() * (IfPos(w * n, w * n, 0.0) * w) * self._ds(marker)
+
         return [L]
 
     def construct_imex_explicit(self, V: List[ProxyFunction], gfu_0: Optional[List[GridFunction]],
@@ -322,9 +537,8 @@ class INS(Model):
 
     def solve_single_step(self, a_lst: List[BilinearForm], L_lst: List[LinearForm],
                          precond_lst: List[Preconditioner], gfu: GridFunction, time_step: int = 0) -> None:
-        if self.linearize == 'Oseen':
+        if self.linearize in ['Oseen', 'Newton']:
             # The component index representing velocity
-            component = self.fes.components[self.model_components['u']]
             comp_index = self.model_components['u']
 
             # Number of linear iterations for this timestep
@@ -333,46 +547,100 @@ class INS(Model):
             # Boolean used to keep the while loop going
             done_iterating = False
 
+            self.forcing_term.reset()
+
+            if self.anderson_picard:
+                wind = self.W[comp_index].vec
+                residual = wind.CreateVector()
+                self.anderson.reset(wind.size)
+
             while not done_iterating:
                 self.apply_dirichlet_bcs_to(gfu, time_step=time_step)
 
                 a_lst[0].Assemble()
                 L_lst[0].Assemble()
-                if precond_lst[0] is not None:
-                    precond_lst[0].Update()
+                self.preconditioner_policy.update(precond_lst[0])
 
-                self.linear_solve(a_lst[0], L_lst[0], precond_lst[0], gfu)
+                self.linear_solve(a_lst[0], L_lst[0], precond_lst[0], gfu, self._inexact_linear_tolerance())
+                self.linear_solve_stats.record_nonlinear_iteration()
 
-                err = norm("l2_norm", self.W[comp_index], gfu.components[comp_index], self.mesh, component, average=False)
-                gfu_norm = mean(gfu.components[comp_index], self.mesh)
+                err, gfu_norm = self._linearization_change(gfu)
+                self.forcing_term.update(err)
 
                 num_iteration += 1
 
                 if self.verbose > 0:
                     print(num_iteration, err)
 
-                self.W[comp_index].vec.data = gfu.components[comp_index].vec
                 done_iterating = (err < self.abs_nonlinear_tolerance + self.rel_nonlinear_tolerance * gfu_norm) or (num_iteration > self.nonlinear_max_iters)
+
+                if self.anderson_picard and not done_iterating:
+                    # The wind is updated in place.
+                    residual.data = gfu.components[comp_index].vec - wind
+                    self.anderson.update(wind.FV().NumPy(), residual.FV().NumPy())
+                else:
+                    self.W[comp_index].vec.data = gfu.components[comp_index].vec
         elif self.linearize == 'IMEX':
             self.linear_solve(a_lst[0], L_lst[0], precond_lst[0], gfu)
         else:
             raise ValueError('Linearization scheme \"{}\" is not implemented.'.format(self.linearize))
 
+    def _linearization_change(self, gfu: GridFunction) -> Tuple[float, float]:
+        """
+        Function to measure how much the velocity changed over one iteration of the nonlinear solve.
+
+        The change is measured by the L2 norm integrated over the mesh and the velocity by its mean, which is what the
+        nonlinear tolerance is defined against. With inexact linear solves (adaptive_linear_tolerance) the root mean
+        square of the velocity DOF values is used instead, since it is much cheaper than integrating over the mesh.
+
+        Args:
+            gfu: The gridfunction holding the newest iterate.
+
+        Returns:
+            Tuple of the norm of the change in velocity since the linearization terms were set and the norm of the
+            velocity.
+        """
+        comp_index = self.model_components['u']
+
+        if self._inexact_linear_tolerance() is None:
+            err = norm('l2_norm', self.W[comp_index], gfu.components[comp_index], self.mesh,
+                       self.fes.components[comp_index], average=False)
+            return err, mean(gfu.components[comp_index], self.mesh)
+
+        u = gfu.components[comp_index].vec
+        change = u.CreateVector()
+        change.data = u - self.W[comp_index].vec
+
+        return rms_norm(change), rms_norm(u)
+
+    def _inexact_linear_tolerance(self) -> Optional[float]:
+        """
+        Function to get the relative tolerance of the next linear solve of the nonlinear solve.
+
+        Returns:
+            The current forcing term if the linear solves are inexact, None if they should be solved to
+            linear_tolerance.
+        """
+        if self.adaptive_linear_tolerance and self.linear_solver != 'direct':
+            return self.forcing_term.tolerance
+
+        return None
+
     def linearized_solve(self, a_assembled: BilinearForm, L_assembled: LinearForm, precond: Preconditioner, gfu: GridFunction) -> Tuple[float, float]:
-        if self.linearize == 'Oseen':
+        if self.linearize in ['Oseen', 'Newton']:
             # The component index representing velocity
-            component = self.fes.components[self.model_components['u']]
             comp_index = self.model_components['u']
 
             # not sure how to handle the dependence of BC on time currently
             self.apply_dirichlet_bcs_to(gfu, time_step=0)
 
             # solver linearized model
-            self.linear_solve(a_assembled, L_assembled, precond, gfu)
+            self.linear_solve(a_assembled, L_assembled, precond, gfu, self._inexact_linear_tolerance())
+            self.linear_solve_stats.record_nonlinear_iteration()
 
             # calculate error and norm of solution
-            err = norm("l2_norm", self.W[comp_index], gfu.components[comp_index], self.mesh, component, average=False)
-            gfu_norm = mean(gfu.components[comp_index], self.mesh)
+            err, gfu_norm = self._linearization_change(gfu)
+            self.forcing_term.update(err)
 
             self.W[comp_index].vec.data = gfu.components[comp_index].vec
 
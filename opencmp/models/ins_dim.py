@@ -30,6 +30,14 @@ class INSDIM(INS):
     A single phase incompressible Navier-Stokes model with the Diffuse Interface Method.
     """
 
+    @staticmethod
+    def allows_hdg() -> bool:
+        return False
+
+    @staticmethod
+    def allows_newton() -> bool:
+        return False
+
     def construct_bilinear_time_ODE(self, U: Union[List[ProxyFunction], List[GridFunction]], V: List[ProxyFunction],
                                     dt: Parameter = Parameter(1.0), time_step: int = 0) -> List[BilinearForm]:
 
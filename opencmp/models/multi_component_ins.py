@@ -19,8 +19,8 @@ import logging
 from typing import Dict, List, Optional, Set, Union
 
 import ngsolve
-from ngsolve import BilinearForm, FESpace, Grad, InnerProduct, LinearForm, GridFunction, Preconditioner, \
-    ds, dx, Parameter, CoefficientFunction
+from ngsolve import BilinearForm, FacetFESpace, FESpace, Grad, IfPos, InnerProduct, LinearForm, GridFunction, \
+    Preconditioner, ds, dx, Parameter, CoefficientFunction
 from ngsolve.comp import ProxyFunction
 
 from ..helpers.dg import grad_avg, jump
@@ -88,7 +88,9 @@ class MultiComponentINS(INS):
             element_type_for_component = self.element[component]
             kwargs = {'mesh': self.mesh,
                       'order': self.interp_ord,
-                      'dgjumps': self.DG}
+                      'dgjumps': self.DG and not self.HDG}
+            if self.HDG and element_type_for_component != 'L2':
+                raise ValueError('HDG requires L2 elements for the mixture components.')
             if element_type_for_component == "L2":
                 if not self.DG:
                     print('We recommended that you NOT use L2 spaces without DG due to numerical issues.')
@@ -99,7 +101,26 @@ class MultiComponentINS(INS):
                 getattr(ngsolve, element_type_for_component)(**kwargs)
             )
 
-        return FESpace(fes_total, dgjumps=self.DG)
+        if self.HDG:
+            fes_total += self._construct_facet_fes_helper(len(fes_total))
+
+        return FESpace(fes_total, dgjumps=self.DG and not self.HDG)
+
+    def _construct_facet_fes_helper(self, first_index: int) -> List[FESpace]:
+        if self.fixed_velocity:
+            self.facet_components = {}
+            fes_facet = []
+        else:
+            # Create the facet FE space for velocity
+            fes_facet = super()._construct_facet_fes_helper(first_index)
+
+        # Each mixture component is hybridized with a scalar facet space
+        for component in self.extra_components:
+            self.facet_components[component] = first_index + len(fes_facet)
+            fes_facet.append(FacetFESpace(self.mesh, order=self.interp_ord,
+                                          dirichlet=self.dirichlet_names.get(component, '')))
+
+        return fes_facet
 
     def _construct_ic_fes(self) -> FESpace:
         # Create the FE spaces for velocity and pressure
@@ -120,6 +141,18 @@ class MultiComponentINS(INS):
         # TODO: If we go with a Neumann BC need to add in the diffusion coefficient in the bilinear form.
         return super()._define_bc_types() + ['neumann', 'total_flux', 'surface_rxn']
 
+    def _bilinear_form_model_functions(self) -> List[str]:
+        # Bulk reactions that depend on the trial functions are part of the bilinear form.
+        return ['source']
+
+    def _bilinear_form_bc_types(self) -> List[str]:
+        # Surface reactions that depend on the trial functions are part of the bilinear form.
+        return ['surface_rxn']
+
+    @staticmethod
+    def allows_newton() -> bool:
+        return False
+
     def _post_init(self) -> None:
         if self.DIM:
             raise NotImplementedError('DIM is not yet implemented.')
@@ -149,12 +182,41 @@ class MultiComponentINS(INS):
         assert len(self.Ds) == len(self.extra_components)
         assert len(self.f) == len(self.extra_components) + 0 if self.fixed_velocity else 1  # Extra +1 since velocity also has a source term, +0 if velocity is fixed since it's equation is not used
 
+    def bilinear_form_is_time_invariant(self) -> bool:
+        if self.fixed_velocity:
+            # The velocity is not solved for, so the model is linear in the mixture components.
+            return self._model_data_is_time_invariant()
+
+        return super().bilinear_form_is_time_invariant()
+
     def _get_wind(self, U, time_step):
         if self.fixed_velocity:
             return self.W[self.model_components_ic['u']]
         else:
             return super()._get_wind(U, time_step)
 
+    def update_linearization(self, gfu: GridFunction) -> None:
+        if self.fixed_velocity:
+            # The wind is always the fixed velocity from the initial condition, the solution does not contain it.
+            u_index = self.model_components_ic['u']
+            if len(self.W[u_index].vec) == len(self.IC.components[u_index].vec):
+                self.W[u_index].vec.data = self.IC.components[u_index].vec
+            else:
+                # The finite element space has changed, e.g. during convergence testing.
+                self.W = self._construct_linearization_terms()
+        else:
+            super().update_linearization(gfu)
+
+    def linear_form_depends_on_linearization(self) -> bool:
+        if self.fixed_velocity:
+            # The wind never changes.
+            return False
+
+        # The Oseen DG Dirichlet BC terms of the mixture components also use the wind.
+        return super().linear_form_depends_on_linearization() or (
+            self.linearize == 'Oseen' and self.DG and not self.HDG
+            and any(len(self.BC.get('dirichlet', {}).get(comp, {})) > 0 for comp in self.extra_components))
+
     def construct_bilinear_time_coefficient(self, U: List[ProxyFunction], V: List[ProxyFunction], dt: Parameter,
                                             time_step: int) -> List[BilinearForm]:
 
@@ -170,7 +232,50 @@ class MultiComponentINS(INS):
         # Define the special DG functions.
         n, _, alpha, _ = get_special_functions(self.mesh, self.nu)
 
-        if self.DG:
+        if self.HDG:
+            for comp in self.extra_components:
+                # Trial and test functions
+                c = U[self.model_components[comp]]
+                r = V[self.model_components[comp]]
+
+                # Trial and test functions on the facets
+                c_hat = U[self.facet_components[comp]]
+                r_hat = V[self.facet_components[comp]]
+
+                # Diffusive flux through the element boundaries
+                if self.Ds[comp][time_step] != 0:
+                    a += dt * self.Ds[comp][time_step] * (
+                        alpha * (c - c_hat) * (r - r_hat)
+                        - InnerProduct(Grad(c), n) * (r - r_hat)
+                        - InnerProduct(Grad(r), n) * (c - c_hat)
+                    ) * dx(element_boundary=True)
+
+                # Upwinded advective flux through the element boundaries
+                # NOTE: Except for Dirichlet boundaries the boundary flux is set by the boundary conditions instead.
+                natural_markers = '|'.join(sorted(set(self.mesh.GetBoundaries()).difference(
+                    self.BC.get('dirichlet', {}).get(comp, {}), [''])))
+                if self.linearize == 'Oseen':
+                    wn = InnerProduct(w, n)
+                    convection = wn * IfPos(wn, c, c_hat) * (r - r_hat)
+                    a += dt * convection * dx(element_boundary=True)
+                    if natural_markers:
+                        a += self._bilinear_boundary_term(-dt * convection, natural_markers)
+
+                # Without diffusion the facet unknowns only enter through the advective flux, which vanishes on facets
+                # tangential to the wind and is replaced by the boundary conditions on the other boundaries (or
+                # everywhere if there is no advection). Those facet unknowns don't affect the element unknowns, so set
+                # them to the trace of the element unknowns instead of leaving their rows empty. The term only tests
+                # with the facet unknowns and is zero for the exact solution.
+                if self.Ds[comp][time_step] == 0:
+                    if self.linearize == 'Oseen':
+                        trace = dt * (c_hat - c) * r_hat
+                        a += IfPos(wn * wn, 0, 1) * trace * dx(element_boundary=True)
+                        if natural_markers:
+                            a += self._bilinear_boundary_term(IfPos(wn * wn, 1, 0) * trace, natural_markers)
+                    else:
+                        a += dt * (c_hat - c) * r_hat * dx(element_boundary=True)
+
+        elif self.DG:
             for comp in self.extra_components:
                 # Trial and test functions
                 c = U[self.model_components[comp]]
@@ -236,7 +341,7 @@ class MultiComponentINS(INS):
                 val = self.BC['surface_rxn'][comp][marker][time_step]
                 if isinstance(val, ProxyFunction) or (isinstance(val, CoefficientFunction) and ('trial-function' in val.__str__())):
                     if self.DG:
-                        a += -dt * val * r * self._ds(marker)
+                        a += self._bilinear_boundary_term(-dt * val * r, marker)
                     else:
                         a += -dt * val * r.Trace() * self._ds(marker)
 
@@ -249,7 +354,7 @@ class MultiComponentINS(INS):
                 if self.BC.get('surface_rxn', {}).get(comp, None) is not None:
                     marker = list(self.BC['surface_rxn'][comp].keys())[0]
                     if self.DG:
-                        a += -dt * val * r * self._ds(marker)
+                        a += self._bilinear_boundary_term(-dt * val * r, marker)
                     else:
                         a += -dt * val * r.Trace() * self._ds(marker)
                 else:
@@ -270,7 +375,7 @@ class MultiComponentINS(INS):
                 for marker in total_flux_bc_markers:
                     # Upwinding term, always add.
                     if self.DG:
-                        a += dt * r * c * Max(InnerProduct(w, n), 0) * self._ds(marker)
+                        a += self._bilinear_boundary_term(dt * r * c * Max(InnerProduct(w, n), 0), marker)
                     else:
                         a += dt * r.Trace() * c * Max(InnerProduct(w, n), 0) * self._ds(marker)
 
@@ -280,11 +385,11 @@ class MultiComponentINS(INS):
                         raise ValueError('Trying to apply a neuman boundary condition for '
                                          'purely advective flow (diffusion coefficient is 0).')
                     if self.DG:
-                        a += dt * r * c * InnerProduct(w, n) * self._ds(marker)
+                        a += self._bilinear_boundary_term(dt * r * c * InnerProduct(w, n), marker)
                     else:
                         a += dt * r.Trace() * c * InnerProduct(w, n) * self._ds(marker)
 
-                if self.DG:
+                if self.DG and not self.HDG:
                     # 1/2 of diffusion on Dirichlet BC (1st & 2nd line)
                     # AND
                     # 1/2 of penalty on Dirichlet BC (3rd line)
@@ -368,7 +473,7 @@ class MultiComponentINS(INS):
                 else:
                     L -= dt * r.Trace() * h * self._ds(marker)
 
-            if self.DG:
+            if self.DG and not self.HDG:
                 for marker in self.BC.get('dirichlet', {}).get(comp, {}):
                     g = self.BC['dirichlet'][comp][marker][time_step]
 
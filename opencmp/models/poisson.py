@@ -64,6 +64,14 @@ class Poisson(Model):
 
         return compound_fes
 
+    def _bilinear_form_model_functions(self) -> List[str]:
+        # The source only appears in the linear form.
+        return []
+
+    def _bilinear_form_bc_types(self) -> List[str]:
+        # The Robin BC coefficient is part of the bilinear form.
+        return ['robin']
+
     def _set_model_parameters(self) -> None:
         self.dc = self.model_functions.model_parameters_dict['diffusion_coefficient']['all']
         self.f = self.model_functions.model_functions_dict['source']['all']
@@ -23,3 +23,5 @@ from .base_adaptive_transient_RK import BaseAdaptiveTransientRKSolver
 from .adaptive_IMEX import AdaptiveIMEX
 from .adaptive_two_step import AdaptiveTwoStep
 from .adaptive_three_step import AdaptiveThreeStep
+from .adaptive_BDF import AdaptiveBDF
+from .adaptive_ESDIRK import AdaptiveESDIRK
@@ -0,0 +1,199 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+import ngsolve as ngs
+from ...models import Model
+from typing import Tuple, Type, List
+from ...config_functions import ConfigParser
+from ...helpers.math import bdf_coefficients, bdf_error_coefficient, extrapolation_coefficients
+from ..time_integration_schemes import BDF
+from .base_adaptive_transient_multistep import BaseAdaptiveTransientMultiStepSolver
+
+
+class AdaptiveBDF(BaseAdaptiveTransientMultiStepSolver):
+    """
+    A transient solver with adaptive time-stepping that uses a variable-step backward differentiation formula.
+
+    Each timestep is solved once with BDF2 or BDF3, using coefficients that account for the different sizes of the
+    previous timesteps. Local error is estimated from the difference between the solution and the extrapolation of the
+    previous solutions to the new time, which is of the same order as the error of the scheme. The new timestep is
+    chosen by the PI controller of the base class.
+
+    The scheme starts itself up: the first timestep uses BDF1 (implicit Euler) and the order is raised as solutions
+    are accepted until there are enough previous solutions for the requested order and its error estimate.
+    """
+
+    def __init__(self, model_class: Type[Model], config: ConfigParser) -> None:
+        super().__init__(model_class, config)
+
+        self.gfu_pred = self.model.construct_gfu()
+
+        # The scheme is u^n+1 - sum_j beta_j * u^n+1-j = dt_eff * (stationary terms at t^n+1), with the effective
+        # timestep dt_eff and the coefficients beta_j given by the sizes of the previous timesteps and the order. There
+        # is one coefficient per slot in the storage of the previous solutions, so the weak forms don't need to change
+        # when the storage is rotated.
+        self.dt_eff = ngs.Parameter(self.dt_param[0].Get())
+        self.beta = [ngs.Parameter(0.0) for _ in range(self.scheme_order)]
+        self.beta[self._history_slot(0)].Set(1.0)
+
+    def reset_model(self) -> None:
+        super().reset_model()
+
+        self.gfu_pred = self.model.construct_gfu()
+
+    @property
+    def bdf_order(self) -> int:
+        """
+        The order of the scheme once it has started up.
+        """
+        # The order needs one more previous solution for its error estimate.
+        return self.scheme_order - 1
+
+    @property
+    def current_order(self) -> int:
+        """
+        The order used for the current timestep, given how many previous solutions are known.
+        """
+        return max(1, min(self.bdf_order, self.num_known_solutions - 1))
+
+    def _startup(self) -> None:
+        # No startup solves are needed, only the initial condition is known at the start.
+        self.num_known_solutions = 1
+
+    def _apply_boundary_conditions(self) -> None:
+        self.model.apply_dirichlet_bcs_to(self.gfu)
+
+    def _assemble(self) -> None:
+        for i in range(len(self.a)):
+            self.split_assembly.assemble(self.a[i], self.dt_eff)
+            self.L[i].Assemble()
+
+        self._update_preconditioners()
+
+    def _create_linear_and_bilinear_forms(self) -> None:
+        # The weak forms refer to the previous solutions through the coefficients of the storage slots, which are set
+        # for the current ordering every timestep.
+        self.rotate_history = not self.model.expressions_depend_on_model_variables()
+        self.a, self.L = BDF(self.model, self.gfu_0_ring, self.dt_eff, self.beta)
+
+    def _create_preconditioners(self) -> None:
+        self.preconditioners = self.model.construct_preconditioners(self.a, self.dt_eff)
+
+    def _invalidate_stale_factorizations(self) -> None:
+        # The coefficients change with the timestep and the order. The order can change without any timestep changing.
+        self._update_bdf_coefficients()
+
+        super()._invalidate_stale_factorizations()
+
+    def _operator_state(self) -> Tuple[float, ...]:
+        return super()._operator_state() + (self.dt_eff.Get(),) \
+            + tuple(self.beta[self._history_slot(j)].Get() for j in range(self.scheme_order))
+
+    def _re_assemble(self) -> None:
+        self._assemble()
+
+    def _single_solve(self) -> None:
+        self.model.solve_single_step(self.a, self.L, self.preconditioners, self.gfu)
+
+    def _update_bdf_coefficients(self) -> None:
+        """
+        Function to set the coefficients of the scheme for the current timestep.
+        """
+        order = self.current_order
+
+        # t_param holds the new time followed by the times of the previous solutions.
+        weights = bdf_coefficients([self.t_param[j].Get() for j in range(order + 1)])
+
+        self.dt_eff.Set(1.0 / weights[0])
+        for j in range(self.scheme_order):
+            if j < order:
+                self.beta[self._history_slot(j)].Set(-weights[j + 1] / weights[0])
+            else:
+                self.beta[self._history_slot(j)].Set(0.0)
+
+    def _select_history_forms(self) -> None:
+        # The same weak forms are used for every ordering of the previous solutions.
+        pass
+
+    def _calculate_local_error(self) -> Tuple[List[float], List[float], List[str]]:
+        # Include any variables specified by the model as included in local error.
+        local_errors = []
+
+        # Also get the gridfunction norms to use for the relative error tolerance.
+        gfu_norms = []
+
+        # Get the component names in the order that they were read
+        comp_names = []
+
+        order = self.current_order
+
+        if self.num_known_solutions < order + 1:
+            # Only the initial condition is known, so there is nothing to estimate the error with. The first timestep
+            # is accepted with the timestep given in the config file.
+            error_coefficient = 0.0
+            self.gfu_pred.vec.data = self.gfu.vec
+        else:
+            # Extrapolate the previous solutions to the new time. The difference to the solution is of the same order
+            # as the local error, and the ratio of the two error constants turns it into the local error.
+            times = [self.t_param[j + 1].Get() for j in range(order + 1)]
+            coefficients = extrapolation_coefficients(times, self.t_param[0].Get())
+
+            self.gfu_pred.vec.data = coefficients[0] * self.gfu_0_list[0].vec
+            for j in range(1, order + 1):
+                self.gfu_pred.vec.data += coefficients[j] * self.gfu_0_list[j].vec
+
+            error_coefficient = bdf_error_coefficient(times, self.t_param[0].Get())
+
+        if len(self.gfu.components) == 0:
+            # Only one model variable to estimate local error with.
+            local_errors.append(error_coefficient * ngs.sqrt(ngs.Integrate((self.gfu - self.gfu_pred) ** 2,
+                                                                           self.model.mesh)))
+            gfu_norms.append(ngs.sqrt(ngs.Integrate(self.gfu ** 2, self.model.mesh)))
+            comp_names.append(list(self.model.model_components.keys())[0])
+        else:
+            # Include any variables specified by the model as included in local error.
+            for comp_name, use in self.model.model_local_error_components.items():
+                if use:
+                    comp_index = self.model.model_components[comp_name]
+                    local_errors.append(error_coefficient * ngs.sqrt(ngs.Integrate((self.gfu.components[comp_index] -
+                                                                                    self.gfu_pred.components[comp_index]) ** 2,
+                                                                                   self.model.mesh)))
+                    gfu_norms.append(ngs.sqrt(ngs.Integrate(self.gfu.components[comp_index] ** 2, self.model.mesh)))
+                    comp_names.append(comp_name)
+
+        return local_errors, gfu_norms, comp_names
+
+    def _dt_from_local_error(self, local_error: List[float], gfu_norm: List[float]) -> float:
+        dt = self.dt_param[0].Get()
+
+        if self.num_known_solutions < self.current_order + 1:
+            # No error estimate for the first timestep, keep the timestep from the config file.
+            self._error_ratio = 0.0
+            return dt
+
+        # The local error estimate is of order p + 1 in dt. Variable-step BDF3 is only zero-stable for modest timestep
+        # ratios.
+        max_factor = 1.5 if self.current_order >= 3 else 2.0
+        return self._pi_controlled_dt(local_error, gfu_norm, self.current_order + 1, max_factor)
+
+    def _update_time_step(self) -> Tuple[bool, float, float, str]:
+        accept_timestep, max_abs, max_rel, component = super()._update_time_step()
+
+        if accept_timestep:
+            self.num_known_solutions = min(self.num_known_solutions + 1, self.scheme_order)
+
+        return accept_timestep, max_abs, max_rel, component
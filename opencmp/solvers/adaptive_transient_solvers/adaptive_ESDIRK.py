@@ -0,0 +1,195 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+import ngsolve as ngs
+from ...models import Model
+from typing import Tuple, Type, List
+from ...config_functions import ConfigParser
+from ..time_integration_schemes import implicit_euler
+from .base_adaptive_transient_multistep import BaseAdaptiveTransientMultiStepSolver
+
+# Butcher tableau of ESDIRK3(2)4L[2]SA (Kennedy and Carpenter, Appl. Numer. Math. 44, 2003), a four stage, third order,
+# L-stable and stiffly accurate scheme with an explicit first stage and an embedded second order solution. All implicit
+# stages use the same diagonal coefficient gamma.
+gamma = 1767732205903 / 4055673282236
+a_esdirk = [[],
+            [gamma],
+            [2746238789719 / 10658868560708, -640167445237 / 6845629431997],
+            [1471266399579 / 7840856788654, -4482444167858 / 7529755066697, 11266239266428 / 11593286722821]]
+c_esdirk = [0.0, 2.0 * gamma, 3.0 / 5.0, 1.0]
+# Weights of the embedded second order solution. The weights of the scheme itself are its last row.
+b_embedded = [2756255671327 / 12835298489170, -10771552573575 / 22201958757719, 9247589265047 / 10645013368117,
+              2193209047091 / 5459859503100]
+
+
+class AdaptiveESDIRK(BaseAdaptiveTransientMultiStepSolver):
+    """
+    A transient solver with adaptive time-stepping that uses an embedded pair ESDIRK scheme.
+
+    Each timestep is solved with the four stage, third order ESDIRK3(2)4L[2]SA scheme. Its first stage is explicit and
+    its three implicit stages share one diagonal coefficient, so every implicit stage is an implicit Euler solve with the
+    timestep gamma * dt from a combination of the previous solution and the earlier stages. All stages therefore use the
+    same bilinear form, and for linear time-invariant models the same factorization or preconditioner. The local error
+    is estimated from the difference between the solution and the embedded second order solution.
+
+    The stage derivatives dt * F(U_i) are recovered from the stage solutions, so no extra operator evaluations are
+    needed. The scheme is stiffly accurate, so the derivative of the first stage is the derivative of the last stage of
+    the previous timestep. The derivative at the initial condition is approximated by an additional implicit Euler stage
+    during the first timestep.
+    """
+
+    def __init__(self, model_class: Type[Model], config: ConfigParser) -> None:
+        super().__init__(model_class, config)
+
+        self._create_stage_storage()
+
+        # Effective timestep of the implicit stages.
+        self.dt_eff = ngs.Parameter(gamma * self.dt_param[0].Get())
+
+    def reset_model(self) -> None:
+        super().reset_model()
+
+        self._create_stage_storage()
+
+    def _create_stage_storage(self) -> None:
+        """
+        Function to create the gridfunctions and vectors that hold the intermediate results of a timestep.
+        """
+        # The combination of the previous solution and earlier stages each implicit stage starts from.
+        self.gfu_stage_start = self.model.construct_gfu()
+
+        # The difference between the solution and the embedded solution.
+        self.gfu_err = self.model.construct_gfu()
+
+        # The stage derivatives dt * F(U_i).
+        self.stage_derivatives = [self.gfu.vec.CreateVector() for _ in range(len(c_esdirk))]
+
+        # F at the previous solution and at the new solution. Only the former is known before the first timestep.
+        self.derivative = self.gfu.vec.CreateVector()
+        self.derivative_new = self.gfu.vec.CreateVector()
+        self.has_derivative = False
+
+    def _apply_boundary_conditions(self) -> None:
+        # The boundary conditions are applied for each stage as it is solved, see _single_solve.
+        pass
+
+    def _assemble(self) -> None:
+        for i in range(len(self.a)):
+            self.split_assembly.assemble(self.a[i], self.dt_eff)
+            self.L[i].Assemble()
+
+        self._update_preconditioners()
+
+    def _create_linear_and_bilinear_forms(self) -> None:
+        # t_param[0] is set to the time of each stage as the stage is solved. The last stage is at t^n+1.
+        self.a, self.L = implicit_euler(self.model, [self.gfu_stage_start], [self.dt_eff])
+
+    def _create_preconditioners(self) -> None:
+        self.preconditioners = self.model.construct_preconditioners(self.a, self.dt_eff)
+
+    def _re_assemble(self) -> None:
+        # The forms are assembled for each stage as it is solved, see _single_solve.
+        pass
+
+    def _solve_stage(self, t: float) -> None:
+        """
+        Function to solve an implicit stage, an implicit Euler step with the timestep gamma * dt from gfu_stage_start.
+
+        Args:
+            t: The time of the stage.
+        """
+        self.t_param[0].Set(t)
+
+        self.model.apply_dirichlet_bcs_to(self.gfu)
+        self._assemble()
+        self.model.solve_single_step(self.a, self.L, self.preconditioners, self.gfu)
+
+    def _single_solve(self) -> None:
+        dt = self.dt_param[0].Get()
+        self.dt_eff.Set(gamma * dt)
+
+        t_n = self.t_param[1].Get()
+
+        gfu_n = self.gfu_0_list[0]
+
+        if not self.has_derivative:
+            # Approximate F at the initial condition by an implicit Euler stage, which uses the same bilinear form.
+            self.gfu_stage_start.vec.data = gfu_n.vec
+            self._solve_stage(t_n + gamma * dt)
+            self.derivative.data = (1.0 / (gamma * dt)) * (self.gfu.vec - gfu_n.vec)
+            self.has_derivative = True
+
+        # The first stage is explicit, U_1 = u^n.
+        self.stage_derivatives[0].data = dt * self.derivative
+
+        for i in range(1, len(c_esdirk)):
+            # U_i = u^n + sum_j<i a_ij * dt * F(U_j) + gamma * dt * F(U_i)
+            self.gfu_stage_start.vec.data = gfu_n.vec
+            for j in range(i):
+                self.gfu_stage_start.vec.data += a_esdirk[i][j] * self.stage_derivatives[j]
+
+            self._solve_stage(t_n + c_esdirk[i] * dt)
+
+            self.stage_derivatives[i].data = (1.0 / gamma) * (self.gfu.vec - self.gfu_stage_start.vec)
+
+        # The scheme is stiffly accurate, the last stage is the solution and t_param[0] is back at t^n+1. Keep F at the
+        # solution for the next timestep.
+        self.derivative_new.data = (1.0 / dt) * self.stage_derivatives[-1]
+
+        b = a_esdirk[-1] + [gamma]
+        self.gfu_err.vec.data = (b[0] - b_embedded[0]) * self.stage_derivatives[0]
+        for i in range(1, len(c_esdirk)):
+            self.gfu_err.vec.data += (b[i] - b_embedded[i]) * self.stage_derivatives[i]
+
+    def _calculate_local_error(self) -> Tuple[List[float], List[float], List[str]]:
+        # Include any variables specified by the model as included in local error.
+        local_errors = []
+
+        # Also get the gridfunction norms to use for the relative error tolerance.
+        gfu_norms = []
+
+        # Get the component names in the order that they were read
+        comp_names = []
+
+        if len(self.gfu.components) == 0:
+            # Only one model variable to estimate local error with.
+            local_errors.append(ngs.sqrt(ngs.Integrate(self.gfu_err ** 2, self.model.mesh)))
+            gfu_norms.append(ngs.sqrt(ngs.Integrate(self.gfu ** 2, self.model.mesh)))
+            comp_names.append(list(self.model.model_components.keys())[0])
+        else:
+            # Include any variables specified by the model as included in local error.
+            for comp_name, use in self.model.model_local_error_components.items():
+                if use:
+                    comp_index = self.model.model_components[comp_name]
+                    local_errors.append(ngs.sqrt(ngs.Integrate(self.gfu_err.components[comp_index] ** 2,
+                                                               self.model.mesh)))
+                    gfu_norms.append(ngs.sqrt(ngs.Integrate(self.gfu.components[comp_index] ** 2, self.model.mesh)))
+                    comp_names.append(comp_name)
+
+        return local_errors, gfu_norms, comp_names
+
+    def _dt_from_local_error(self, local_error: List[float], gfu_norm: List[float]) -> float:
+        # The error of the embedded second order solution is of third order in dt.
+        return self._pi_controlled_dt(local_error, gfu_norm, 3, 2.0)
+
+    def _update_time_step(self) -> Tuple[bool, float, float, str]:
+        accept_timestep, max_abs, max_rel, component = super()._update_time_step()
+
+        if accept_timestep:
+            self.derivative.data = self.derivative_new
+
+        return accept_timestep, max_abs, max_rel, component
@@ -52,7 +52,7 @@ class AdaptiveIMEX(BaseAdaptiveTransientMultiStepSolver):
         self.a_pred, self.L_pred = adaptive_IMEX_pred(self.model, self.gfu_0_list, self.dt_param)
 
     def _create_preconditioners(self) -> None:
-        self.preconditioner_pred = self.model.construct_preconditioners(self.a_pred)
+        self.preconditioner_pred = self.model.construct_preconditioners(self.a_pred, self.dt_param[0])
 
     def _re_assemble(self) -> None:
         self._assemble()
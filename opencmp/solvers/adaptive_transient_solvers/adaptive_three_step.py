@@ -53,7 +53,7 @@ class AdaptiveThreeStep(BaseAdaptiveTransientRKSolver):
 
     def _assemble(self) -> None:
         for i in range(len(self.a_long)):
-            self.a_long[i].Assemble()
+            self.split_assembly.assemble(self.a_long[i], self.dt_param[0])
             self.L_long[i].Assemble()
 
     def _create_linear_and_bilinear_forms(self) -> None:
@@ -62,12 +62,21 @@ class AdaptiveThreeStep(BaseAdaptiveTransientRKSolver):
         #gfu_0_list = [gfu^n,         gfu^n,           gfu^n]
         self.a_long, self.L_long    = implicit_euler(self.model, self.gfu_0_list,   self.dt_param,      0)
         self.a_short, self.L_short  = implicit_euler(self.model, self.gfu_0_list,   self.dt_param,      1)
-        self.a, self.L              = implicit_euler(self.model, [self.gfu_short], [self.dt_param[1]],  0)
+        a, self.L                   = implicit_euler(self.model, [self.gfu_short], [self.dt_param[1]],  0)
+
+        # Both half steps use dt/2 and only differ in their previous solution, so if the bilinear form doesn't depend on
+        # the solution or on time they are the same operator. The second half step then reuses the assembled matrix,
+        # preconditioner, and factorization of the first half step.
+        self.share_half_step_operator = self.model.bilinear_form_is_time_invariant()
+        self.a = self.a_short if self.share_half_step_operator else a
 
     def _create_preconditioners(self) -> None:
-        self.preconditioner_long    = self.model.construct_preconditioners(self.a_long)
-        self.preconditioner_short   = self.model.construct_preconditioners(self.a_short)
-        self.preconditioner         = self.model.construct_preconditioners(self.a)
+        self.preconditioner_long    = self.model.construct_preconditioners(self.a_long, self.dt_param[0])
+        self.preconditioner_short   = self.model.construct_preconditioners(self.a_short, self.dt_param[1])
+        if self.share_half_step_operator:
+            self.preconditioner     = self.preconditioner_short
+        else:
+            self.preconditioner     = self.model.construct_preconditioners(self.a, self.dt_param[1])
 
     def _re_assemble(self) -> None:
         self._assemble()
@@ -83,7 +92,7 @@ class AdaptiveThreeStep(BaseAdaptiveTransientRKSolver):
 
         # Single solve for the first half of the time step.
         for i in range(len(self.a_short)):
-            self.a_short[i].Assemble()
+            self.split_assembly.assemble(self.a_short[i], self.dt_param[1])
             self.L_short[i].Assemble()
 
         self._update_preconditioners(self.preconditioner_short)
@@ -93,12 +102,15 @@ class AdaptiveThreeStep(BaseAdaptiveTransientRKSolver):
         # The linearization terms do not need to be updated since they are now for t^n+1/2 as expected.
         self.model.update_model_variables(self.gfu_short, time_step=1)
 
-        # Single solve for the second half of the time step.
+        # Single solve for the second half of the time step. If the operator is shared with the first half step it is
+        # already assembled and only the linear form has changed.
         for i in range(len(self.a)):
-            self.a[i].Assemble()
+            if not self.share_half_step_operator:
+                self.split_assembly.assemble(self.a[i], self.dt_param[1])
             self.L[i].Assemble()
 
-        self._update_preconditioners(self.preconditioner)
+        if not self.share_half_step_operator:
+            self._update_preconditioners(self.preconditioner)
         self.model.solve_single_step(self.a, self.L, self.preconditioner, self.gfu, 0)
 
     def _calculate_local_error(self) -> Tuple[List[float], List[float], List[str]]:
@@ -49,12 +49,12 @@ class AdaptiveTwoStep(BaseAdaptiveTransientMultiStepSolver):
 
     def _assemble(self) -> None:
         for i in range(len(self.a_pred)):
-            self.a_pred[i].Assemble()
+            self.split_assembly.assemble(self.a_pred[i], self.dt_param[0])
             self.L_pred[i].Assemble()
         self._update_preconditioners(self.preconditioner_pred)
 
         for i in range(len(self.a_corr)):
-            self.a_corr[i].Assemble()
+            self.split_assembly.assemble(self.a_corr[i], self.dt_param[0])
             self.L_corr[i].Assemble()
         self._update_preconditioners(self.preconditioner_corr)
 
@@ -63,8 +63,8 @@ class AdaptiveTwoStep(BaseAdaptiveTransientMultiStepSolver):
         self.a_corr, self.L_corr = implicit_euler(self.model, self.gfu_0_list, self.dt_param)
 
     def _create_preconditioners(self) -> None:
-        self.preconditioner_pred = self.model.construct_preconditioners(self.a_pred)
-        self.preconditioner_corr = self.model.construct_preconditioners(self.a_corr)
+        self.preconditioner_pred = self.model.construct_preconditioners(self.a_pred, self.dt_param[0])
+        self.preconditioner_corr = self.model.construct_preconditioners(self.a_corr, self.dt_param[0])
 
     def _re_assemble(self) -> None:
         self._assemble()
@@ -92,7 +92,7 @@ class BaseAdaptiveTransientRKSolver(TransientRKSolver, ABC):
 
             sys.exit(1337)
 
-        dt_new = min([dt_from_local_error, self._dt_for_next_time_to_hit(), dt_max_allowed])
+        dt_new = min([self._quantize_dt(dt_from_local_error), self._dt_for_next_time_to_hit(), dt_max_allowed])
 
         # Accept the time step if all local errors are less than the absolute and relative tolerance.
         accept_timestep = True
@@ -144,7 +144,7 @@ class BaseAdaptiveTransientRKSolver(TransientRKSolver, ABC):
 
             # Set all dt values to the new dt except for the last dt value (keep as the dt for the previous time step).
             if self.scheme == 'adaptive three step':
-                dt_ref = self.dt_param[1].Get()
+                dt_ref = self._quantize_dt(self.dt_param[1].Get())
             else:
                 dt_ref = dt_new
             self.dt_param[-1].Set(self.dt_param[0].Get())
@@ -19,7 +19,7 @@ import logging
 import math
 # TODO: generalize so we don't have to import each one individually
 from ...models import Model
-from typing import Tuple, Type, List
+from typing import Tuple, Type, List, Optional
 from ...config_functions import ConfigParser
 from ...solvers import TransientMultiStepSolver
 from abc import ABC, abstractmethod
@@ -38,6 +38,23 @@ class BaseAdaptiveTransientMultiStepSolver(TransientMultiStepSolver, ABC):
     def __init__(self, model_class: Type[Model], config: ConfigParser) -> None:
         super().__init__(model_class, config)
 
+        # Gains of the PI controller used by schemes with an error estimate of known order, see _pi_controlled_dt.
+        gains = self.config.get_list(['TRANSIENT', 'dt_controller_gains'], float, quiet=True)
+        if len(gains) != 2:
+            raise ValueError('dt_controller_gains must be given as two numbers, the integral and proportional gain.')
+        self.integral_gain, self.proportional_gain = gains
+
+        # The error of the current and the last accepted timestep relative to the tolerance. The latter is None if
+        # the last timestep was rejected or its error was not used by the PI controller.
+        self._error_ratio = 0.0
+        self.prev_error_ratio: Optional[float] = None
+
+    def reset_model(self) -> None:
+        super().reset_model()
+
+        self._error_ratio = 0.0
+        self.prev_error_ratio = None
+
     def _update_time_step(self) -> Tuple[bool, float, float, str]:
         dt_min_allowed = self.dt_range[0]
         dt_max_allowed = self.dt_range[1]
@@ -62,18 +79,7 @@ class BaseAdaptiveTransientMultiStepSolver(TransientMultiStepSolver, ABC):
             if gfu_norm[i] == 0:
                 gfu_norm[i] = 1e-10
 
-        # Calculate the next timestep based on the relative local error and multiply by 0.9 for a safety margin.
-        all_dt_from_local_error: List[float] = []
-        for i in range(len(local_error)):
-            safety_factor = 0.9
-            error_factor = math.sqrt((self.dt_abs_tol + self.dt_rel_tol * gfu_norm[i]) / local_error[i])
-            # Limit error_factor to [0.3, 2.0]
-            error_factor = max(0.3, error_factor)
-            error_factor = min(2.0, error_factor)
-            all_dt_from_local_error.append(self.dt_param[0].Get() * safety_factor * error_factor)
-
-        # Pick the smallest of the timestep values.
-        dt_from_local_error = min(all_dt_from_local_error)
+        dt_from_local_error = self._dt_from_local_error(local_error, gfu_norm)
 
         # Ensure dt_from_local_error is not smaller than the specified minimum.
         # This is checked to ensure that dt does not decrease to ~1e-64 or lower when the solver can't take a step.
@@ -89,7 +95,7 @@ class BaseAdaptiveTransientMultiStepSolver(TransientMultiStepSolver, ABC):
                      'solution to file and ending the run. Suggest rerunning with a time step of {1} s.'
                      .format(self.t_param[0].Get(), dt_from_local_error))
 
-        dt_new = min([dt_from_local_error, self._dt_for_next_time_to_hit(), dt_max_allowed])
+        dt_new = min([self._quantize_dt(dt_from_local_error), self._dt_for_next_time_to_hit(), dt_max_allowed])
 
         # Accept the time step if all local errors are less than the absolute and relative tolerance.
         accept_timestep = True
@@ -101,16 +107,8 @@ class BaseAdaptiveTransientMultiStepSolver(TransientMultiStepSolver, ABC):
         if accept_timestep:
             # Keep the solution and move to the next time step with the new dt.
             #
-            # Update all previous timestep solutions.
-            for i in range(1, self.scheme_order):
-                self.gfu_0_list[-i].vec.data = self.gfu_0_list[-(i + 1)].vec
-
-            # Update data in previous timestep with new solution
-            self.gfu_0_list[0].vec.data = self.gfu.vec
-
-            # Update the list of time step parameters.
-            for i in range(1, self.scheme_order + 1):
-                self.dt_param[-i].Set(self.dt_param[-(i + 1)].Get())
+            # Update all previous timestep solutions and the list of time step parameters.
+            self._advance_history()
 
             # Update the new dt_param value.
             self.dt_param[0].Set(dt_new)
@@ -119,12 +117,16 @@ class BaseAdaptiveTransientMultiStepSolver(TransientMultiStepSolver, ABC):
             # as necessary.
             self.model.update_model_variables(self.gfu_0_list[0])
 
+            self.prev_error_ratio = self._error_ratio if self._error_ratio > 0.0 else None
+
         else:
             # Repeat the time step with the new dt.
             for i in range(len(self.t_param)):
                 self.t_param[i].Set(self.t_param[i].Get() - self.dt_param[i].Get())
             self.dt_param[0].Set(dt_new)
 
+            self.prev_error_ratio = None
+
             logging.info("Time-step failed, re-attempting with reduced (halved) time-step.")
 
         # The largest absolute error values
@@ -142,6 +144,71 @@ class BaseAdaptiveTransientMultiStepSolver(TransientMultiStepSolver, ABC):
         # Return whether to accept the timestep and the maximum relative local error.
         return accept_timestep, max_abs, max_rel, component
 
+    def _dt_from_local_error(self, local_error: List[float], gfu_norm: List[float]) -> float:
+        """
+        Function to calculate the next timestep from the local error of the current timestep.
+
+        Args:
+            local_error: List of the (non-zero) local error for each model variable.
+            gfu_norm: List of the (non-zero) solution norm for each model variable.
+
+        Returns:
+            The next timestep, or the timestep to repeat the current timestep with if it is rejected.
+        """
+        # Calculate the next timestep based on the relative local error and multiply by 0.9 for a safety margin.
+        all_dt_from_local_error: List[float] = []
+        for i in range(len(local_error)):
+            safety_factor = 0.9
+            error_factor = math.sqrt((self.dt_abs_tol + self.dt_rel_tol * gfu_norm[i]) / local_error[i])
+            # Limit error_factor to [0.3, 2.0]
+            error_factor = max(0.3, error_factor)
+            error_factor = min(2.0, error_factor)
+            all_dt_from_local_error.append(self.dt_param[0].Get() * safety_factor * error_factor)
+
+        # Pick the smallest of the timestep values.
+        return min(all_dt_from_local_error)
+
+    def _pi_controlled_dt(self, local_error: List[float], gfu_norm: List[float], estimate_order: int,
+                          max_factor: float) -> float:
+        """
+        Function to calculate the next timestep with a PI (Gustafsson) controller.
+
+        The timestep is scaled by (1/r_n)^(k_I/q) * r_n-1^(k_P/q), where r is the largest local error relative to its
+        tolerance and q is the order of the local error estimate in dt. Using the error of the previous timestep damps
+        the oscillations and repeated rejections of a controller that only uses the current error. Only the current
+        error is used directly after a rejected timestep.
+
+        Args:
+            local_error: List of the (non-zero) local error for each model variable.
+            gfu_norm: List of the (non-zero) solution norm for each model variable.
+            estimate_order: The order of the local error estimate in dt.
+            max_factor: The largest allowed ratio of the next and the current timestep.
+
+        Returns:
+            The next timestep, or the timestep to repeat the current timestep with if it is rejected.
+        """
+        # The largest error relative to its tolerance, the timestep is accepted if this is at most one.
+        error_ratio = max(local_error[i] / (self.dt_abs_tol + self.dt_rel_tol * gfu_norm[i])
+                          for i in range(len(local_error)))
+        error_ratio = max(error_ratio, 1e-10)
+        self._error_ratio = error_ratio
+
+        safety_factor = 0.9
+
+        if self.prev_error_ratio is None:
+            error_factor = error_ratio ** (-1.0 / estimate_order)
+        else:
+            error_factor = error_ratio ** (-self.integral_gain / estimate_order) \
+                           * self.prev_error_ratio ** (self.proportional_gain / estimate_order)
+
+        if error_ratio > 1.0:
+            # Never grow the timestep that is being repeated.
+            error_factor = min(1.0, error_factor)
+
+        error_factor = min(max_factor, max(0.2, safety_factor * error_factor))
+
+        return self.dt_param[0].Get() * error_factor
+
     @abstractmethod
     def _calculate_local_error(self) -> Tuple[List[float], List[float], List[str]]:
         """
@@ -18,6 +18,7 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 import math
+import time
 import logging
 from typing import Dict, List, Optional, Tuple, Type
 import sys
@@ -28,10 +29,15 @@ import numpy as np
 from pathlib import Path
 
 from ..models import Model
-from ..config_functions import ConfigParser
+from ..config_functions import ConfigFunctions, ConfigParser
+from ..config_functions.parse_arithmetic import load_parsed_expressions, save_parsed_expressions
 from ..helpers.saving import SolutionFileSaver
 from ..helpers.error import calc_error
-from ..helpers.ngsolve_ import gridfunction_rigid_body_motion
+from ..helpers.math import dt_ladder_value, extrapolation_coefficients
+from ..helpers.jfnk import FiniteDifferenceJacobian
+from ..helpers.linear_solve_stats import LinearSolveResult
+from ..helpers.ngsolve_ import gridfunction_rigid_body_motion, rms_norm
+from ..helpers.split_assembly import SplitAssemblyCache
 from ..controllers.controller_group import ControllerGroup
 
 """
@@ -49,6 +55,9 @@ scheme_order = {'explicit euler': 1,
                 'CNLF': 2,
                 'SBDF': 3,
                 'adaptive IMEX': 3,
+                'adaptive BDF2': 3,
+                'adaptive BDF3': 4,
+                'adaptive ESDIRK': 1,
                 'RK 222': 2,
                 'RK 232': 3}
 
@@ -63,6 +72,9 @@ scheme_dt_coef = {'explicit euler': [1.0],
                   'CNLF': [1.0, 1.0],
                   'SBDF': [1.0, 1.0, 1.0],
                   'adaptive IMEX': [1.0, 1.0, 1.0],
+                  'adaptive BDF2': [1.0, 1.0, 1.0],
+                  'adaptive BDF3': [1.0, 1.0, 1.0, 1.0],
+                  'adaptive ESDIRK': [1.0],
                   'RK 222': [1.0, 0.5 * (2.0 - ngs.sqrt(2.0))],
                   'RK 232': [1.0, 1.0, 0.5 * (2.0 - ngs.sqrt(2.0))]}
 
@@ -84,6 +96,13 @@ class Solver(ABC):
 
         self.gfu_0_list: List[ngs.GridFunction] = []
 
+        # The most recently accepted solutions and their times, in reverse chronological order.
+        self.solution_history: List[Tuple[float, ngs.BaseVector]] = []
+
+        # The solution and its time at the previous steady state check, and the time at which the run was found to have
+        # reached a steady state (None if it hasn't).
+        self.steady_state_reference: Optional[Tuple[float, ngs.BaseVector]] = None
+        self.steady_state_time: Optional[float] = None
 
         if self.transient:
             self.scheme = self.config.get_item(['TRANSIENT', 'scheme'], str)
@@ -124,6 +143,23 @@ class Solver(ABC):
 
             self.has_controller = self.config.get_item(['CONTROLLER', 'active'], bool)
 
+            # Runs that march to a steady state can end as soon as the solution stops changing. The change of the
+            # solution per unit time is checked every steady_state_check_interval accepted time steps.
+            steady_state_tol = self.config.get_dict(['TRANSIENT', 'steady_state_tolerance'], '', None, quiet=True)
+            self.steady_state_abs_tol = steady_state_tol['absolute']
+            self.steady_state_rel_tol = steady_state_tol['relative']
+            self.steady_state_check_interval = self.config.get_item(['TRANSIENT', 'steady_state_check_interval'], int,
+                                                                    quiet=True)
+            if self.steady_state_abs_tol < 0.0 or self.steady_state_rel_tol < 0.0:
+                raise ValueError('steady_state_tolerance must be positive, or zero to always run to the final time.')
+            if self.steady_state_check_interval < 1:
+                raise ValueError('steady_state_check_interval must be at least 1.')
+
+            # The degree of the polynomial extrapolation of previously accepted solutions used to predict the solution
+            # at the new time. The prediction is the initial guess for iterative linear solvers and for the wind of
+            # the Oseen linearization.
+            self.predictor_order = self.config.get_item(['TRANSIENT', 'predictor_order'], int, quiet=True)
+
             if 'adaptive' in self.scheme:
                 self.adaptive = True
 
@@ -137,6 +173,12 @@ class Solver(ABC):
                     # Make sure dt_range is in the order [min_dt, max_dt]
                     self.dt_range = [self.dt_range[1], self.dt_range[0]]
                 self.max_rejects = self.config.get_item(['TRANSIENT', 'maximum_rejected_solves'], int, quiet=True)
+
+                # Restricting the time step sizes to a geometric ladder lets the factorizations of previously used time
+                # step sizes be reused.
+                self.dt_ladder_steps = self.config.get_item(['TRANSIENT', 'dt_ladder_steps'], int, quiet=True)
+                if self.dt_ladder_steps < 0:
+                    raise ValueError('dt_ladder_steps must be positive, or zero to not use a time step ladder.')
             else:
                 self.adaptive = False
 
@@ -149,6 +191,12 @@ class Solver(ABC):
             self.t_param = [ngs.Parameter(0.0)]
             self.scheme_type = 'stationary'
 
+        # Expressions parsed by earlier runs can be loaded from disk instead of being parsed again.
+        self.parse_cache_dir = self.config.get_item(['OTHER', 'parse_cache_dir'], str, quiet=True)
+        if self.parse_cache_dir:
+            num_loaded = load_parsed_expressions(self.parse_cache_dir)
+            logging.info('Loaded {0} parsed expressions from {1}.'.format(num_loaded, self.parse_cache_dir))
+
         # Initialize model
         self.model = model_class(self.config, self.t_param)
 
@@ -182,14 +230,52 @@ class Solver(ABC):
         # Check that the linearization method is consistent with the time integration scheme chosen.
         if self.transient:
             if self.scheme in ['euler IMEX', 'CNLF', 'SBDF', 'adaptive IMEX', 'RK 222', 'RK 232']:
-                if self.model.linearize == 'Oseen':
-                    # IMEX + using Oseen linearization is nonsensical.
-                    raise ValueError('Oseen linearization can\'t be used with IMEX time integration schemes.')
+                if self.model.linearize in ['Oseen', 'Newton']:
+                    # IMEX + using Oseen or Newton linearization is nonsensical.
+                    raise ValueError('{} linearization can\'t be used with IMEX time integration schemes.'
+                                     .format(self.model.linearize))
             elif self.model.linearize == 'IMEX':
                 # Not an IMEX scheme (would be caught by previous if statement) + not using IMEX linearization is
                 # nonsensical.
                 raise ValueError('IMEX linearization must be used with an IMEX time integration scheme.')
 
+        # Reuse the direct solver factorization between linear solves if the matrix values can only change when dt
+        # changes. The cache is invalidated whenever dt changes, the BCs are changed by a controller, or the weak forms
+        # or finite element space are recreated.
+        self.reuse_factorization = self.config.get_item(['SOLVER', 'reuse_factorization'], bool, quiet=True)
+        self.model.factorization_cache.enabled = self.reuse_factorization and self.model.linear_solver == 'direct' \
+                                                 and self.model.bilinear_form_is_time_invariant()
+        if self.model.factorization_cache.enabled:
+            logging.info('Reusing direct solver factorizations while dt is constant.')
+
+        # When the matrix values do change (every nonlinear iteration, or when dt changes) the sparsity pattern stays
+        # the same, so the direct solver only needs to redo the numeric part of the factorization.
+        self.numeric_refactorization = self.config.get_item(['SOLVER', 'numeric_refactorization'], bool, quiet=True)
+        self.model.factorization_cache.numeric_refactorization = self.numeric_refactorization \
+                                                                 and self.model.linear_solver == 'direct'
+
+        # Factorizations can be kept for several time step sizes per bilinear form so that returning to an earlier time
+        # step size doesn't require a refactorization. The least recently used ones are discarded to stay within the
+        # limits.
+        self.model.factorization_cache.max_states = self.config.get_item(['SOLVER', 'factorization_cache_size'], int,
+                                                                         quiet=True)
+        if self.model.factorization_cache.max_states < 1:
+            raise ValueError('factorization_cache_size must be at least 1.')
+        self.model.factorization_cache.max_memory = 1e6 * self.config.get_item(['SOLVER',
+                                                                                'factorization_cache_memory'],
+                                                                               float, quiet=True)
+
+        # Assemble the constant and dt-proportional parts of time-invariant bilinear forms once, and afterwards only
+        # combine them when dt changes instead of re-assembling the bilinear forms every time step. Preconditioners that
+        # are built while the bilinear form is assembled would not see the new matrix values.
+        self.split_bilinear_forms = self.config.get_item(['SOLVER', 'split_bilinear_forms'], bool, quiet=True)
+        self.split_assembly = SplitAssemblyCache()
+        self.split_assembly.enabled = self.split_bilinear_forms and self.transient \
+                                      and self.model.bilinear_form_is_time_invariant() \
+                                      and not self.model.preconditioners_require_assembly()
+        if self.split_assembly.enabled:
+            logging.info('Assembling the bilinear forms from their constant and dt-proportional parts.')
+
         self.gfu = self.model.construct_gfu()
 
         self._load_and_apply_initial_conditions()
@@ -231,13 +317,19 @@ class Solver(ABC):
             if self.model.DIM:
                 self.saver.save(self.model.DIM_solver.phi_gfu_orig, self.t_param[0].Get(), DIM=True)
 
+        # Every config file has been parsed by now, so store any newly parsed expressions for later runs.
+        if self.parse_cache_dir:
+            num_saved = save_parsed_expressions(self.parse_cache_dir)
+            logging.info('Stored {0} new parsed expressions in {1}.'.format(num_saved, self.parse_cache_dir))
+
     def _assemble(self) -> None:
         """
         Assemble the linear and bilinear forms of the model.
         """
         assert len(self.a) == len(self.L)
+        dt = self.dt_param[0] if self.transient else None
         for i in range(len(self.a)):
-            self.a[i].Assemble()
+            self.split_assembly.assemble(self.a[i], dt)
             self.L[i].Assemble()
 
         self._update_preconditioners()
@@ -286,6 +378,113 @@ class Solver(ABC):
         else:
             return min(dts_pos)
 
+    def _invalidate_stale_factorizations(self) -> None:
+        """
+        Function to tell the factorization cache which operator state the bilinear forms are about to be assembled for,
+        so factorizations computed for other time step sizes aren't used.
+        """
+        self.model.factorization_cache.set_state(self._operator_state())
+
+    def _operator_state(self) -> Tuple[float, ...]:
+        """
+        Function to get the values that determine the matrices of time-invariant bilinear forms.
+
+        Returns:
+            The current time step sizes.
+        """
+        return tuple(dt.Get() for dt in self.dt_param)
+
+    def _quantize_dt(self, dt: float) -> float:
+        """
+        Function to round a time step size proposed by an adaptive scheme down onto the time step ladder, if one is
+        used.
+
+        Args:
+            dt: The proposed time step size.
+
+        Returns:
+            The time step size to use.
+        """
+        if self.dt_ladder_steps == 0:
+            return dt
+
+        return dt_ladder_value(dt, self.dt_range[1], self.dt_ladder_steps)
+
+    def _record_solution(self) -> None:
+        """
+        Function to add the current solution to the history used to predict the solution at the next time step.
+        """
+        if self.predictor_order < 1:
+            return
+
+        if len(self.solution_history) > self.predictor_order:
+            # Reuse the storage of the oldest solution, it is no longer needed.
+            _, vec = self.solution_history.pop()
+        else:
+            vec = self.gfu.vec.CreateVector()
+
+        vec.data = self.gfu.vec
+        self.solution_history.insert(0, (self.t_param[0].Get(), vec))
+
+    def _config_functions(self) -> List[ConfigFunctions]:
+        """
+        Function to get the holders of the model's expressions that can be re-parsed with new model variable values.
+
+        Returns:
+            The BC, initial condition, model function, and reference solution functions of the model.
+        """
+        return [self.model.bc_functions, self.model.ic_functions, self.model.model_functions,
+                self.model.ref_sol_functions]
+
+    def _reached_steady_state(self) -> bool:
+        """
+        Function to check whether the solution has stopped changing.
+
+        Every steady_state_check_interval accepted time steps the change of the solution since the previous check is
+        divided by the time between the checks. Both this rate of change and the solution are measured by the root mean
+        square of their DOF values, and the run has reached a steady state once the rate of change is below
+        absolute + relative * (solution) from steady_state_tolerance.
+
+        Returns:
+            True if the run has reached a steady state, else False.
+        """
+        if self.steady_state_reference is None or self.num_iters % self.steady_state_check_interval != 0:
+            return False
+
+        t_ref, vec_ref = self.steady_state_reference
+        t = self.t_param[0].Get()
+        if t <= t_ref:
+            return False
+
+        vec_ref.data -= self.gfu.vec
+        rate = rms_norm(vec_ref) / (t - t_ref)
+        tolerance = self.steady_state_abs_tol + self.steady_state_rel_tol * rms_norm(self.gfu.vec)
+
+        # The current solution is the reference for the next check.
+        vec_ref.data = self.gfu.vec
+        self.steady_state_reference = (t, vec_ref)
+
+        return rate < tolerance
+
+    def _predict_solution(self) -> None:
+        """
+        Function to extrapolate the previously accepted solutions to the new time.
+
+        The prediction replaces the previous solution as the initial guess for iterative linear solvers and as the
+        starting wind for the Oseen linearization. Nothing is done until at least two solutions are known.
+        """
+        if len(self.solution_history) < 2:
+            return
+
+        times = [t for t, _ in self.solution_history]
+        coefficients = extrapolation_coefficients(times, self.t_param[0].Get())
+
+        self.gfu.vec.data = coefficients[0] * self.solution_history[0][1]
+        for coefficient, (_, vec) in zip(coefficients[1:], self.solution_history[1:]):
+            self.gfu.vec.data += coefficient * vec
+
+        self.model.update_linearization(self.gfu)
+
     def _log_timestep(self, accepted: bool, error_abs: float, error_rel: float, component: str) -> None:
         """
         Function to print out information about the current timestep's iteration
@@ -309,6 +508,11 @@ class Solver(ABC):
             print('Max REL error: {}'.format(error_rel))
             print('Max ABS error: {}'.format(error_abs))
         print('New dt:       {}'.format(self.dt_param[0].Get()))
+        print('Linear solves: {0} ({1} iterations, {2:.3f}s)'.format(self.model.linear_solve_stats.step_solves,
+                                                                     self.model.linear_solve_stats.step_iterations,
+                                                                     self.model.linear_solve_stats.step_wall_time))
+        if self.model.linear_solve_stats.step_nonlinear_iterations > 0:
+            print('Nonlinear iterations: {}'.format(self.model.linear_solve_stats.step_nonlinear_iterations))
         print('---')
 
     def _solve(self) -> None:
@@ -366,8 +570,11 @@ class Solver(ABC):
 
         Parameters
         - alpha is the same variable as the simple methods. Related to Jacobian approximation via J ~ -1/a
-        - keep_vectors --> the number of difference vectors to retain. Default is 4 or 5 (as recommended by Anderson)
-        - w0 --> regularization parameter for numerical stability. Default is 0.01. Good values are on order of 0.01
+        - keep_vectors --> the number of difference vectors to retain ([SOLVER] anderson_vectors, default 5)
+        - w0 --> regularization parameter for numerical stability ([SOLVER] anderson_regularization, default 0.01)
+
+        The mixing itself is done by the model's AndersonAccelerator, which is also used by the transient Oseen
+        iterations of INS.
 
         ## Iteration begins ##
 
@@ -406,8 +613,12 @@ class Solver(ABC):
                                                    self.model.DIM_solver.scale, self.model.DIM_solver.offset)
 
 
+                self._predict_solution()
+
                 self._apply_boundary_conditions()
 
+                self._invalidate_stale_factorizations()
+
                 self._re_assemble()
 
                 self._single_solve()
@@ -417,9 +628,13 @@ class Solver(ABC):
 
                 # Log information about the current timestep
                 self._log_timestep(accept_this_iteration, local_error_abs, local_error_rel, component)
+                self.model.linear_solve_stats.end_step(self.t_param[0].Get(), self.dt_param[0].Get(),
+                                                       accept_this_iteration)
 
                 # If this iteration met all all requirements for accepting the solution
                 if accept_this_iteration:
+                    self._record_solution()
+
                     # Reset counter
                     self.num_rejects = 0
                     # Increment
@@ -491,24 +706,20 @@ class Solver(ABC):
             # NONLINEAR PDE
             # iteration needed (via inexact Newton method)
 
+            if self.nonlinear_solver == 'JFNK':
+                self._jfnk_solve()
+                return
+
             # Declare iteration counter variable
             self.num_iterations = 0
 
+            # Start the forcing terms of inexact linear solves over.
+            self.model.forcing_term.reset()
 
-            ########################################################################################################
-            # Default optional user config parameters needed for the nonlinear solvers
-            # TODO: eventually this is moved to the config file, but is here temporarily
-
-            ## LinearMixing, DiagBroyden, and Anderson ##
-            alpha = 1.0 # related to jacobian approximation via J ~ -1/alpha
 
-            ## Anderson Mixing ##
-            keep_vectors = 5 # number of difference vectors to retain. Default is 4 or 5
-            w0 = 0.01 # parameter for numerical stability. Good values on order of 0.01. Default 0.01.
-            singular_tolerance = 1e-6 # the tolerance for singular matrix
-
-
-            ########################################################################################################
+            # Anderson mixing is done by the model's accelerator, the simple mixing methods are done here.
+            anderson = self.model.anderson if self.nonlinear_solver in ['default', 'Anderson'] else None
+            alpha = self.model.anderson.mixing_parameter  # related to jacobian approximation via J ~ -1/alpha
 
             # initialize the dx and f vector. No need to populate data, this is done later
             dx = self.gfu.vec.Copy()
@@ -539,22 +750,7 @@ class Solver(ABC):
                 else:
                     # Prevent an infinite loop of rejections by ending the run.
                     if self.num_iterations == self.nonlinear_max_iterations:
-
-                        # Save the current solution before ending the run.
-                        if self.save_to_file:
-                            self.saver.save(self.gfu, self.t_param[0].Get())
-
-                            if self.model.DIM:
-                                self.saver.save(self.model.DIM_solver.phi_gfu, self.t_param[0].Get(), DIM=True)
-                        else:
-                            tmp_saver = SolutionFileSaver(self.model, quiet=True)
-                            tmp_saver.save(self.gfu, self.t_param[0].Get())
-
-                            if self.model.DIM:
-                                tmp_saver.save(self.model.DIM_solver.phi_gfu, self.t_param[0].Get(), DIM=True)
-
-                        logging.error('Maximum number of nonlinear iterations has been exceeded. Saving current solution to file and ending the run.')
-                        sys.exit(-1)
+                        self._end_failed_nonlinear_solve()
 
 
                 ########################################################################################################
@@ -580,91 +776,52 @@ class Solver(ABC):
 
                     # Populate the f vector using current guess (linearization) minus previous
                     f.data = self.gfu.vec - x_prev
-                    fcurr = f.FV().NumPy().copy()
 
-                    # Initialize other parameters needed for nonlinear solvers
-                    if self.num_iterations == 2:
+                    if anderson is not None:
+                        # The mixing updates the current guess in place.
+                        if self.num_iterations == 2:
+                            anderson.reset(x_curr.size)
+                        anderson.update(x_curr.FV().NumPy(), f.FV().NumPy())
 
-                        # Initialize alpha
-                        # TODO: must handle this after implementing alpha into config file and finding
-                        # a citation or reference for this estimate and ITS BOUNDS
-                        # there is no citation for this from the Scipy linear_mixing solver code, but it seems to be based
-                        # on the "dominent eigenvalue method" (reference needed!)
-                        # based on Scipy implementation and information from the DEM method, alpha should not exceed 1
-                        # for stability.
-                        alpha = min(1., 0.5 * max(1., x_prev.Norm()) / f.Norm())
+                    else:
+                        fcurr = f.FV().NumPy().copy()
 
-                        # Keep track of previous f
-                        fprev = fcurr.copy()
+                        # Initialize other parameters needed for nonlinear solvers
+                        if self.num_iterations == 2:
 
-                        # If DiagBroyden, initialize beta
-                        # TODO: needs to be made thread efficient; currently repeated by every thread
-                        if self.nonlinear_solver == 'DiagBroyden':
-                            beta = np.full((self.gfu.vec.size), 1/alpha)
+                            # Initialize alpha
+                            # TODO: find a citation or reference for this estimate and ITS BOUNDS
+                            # there is no citation for this from the Scipy linear_mixing solver code, but it seems to be
+                            # based on the "dominent eigenvalue method" (reference needed!)
+                            # based on Scipy implementation and information from the DEM method, alpha should not exceed
+                            # 1 for stability.
+                            if alpha <= 0.0:
+                                alpha = min(1., 0.5 * max(1., x_prev.Norm()) / f.Norm())
 
-                    ############################################################################################
-                    # Perform mixing here based on the nonlinear solver chosen
-                    # Note: all solvers perform linear mixing for first (i=1) iteration
-
-                    if self.nonlinear_solver == 'LinearMixing' or self.num_iterations == 2:
-                        dx.data = alpha * f.Copy()
-                        if self.nonlinear_solver in ['default', 'Anderson']:
-                            dx_all = []
-                            df_all = []
-                            dx_all.append(dx.FV().NumPy().copy())
-
-                    elif self.nonlinear_solver == 'DiagBroyden':
-                        # Jacobian update
-                        beta -= (fcurr-fprev + beta*dx.FV().NumPy().copy())  *  dx.FV().NumPy().copy() / dx.Norm()**2
-                        # update dx and fprev
-                        dx.data = f.FV().NumPy().copy() / beta
-                        fprev = fcurr.copy()
-
-                    elif self.nonlinear_solver in ['default', 'Anderson']:
-                        # first must populate df_all with difference vector, fi+1-f_i
-                        df_all.append(fcurr-fprev)
-                        fprev = fcurr.copy()
-
-                        # if we are retaining more vectors than what has been set, remove the oldest one
-                        if len(dx_all) > keep_vectors:
-                            dx_all.pop(0)
-                            df_all.pop(0)
-
-                        # create the A matrix which is used to update dx during full anderson mixing
-                        A = np.zeros((len(dx_all), len(dx_all)))
-                        for i in range(len(dx_all)):
-                            for j in range(i,len(dx_all)):
-                                A[i,j] = np.vdot(df_all[i], df_all[j])
-
-                        np.fill_diagonal(A, A.diagonal() * (1+w0**2)) # multiply diagonal by 1+w0**2
-                        A += np.triu(A, 1).T.conj() # add to A, the transposed upper triangular (below 1st diag) matrix
-
-                        # check to see if A is singular. if so, reset jacobian approximation
-                        if abs(np.linalg.det(A)) < singular_tolerance:
-                            dx_all = []
-                            df_all = []
-                            dx.data = alpha * f.Copy()
-                            dx_all.append(dx.FV().NumPy().copy())
+                            # Keep track of previous f
+                            fprev = fcurr.copy()
 
-                        # If A not singular, then perform full anderson mixing!
-                        else:
-                            dx.data = -alpha * f.Copy()
-                            dff = np.zeros(len(df_all))
-                            for k in range(len(df_all)):
-                                dff[k] = np.vdot(df_all[k], fcurr)
+                            # If DiagBroyden, initialize beta
+                            # TODO: needs to be made thread efficient; currently repeated by every thread
+                            if self.nonlinear_solver == 'DiagBroyden':
+                                beta = np.full((self.gfu.vec.size), 1/alpha)
 
-                            gamma = np.linalg.solve(A, dff)
-                            dx_np = dx.FV().NumPy().copy()
-                            for k in range(len(df_all)):
-                                dx_np += gamma[k] * (dx_all[k] + alpha*df_all[k])
+                        ########################################################################################
+                        # Perform mixing here based on the nonlinear solver chosen
+                        # Note: all solvers perform linear mixing for first (i=1) iteration
 
-                            # Adjust dx_np and then set it to dx for next update
-                            dx.data = -1 * dx_np.copy()
-                            dx_all.append(dx.FV().NumPy().copy())
+                        if self.nonlinear_solver == 'LinearMixing' or self.num_iterations == 2:
+                            dx.data = alpha * f.Copy()
 
+                        elif self.nonlinear_solver == 'DiagBroyden':
+                            # Jacobian update
+                            beta -= (fcurr-fprev + beta*dx.FV().NumPy().copy())  *  dx.FV().NumPy().copy() / dx.Norm()**2
+                            # update dx and fprev
+                            dx.data = f.FV().NumPy().copy() / beta
+                            fprev = fcurr.copy()
 
-                    # update the current guess, the x_curr vector via the Newton method
-                    x_curr.data += dx
+                        # update the current guess, the x_curr vector via the Newton method
+                        x_curr.data += dx
 
                 ############################################################################################
                 # Below is code that is executed for all iterations (i = 0 : self.nonlinear_max_iterations)
@@ -679,21 +836,142 @@ class Solver(ABC):
                 self.model.update_linearization(self.gfu)
 
 
+    def _jfnk_solve(self) -> None:
+        """
+        Function to perform the stationary nonlinear solve of the model with the Jacobian-free Newton-Krylov method.
+
+        Each Newton step solves J(x) dx = -R(x) with GMRes. R is the residual of the model's weak forms with the
+        linearization terms (ex: the Oseen wind) set to the current iterate x, and products with the Jacobian J are
+        approximated by finite differences of R, so J is never assembled. GMRes is preconditioned by the linearized
+        operator (ex: the Oseen operator) assembled at x, which the other nonlinear solvers solve with directly. The
+        linear tolerance of each Newton step is chosen by the model's forcing term.
+
+        Unless the model's linear form depends on the linearization terms it is assembled once per Newton step, so each
+        Jacobian product only costs one matrix-free application of the bilinear form.
+        """
+        if self.a[0].condense:
+            raise ValueError('The JFNK nonlinear solver can\'t be used with static condensation.')
+
+        self.num_iterations = 0
+        self.model.forcing_term.reset()
+
+        comp_index = self.model.model_components['u']
+        freedofs = self.model.fes.FreeDofs()
+        projector = ngs.Projector(freedofs, True)
+
+        # The iterate that the residual is evaluated at, and the Newton update.
+        gfu_residual = ngs.GridFunction(self.model.fes)
+        gfu_update = ngs.GridFunction(self.model.fes)
+
+        x = self.gfu.vec
+        r = x.CreateVector()
+        rhs = x.CreateVector()
+
+        # Otherwise the linear form assembled with the other forms at the start of each Newton step is used as is.
+        assemble_linear_form = self.model.linear_form_depends_on_linearization()
+
+        def residual(x_eval: ngs.BaseVector, r_eval: ngs.BaseVector) -> None:
+            gfu_residual.vec.data = x_eval
+            self.model.update_linearization(gfu_residual)
+            if assemble_linear_form:
+                self.L[0].Assemble()
+            self.a[0].Apply(x_eval, r_eval)
+            r_eval.data -= self.L[0].vec
+            projector.Project(r_eval)
+
+        self._apply_boundary_conditions()
+
+        while True:
+            # Linearize about the current iterate to precondition the Newton step.
+            self.model.update_linearization(self.gfu)
+            self._re_assemble()
+            if self.model.linear_solver == 'direct':
+                precond = self.model.direct_inverse(self.a[0], freedofs)
+            elif self.preconditioners[0] is not None:
+                precond = self.preconditioners[0]
+            else:
+                precond = projector
+
+            residual(x, r)
+            rhs.data = -1.0 * r
+
+            start_time = time.perf_counter()
+            jacobian = FiniteDifferenceJacobian(residual, x, r, freedofs)
+            solver = ngs.solvers.GMResSolver(mat=jacobian, pre=precond, tol=self.model.forcing_term.tolerance,
+                                             atol=self.model.linear_tolerance,
+                                             maxiter=self.model.linear_max_iterations,
+                                             printrates=self.model.verbose)
+            gfu_update.vec[:] = 0.0
+            solver.Solve(rhs=rhs, sol=gfu_update.vec, initialize=False)
+
+            # The same convergence test as Model.linear_solve.
+            residuals = list(solver.residuals)
+            converged = not residuals or residuals[-1] <= max(solver.atol, solver.tol * residuals[0])
+            self.model.linear_solve_stats.record(LinearSolveResult('GMRes', max(len(residuals) - 1, 0),
+                                                                   residuals[-1] if residuals else 0.0, converged,
+                                                                   time.perf_counter() - start_time, residuals))
+            self.model.linear_solve_stats.record_nonlinear_iteration()
+
+            x.data += gfu_update.vec
+            self.num_iterations += 1
+
+            # Measured the same way as the other nonlinear solvers, by the change in the velocity.
+            err = gfu_update.components[comp_index].vec.Norm()
+            gfu_norm = self.gfu.components[comp_index].vec.Norm()
+            self.model.forcing_term.update(err)
+
+            logging.info("Nonlinear iteration {0} with error: {1}".format(self.num_iterations, err))
+
+            if err < self.nonlinear_absolute_tolerance + self.nonlinear_relative_tolerance * gfu_norm:
+                break
+
+            if self.num_iterations >= self.nonlinear_max_iterations:
+                self._end_failed_nonlinear_solve()
+
+        self.model.update_linearization(self.gfu)
+
+    def _end_failed_nonlinear_solve(self) -> None:
+        """
+        Function to save the current solution to file and end the run once a nonlinear solve has exceeded the maximum
+        number of iterations.
+        """
+        # Save the current solution before ending the run.
+        if self.save_to_file:
+            self.saver.save(self.gfu, self.t_param[0].Get())
+
+            if self.model.DIM:
+                self.saver.save(self.model.DIM_solver.phi_gfu, self.t_param[0].Get(), DIM=True)
+        else:
+            tmp_saver = SolutionFileSaver(self.model, quiet=True)
+            tmp_saver.save(self.gfu, self.t_param[0].Get())
+
+            if self.model.DIM:
+                tmp_saver.save(self.model.DIM_solver.phi_gfu, self.t_param[0].Get(), DIM=True)
+
+        logging.error('Maximum number of nonlinear iterations has been exceeded. Saving current solution to file and '
+                      'ending the run.')
+        sys.exit(-1)
+
     def _update_bcs(self, bc_dict_patch: Dict[str, Dict[str, Dict[str, List[Optional[CoefficientFunction]]]]]) -> None:
         """
         Function to update the model's BCs to arbitrary values, and then recreate the linear/bilinear forms and the
         preconditioner.
 
-        This function is used by controllers in order to act on the manipulated variables.
+        This function is used by controllers that act on the manipulated variables by replacing their BCs. Controllers
+        that change the values of parameters used in the BCs don't need it.
 
         Args:
             bc_dict_patch: Dictionary containing new values for the BCs being updated.
         """
-        # Update the model's BCs
+        # Update the model's BCs.
         self.model.update_bcs(bc_dict_patch)
 
-        # Recreate the linear form, bilinear form, and preconditioner
+        # Recreate the linear form, bilinear form, and preconditioner. Any cached factorizations belong to weak forms
+        # that no longer exist.
         self._create_linear_and_bilinear_forms()
+        self.model.factorization_cache.clear()
+        self.model.preconditioner_policy.clear()
+        self.split_assembly.clear()
         self._assemble()
         self._create_preconditioners()
 
@@ -704,8 +982,7 @@ class Solver(ABC):
         """
         preconditioners = precond_lst if precond_lst else self.preconditioners
         for preconditioner in preconditioners:
-            if preconditioner is not None:
-                preconditioner.Update()
+            self.model.preconditioner_policy.update(preconditioner)
 
     def reset_model(self) -> None:
         """
@@ -753,6 +1030,11 @@ class Solver(ABC):
             with open(self.save_error_filename, 'a') as f:
                 f.write('reset model\n')
 
+        # The mesh or finite element space may have changed.
+        self.model.factorization_cache.clear()
+        self.model.preconditioner_policy.clear()
+        self.split_assembly.clear()
+
         self.gfu = self.model.construct_gfu()
 
         if self.transient:
@@ -796,6 +1078,17 @@ class Solver(ABC):
         """
         self._create_linear_and_bilinear_forms()
 
+        # Any cached factorizations and preconditioners belong to weak forms that no longer exist.
+        self.model.factorization_cache.clear()
+        self.model.factorization_cache.reset_counters()
+        self.model.preconditioner_policy.clear()
+        self.model.preconditioner_policy.reset_counters()
+        self.split_assembly.clear()
+        self.split_assembly.reset_counters()
+        self.model.linear_solve_stats.reset()
+        for config_functions in self._config_functions():
+            config_functions.reset_re_parse_counters()
+
         self._create_preconditioners()
 
         self._assemble()
@@ -803,6 +1096,16 @@ class Solver(ABC):
         # Directly after initialization all elements of gfu_0_list contain the initial condition.
         self.gfu.vec.data = self.gfu_0_list[0].vec
 
+        if self.transient:
+            self.solution_history = []
+            self._record_solution()
+
+            self.steady_state_time = None
+            self.steady_state_reference = None
+            if self.steady_state_abs_tol > 0.0 or self.steady_state_rel_tol > 0.0:
+                self.steady_state_reference = (self.t_param[0].Get(), self.gfu.vec.CreateVector())
+                self.steady_state_reference[1].data = self.gfu.vec
+
         if self.transient:
             # Iterate over time steps.
             # NOTE: The first part of the and is somewhat redundant, but it ensures we don't go beyond the final time.
@@ -812,7 +1115,10 @@ class Solver(ABC):
                 if self.has_controller:
                     control_bc_dict = self.controller_group.calculate_control_all_actions(self.gfu,
                                                                                           rk_scheme=self.scheme_type == "RK")
-                    self._update_bcs(control_bc_dict)
+                    # Control actions that only change the values of parameters used in the BCs are picked up when the
+                    # linear forms are assembled for this time step.
+                    if len(control_bc_dict) > 0:
+                        self._update_bcs(control_bc_dict)
 
                 self._solve()
 
@@ -840,10 +1146,45 @@ class Solver(ABC):
                     with open(self.save_error_filename, 'a') as f:
                         f.write(', '.join([str(item) for item in error_lst]) + '\n')
 
+                if self._reached_steady_state():
+                    # The final state is saved below like at the end of the time range.
+                    self.steady_state_time = self.t_param[0].Get()
+                    print('Steady state reached at t = {}.'.format(self.steady_state_time))
+                    logging.info('Steady state reached at t = {}, ending the run.'.format(self.steady_state_time))
+                    break
+
         else:
             # Perform a stationary solve
             self._solve()
 
+        logging.info(self.model.linear_solve_stats.summary())
+
+        cache = self.model.factorization_cache
+        if cache.enabled or cache.numeric_refactorization:
+            logging.info(cache.summary())
+
+        if self.split_assembly.enabled:
+            logging.info('Bilinear forms: {0} full assemblies, {1} combinations of their parts, {2} reuses.'
+                         .format(self.split_assembly.assemblies, self.split_assembly.combinations,
+                                 self.split_assembly.reuses))
+
+        re_parses = sum(config_functions.re_parses for config_functions in self._config_functions())
+        re_parse_hits = sum(config_functions.re_parse_hits for config_functions in self._config_functions())
+        if re_parses + re_parse_hits > 0:
+            logging.info('Expressions of the model variables: {0} re-parses ({1:.3f}s), {2} cache hits ({3:.3f}s).'
+                         .format(re_parses,
+                                 sum(config_functions.re_parse_time for config_functions in self._config_functions()),
+                                 re_parse_hits,
+                                 sum(config_functions.re_parse_hit_time
+                                     for config_functions in self._config_functions())))
+
+        if self.model.expression_compiler is not None:
+            logging.info(self.model.expression_compiler.summary())
+
+        policy = self.model.preconditioner_policy
+        if policy.lagged:
+            logging.info('Preconditioners: {0} rebuilds, {1} reuses.'.format(policy.rebuilds, policy.reuses))
+
         # Save the final result
         if self.save_to_file:
             self.saver.save(self.gfu, self.t_param[0].Get())
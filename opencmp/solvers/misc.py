@@ -48,6 +48,10 @@ def get_solver_class(config: ConfigParser) -> Type[Solver]:
                 solver_class = AdaptiveThreeStep
             elif scheme == 'adaptive IMEX':
                 solver_class = AdaptiveIMEX
+            elif scheme in ['adaptive BDF2', 'adaptive BDF3']:
+                solver_class = AdaptiveBDF
+            elif scheme == 'adaptive ESDIRK':
+                solver_class = AdaptiveESDIRK
             else:
                 raise TypeError('Have not implemented {} time integration yet.'.format(scheme))
         else:
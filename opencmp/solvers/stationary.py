@@ -43,7 +43,7 @@ class StationarySolver(Solver):
         a_ode_terms = self.model.construct_bilinear_time_ODE(U, V)
 
         for i in range(self.model.num_weak_forms):
-            a = ngs.BilinearForm(self.model.fes)
+            a = ngs.BilinearForm(self.model.fes, condense=self.model.static_condensation)
             a += a_coeff_terms[i]
             a += a_ode_terms[i]
             self.a.append(a)
@@ -22,7 +22,7 @@ from typing import List, Tuple
 from ngsolve import dx
 
 
-def explicit_euler(model: Model, gfu_0: List[GridFunction], dt: List[Parameter])\
+def explicit_euler(model: Model, gfu_0: List[GridFunction], dt: List[Parameter], linear_only: bool = False)\
         -> Tuple[List[BilinearForm], List[LinearForm]]:
     """
     Explicit Euler time integration scheme.
@@ -35,6 +35,8 @@ def explicit_euler(model: Model, gfu_0: List[GridFunction], dt: List[Parameter])
         model: The model to solve.
         gfu_0: List of the solutions of previous time steps ordered from most recent to oldest.
         dt: List of timestep sizes ordered from most recent to oldest.
+        linear_only: Only construct the linear forms and return an empty list of bilinear forms. Used to bind the
+            linear forms to a new ordering of gfu_0.
 
     Returns:
         Tuple[BilinearForm, LinearForm]:
@@ -50,13 +52,14 @@ def explicit_euler(model: Model, gfu_0: List[GridFunction], dt: List[Parameter])
 
     # Construct the bilinear forms
     a: List[BilinearForm]   = []
-    a_lst                   = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 0)
-    for i in range(model.num_weak_forms):
-        a_tmp = BilinearForm(model.fes)
+    if not linear_only:
+        a_lst               = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 0)
+        for i in range(model.num_weak_forms):
+            a_tmp = BilinearForm(model.fes, condense=model.static_condensation)
 
-        a_tmp += a_lst[i]
+            a_tmp += a_lst[i]
 
-        a.append(a_tmp)
+            a.append(a_tmp)
 
     # Construct the linear forms
     L : List[BilinearForm]  = []
@@ -76,8 +79,8 @@ def explicit_euler(model: Model, gfu_0: List[GridFunction], dt: List[Parameter])
     return a, L
 
 
-def implicit_euler(model: Model, gfu_0: List[GridFunction], dt: List[Parameter], step: int = 0) \
-        -> Tuple[List[BilinearForm], List[LinearForm]]:
+def implicit_euler(model: Model, gfu_0: List[GridFunction], dt: List[Parameter], step: int = 0,
+                   linear_only: bool = False) -> Tuple[List[BilinearForm], List[LinearForm]]:
     """
     Implicit Euler time integration scheme.
 
@@ -91,6 +94,8 @@ def implicit_euler(model: Model, gfu_0: List[GridFunction], dt: List[Parameter],
         dt: List of timestep sizes ordered from most recent to oldest.
         step: Used for adaptive_three_step to ensure the correct boundary condition and model function values are used
             when the half steps are taken.
+        linear_only: Only construct the linear forms and return an empty list of bilinear forms. Used to bind the
+            linear forms to a new ordering of gfu_0.
 
     Returns:
         Tuple[BilinearForm, LinearForm]:
@@ -106,15 +111,16 @@ def implicit_euler(model: Model, gfu_0: List[GridFunction], dt: List[Parameter],
 
     # Construct the bilinear form
     a: List[BilinearForm]   = []
-    a_lst                   = model.construct_bilinear_time_coefficient(U, V, tmp_dt, step)
-    a_ode                   = model.construct_bilinear_time_ODE(U, V, tmp_dt, step)
-    for i in range(model.num_weak_forms):
-        a_tmp = BilinearForm(model.fes)
+    if not linear_only:
+        a_lst               = model.construct_bilinear_time_coefficient(U, V, tmp_dt, step)
+        a_ode               = model.construct_bilinear_time_ODE(U, V, tmp_dt, step)
+        for i in range(model.num_weak_forms):
+            a_tmp = BilinearForm(model.fes, condense=model.static_condensation)
 
-        a_tmp += a_lst[i]
-        a_tmp += a_ode[i]
+            a_tmp += a_lst[i]
+            a_tmp += a_ode[i]
 
-        a.append(a_tmp)
+            a.append(a_tmp)
 
     # Construct the linear form
     L : List[BilinearForm]  = []
@@ -132,7 +138,7 @@ def implicit_euler(model: Model, gfu_0: List[GridFunction], dt: List[Parameter],
     return a, L
 
 
-def crank_nicolson(model: Model, gfu_0: List[GridFunction], dt: List[Parameter])\
+def crank_nicolson(model: Model, gfu_0: List[GridFunction], dt: List[Parameter], linear_only: bool = False)\
         -> Tuple[List[BilinearForm], List[LinearForm]]:
     """
     Crank Nicolson (trapezoidal rule) time integration scheme.
@@ -145,6 +151,8 @@ def crank_nicolson(model: Model, gfu_0: List[GridFunction], dt: List[Parameter])
         model: The model to solve.
         gfu_0: List of the solutions of previous time steps ordered from most recent to oldest.
         dt: List of timestep sizes ordered from most recent to oldest.
+        linear_only: Only construct the linear forms and return an empty list of bilinear forms. Used to bind the
+            linear forms to a new ordering of gfu_0.
 
     Returns:
         Tuple[BilinearForm, LinearForm]:
@@ -160,15 +168,16 @@ def crank_nicolson(model: Model, gfu_0: List[GridFunction], dt: List[Parameter])
 
     # Construct the bilinear form
     a: List[BilinearForm]   = []
-    a_lst                   = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 0)
-    a_ode                   = model.construct_bilinear_time_ODE(U, V, tmp_dt, 0)
-    for i in range(model.num_weak_forms):
-        a_tmp = ngs.BilinearForm(model.fes)
+    if not linear_only:
+        a_lst               = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 0)
+        a_ode               = model.construct_bilinear_time_ODE(U, V, tmp_dt, 0)
+        for i in range(model.num_weak_forms):
+            a_tmp = ngs.BilinearForm(model.fes, condense=model.static_condensation)
 
-        a_tmp += a_lst[i]
-        a_tmp += 0.5 * a_ode[i]
+            a_tmp += a_lst[i]
+            a_tmp += 0.5 * a_ode[i]
 
-        a.append(a_tmp)
+            a.append(a_tmp)
 
     # Construct the linear form
     L: List[BilinearForm]   = []
@@ -190,7 +199,7 @@ def crank_nicolson(model: Model, gfu_0: List[GridFunction], dt: List[Parameter])
     return a, L
 
 
-def euler_IMEX(model: Model, gfu_0: List[GridFunction], dt: List[Parameter])\
+def euler_IMEX(model: Model, gfu_0: List[GridFunction], dt: List[Parameter], linear_only: bool = False)\
         -> Tuple[List[BilinearForm], List[LinearForm]]:
     """
     First order IMEX time integration scheme.
@@ -203,6 +212,8 @@ def euler_IMEX(model: Model, gfu_0: List[GridFunction], dt: List[Parameter])\
         model: The model to solve.
         gfu_0: List of the solutions of previous time steps ordered from most recent to oldest.
         dt: List of timestep sizes ordered from most recent to oldest.
+        linear_only: Only construct the linear forms and return an empty list of bilinear forms. Used to bind the
+            linear forms to a new ordering of gfu_0.
 
     Returns:
         Tuple[BilinearForm, LinearForm]:
@@ -218,15 +229,16 @@ def euler_IMEX(model: Model, gfu_0: List[GridFunction], dt: List[Parameter])\
 
     # Construct the bilinear form
     a: List[BilinearForm]   = []
-    a_lst                   = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 0)
-    a_ode                   = model.construct_bilinear_time_ODE(U, V, tmp_dt, 0)
-    for i in range(model.num_weak_forms):
-        a_tmp = BilinearForm(model.fes)
+    if not linear_only:
+        a_lst               = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 0)
+        a_ode               = model.construct_bilinear_time_ODE(U, V, tmp_dt, 0)
+        for i in range(model.num_weak_forms):
+            a_tmp = BilinearForm(model.fes, condense=model.static_condensation)
 
-        a_tmp += a_lst[i]
-        a_tmp += a_ode[i]
+            a_tmp += a_lst[i]
+            a_tmp += a_ode[i]
 
-        a.append(a_tmp)
+            a.append(a_tmp)
 
     # Construct the linear form
     L : List[BilinearForm]  = []
@@ -246,7 +258,7 @@ def euler_IMEX(model: Model, gfu_0: List[GridFunction], dt: List[Parameter])\
     return a, L
 
 
-def CNLF(model: Model, gfu_0: List[GridFunction], dt: List[Parameter]) \
+def CNLF(model: Model, gfu_0: List[GridFunction], dt: List[Parameter], linear_only: bool = False) \
         -> Tuple[List[BilinearForm], List[LinearForm]]:
     """
     Crank Nicolson Leap Frog IMEX time integration scheme.
@@ -259,6 +271,8 @@ def CNLF(model: Model, gfu_0: List[GridFunction], dt: List[Parameter]) \
         model: The model to solve.
         gfu_0: List of the solutions of previous time steps ordered from most recent to oldest.
         dt: List of timestep sizes ordered from most recent to oldest.
+        linear_only: Only construct the linear forms and return an empty list of bilinear forms. Used to bind the
+            linear forms to a new ordering of gfu_0.
 
     Returns:
         Tuple[BilinearForm, LinearForm]:
@@ -274,15 +288,16 @@ def CNLF(model: Model, gfu_0: List[GridFunction], dt: List[Parameter]) \
 
     # Construct the bilinear forms
     a: List[BilinearForm]   = []
-    a_lst                   = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 0)
-    a_ode                   = model.construct_bilinear_time_ODE(U, V, tmp_dt, 0)
-    for i in range(model.num_weak_forms):
-        a_tmp = BilinearForm(model.fes)
+    if not linear_only:
+        a_lst               = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 0)
+        a_ode               = model.construct_bilinear_time_ODE(U, V, tmp_dt, 0)
+        for i in range(model.num_weak_forms):
+            a_tmp = BilinearForm(model.fes, condense=model.static_condensation)
 
-        a_tmp += 2.0 * a_lst[i]
-        a_tmp += a_ode[i]
+            a_tmp += 2.0 * a_lst[i]
+            a_tmp += a_ode[i]
 
-        a.append(a_tmp)
+            a.append(a_tmp)
 
     # Construct the linear form
     L : List[BilinearForm]  = []
@@ -304,7 +319,7 @@ def CNLF(model: Model, gfu_0: List[GridFunction], dt: List[Parameter]) \
     return a, L
 
 
-def SBDF(model: Model, gfu_0: List[GridFunction], dt: List[Parameter]) \
+def SBDF(model: Model, gfu_0: List[GridFunction], dt: List[Parameter], linear_only: bool = False) \
         -> Tuple[List[BilinearForm], List[LinearForm]]:
     """
     Third order semi-implicit backwards differencing time integration scheme.
@@ -317,6 +332,8 @@ def SBDF(model: Model, gfu_0: List[GridFunction], dt: List[Parameter]) \
         model: The model to solve.
         gfu_0: List of the solutions of previous time steps ordered from most recent to oldest.
         dt: List of timestep sizes ordered from most recent to oldest.
+        linear_only: Only construct the linear forms and return an empty list of bilinear forms. Used to bind the
+            linear forms to a new ordering of gfu_0.
 
     Returns:
         Tuple[BilinearForm, LinearForm]:
@@ -332,14 +349,15 @@ def SBDF(model: Model, gfu_0: List[GridFunction], dt: List[Parameter]) \
 
     # Construct the bilinear forms
     a: List[BilinearForm]   = []
-    a_lst                   = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 0)
-    a_ode                   = model.construct_bilinear_time_ODE(U, V, tmp_dt, 0)
-    for i in range(model.num_weak_forms):
-        a_tmp = ngs.BilinearForm(model.fes)
+    if not linear_only:
+        a_lst               = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 0)
+        a_ode               = model.construct_bilinear_time_ODE(U, V, tmp_dt, 0)
+        for i in range(model.num_weak_forms):
+            a_tmp = ngs.BilinearForm(model.fes, condense=model.static_condensation)
 
-        a_tmp += a_lst[i]
-        a_tmp += a_ode[i]
-        a.append(a_tmp)
+            a_tmp += a_lst[i]
+            a_tmp += a_ode[i]
+            a.append(a_tmp)
 
     # Construct the linear form
     L : List[BilinearForm]  = []
@@ -406,7 +424,7 @@ def adaptive_IMEX_pred(model: Model, gfu_0: List[GridFunction], dt: List[Paramet
     a_lst                   = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 0)
     a_ode                   = model.construct_bilinear_time_ODE(U, V, tmp_dt, 0)
     for i in range(model.num_weak_forms):
-        a_tmp = BilinearForm(model.fes)
+        a_tmp = BilinearForm(model.fes, condense=model.static_condensation)
 
         a_tmp += a_lst[i]
         a_tmp += a_ode[i]
@@ -432,6 +450,71 @@ def adaptive_IMEX_pred(model: Model, gfu_0: List[GridFunction], dt: List[Paramet
     return a, L
 
 
+def BDF(model: Model, gfu_0: List[GridFunction], dt_eff: Parameter, beta: List[Parameter]) \
+        -> Tuple[List[BilinearForm], List[LinearForm]]:
+    """
+    Variable-step backward differencing time integration scheme.
+
+    The scheme is written as u^n+1 - sum_j beta_j u^n+1-j = dt_eff * (stationary terms at t^n+1), where the effective
+    time step dt_eff and the coefficients beta_j depend on the order of the scheme and the sizes of the previous time
+    steps (see helpers.math.bdf_coefficients). They are parameters so the solver can change them every time step
+    without constructing new forms. The scheme is then an implicit Euler step from a combination of the previous
+    solutions.
+
+    This function constructs the final bilinear and linear forms for the time integration scheme by adding the necessary
+    time-dependent terms to the model's stationary terms. The returned bilinear and linear forms have NOT been
+    assembled.
+
+    Args:
+        model: The model to solve.
+        gfu_0: List of the solutions of previous time steps. They may be in any order, e.g. the order of a ring
+            buffer, as long as beta is in the same order.
+        dt_eff: The effective time step.
+        beta: The coefficient of each of the previous solutions in gfu_0. The coefficients of previous solutions that
+            aren't used by the current order are zero.
+
+    Returns:
+        Tuple[BilinearForm, LinearForm]:
+            - a: A list of the final bilinear forms (as a BilinearForm but not assembled).
+            - L: A list of the final linear forms (as a LinearForm but not assembled).
+    """
+    U, V = model.get_trial_and_test_functions()
+
+    gfu_lst = _split_gfu(gfu_0)
+
+    # Combine the previous solutions into the single previous "solution" of the implicit Euler step.
+    gfu_combined = [gfu_lst[1][i] * beta[0] for i in range(len(gfu_lst[1]))]
+    for j in range(1, len(beta)):
+        gfu_combined = [gfu_combined[i] + beta[j] * gfu_lst[j + 1][i] for i in range(len(gfu_lst[1]))]
+
+    # Construct the bilinear forms
+    a: List[BilinearForm]   = []
+    a_lst                   = model.construct_bilinear_time_coefficient(U, V, dt_eff, 0)
+    a_ode                   = model.construct_bilinear_time_ODE(U, V, dt_eff, 0)
+    for i in range(model.num_weak_forms):
+        a_tmp = BilinearForm(model.fes, condense=model.static_condensation)
+
+        a_tmp += a_lst[i]
+        a_tmp += a_ode[i]
+
+        a.append(a_tmp)
+
+    # Construct the linear forms
+    L : List[BilinearForm]  = []
+    L_lst                   = model.construct_linear(V, None, dt_eff, 0)
+    for i in range(model.num_weak_forms):
+        L_tmp = LinearForm(model.fes)
+
+        L_tmp += L_lst[i]
+
+        L.append(L_tmp)
+
+    # Add time discretization terms
+    _add_dt_terms(a, L, [None, gfu_combined], model, 'implicit euler')
+
+    return a, L
+
+
 def RK_222(model: Model, gfu_0: List[GridFunction], dt: List[Parameter], step: int) \
         -> Tuple[List[BilinearForm], List[LinearForm]]:
     """
@@ -474,7 +557,7 @@ def RK_222(model: Model, gfu_0: List[GridFunction], dt: List[Parameter], step: i
         a_lst = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 1)
         a_ode = model.construct_bilinear_time_ODE(U, V, tmp_dt, 1)
         for i in range(model.num_weak_forms):
-            a_tmp = BilinearForm(model.fes)
+            a_tmp = BilinearForm(model.fes, condense=model.static_condensation)
 
             a_tmp += a_lst[i]
             a_tmp += a_ode[i]
@@ -499,7 +582,7 @@ def RK_222(model: Model, gfu_0: List[GridFunction], dt: List[Parameter], step: i
         a_lst   = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 0)
         a_ode   = model.construct_bilinear_time_ODE(U, V, tmp_dt, 0)
         for i in range(model.num_weak_forms):
-            a_tmp = BilinearForm(model.fes)
+            a_tmp = BilinearForm(model.fes, condense=model.static_condensation)
 
             a_tmp += a_lst[i]
             a_tmp += gamma * a_ode[i]
@@ -572,7 +655,7 @@ def RK_232(model: Model, gfu_0: List[GridFunction], dt: List[Parameter], step: i
         a_lst = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 2)
         a_ode = model.construct_bilinear_time_ODE(U, V, tmp_dt, 2)
         for i in range(model.num_weak_forms):
-            a_tmp = BilinearForm(model.fes)
+            a_tmp = BilinearForm(model.fes, condense=model.static_condensation)
 
             a_tmp += a_lst[i]
             a_tmp += a_ode[i]
@@ -597,7 +680,7 @@ def RK_232(model: Model, gfu_0: List[GridFunction], dt: List[Parameter], step: i
         a_lst = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 1)
         a_ode = model.construct_bilinear_time_ODE(U, V, tmp_dt, 1)
         for i in range(model.num_weak_forms):
-            a_tmp = BilinearForm(model.fes)
+            a_tmp = BilinearForm(model.fes, condense=model.static_condensation)
 
             a_tmp += a_lst[i]
             a_tmp += gamma * a_ode[i]
@@ -628,7 +711,7 @@ def RK_232(model: Model, gfu_0: List[GridFunction], dt: List[Parameter], step: i
         a_lst = model.construct_bilinear_time_coefficient(U, V, tmp_dt, 0)
         a_ode = model.construct_bilinear_time_ODE(U, V, tmp_dt, 0)
         for i in range(model.num_weak_forms):
-            a_tmp = BilinearForm(model.fes)
+            a_tmp = BilinearForm(model.fes, condense=model.static_condensation)
 
             a_tmp += a_lst[i]
             a_tmp += gamma * a_ode[i]
@@ -681,7 +764,9 @@ def _add_dt_terms(a: List[BilinearForm], L: List[BilinearForm], gfu_lst: List[Li
             L_dt[i] *= model.DIM_solver.phi_gfu
 
     for i in range(model.num_weak_forms):
-        a[i] += a_dt[i] * dx
+        # The bilinear forms are not constructed when only the linear forms are needed.
+        if a:
+            a[i] += a_dt[i] * dx
         L[i] += L_dt[i] * dx
 
 
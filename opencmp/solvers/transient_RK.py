@@ -20,6 +20,7 @@ from typing import Type, Optional
 from ..config_functions import ConfigParser
 from .time_integration_schemes import RK_222, RK_232
 from .base_solver import Solver
+from ..helpers.factorization import assembled_forms_match
 import ngsolve as ngs
 from ngsolve import Preconditioner
 from typing import List, Tuple
@@ -50,10 +51,20 @@ class TransientRKSolver(Solver):
         self.model.apply_dirichlet_bcs_to(self.gfu, self.scheme_order - self.step)
 
     def _assemble(self) -> None:
-        for i in range(len(self.a_list[-self.step])):
-            self.a_list[-self.step][i].Assemble()
-            self.L_list[-self.step][i].Assemble()
-        self._update_preconditioners(self.preconditioner_list[-self.step])
+        stage = len(self.a_list) - self.step
+        shared = self.stage_operator[stage] != stage
+
+        # A stage that shares its operator with an earlier stage only needs its linear form assembled.
+        for i in range(len(self.a_list[stage])):
+            if not shared:
+                self.a_list[stage][i].Assemble()
+            self.L_list[stage][i].Assemble()
+
+        if not self.stage_operator_checked[stage]:
+            shared = self._find_stage_operator(stage)
+
+        if not shared:
+            self._update_preconditioners(self.preconditioner_list[stage])
 
     def _create_linear_and_bilinear_forms(self) -> None:
         # Each intermediate step has its own bilinear and linear form. Add the weak forms in reverse step order to be
@@ -72,10 +83,16 @@ class TransientRKSolver(Solver):
             else:
                 raise ValueError('Have not implemented {} time integration yet.'.format(self.scheme))
 
+        # Index of the stage whose bilinear form, preconditioner, and factorization each stage uses, and whether each
+        # stage has been compared against the earlier stages yet. The stage operators can only be identical if the
+        # bilinear forms don't depend on the solution or on time.
+        self.stage_operator = list(range(len(self.a_list)))
+        self.stage_operator_checked = [not self.model.bilinear_form_is_time_invariant()] * len(self.a_list)
+
     def _create_preconditioners(self) -> None:
         # Each intermediate step needs its own preconditioner. Add the preconditioners in reverse step order to be
         # consistent with the order of t_param, dt_param, and gfu_0_list.
-        self.preconditioner_list = [self.model.construct_preconditioners(a) for a in self.a_list]
+        self.preconditioner_list = [self.model.construct_preconditioners(a, self.dt_param[0]) for a in self.a_list]
 
     def _load_and_apply_initial_conditions(self) -> None:
         self.gfu_0_list: List[ngs.GridFunction] = []
@@ -98,7 +115,8 @@ class TransientRKSolver(Solver):
     def _single_solve(self) -> None:
         # Have already assembled the weak form and set the boundary conditions for the first intermediate step.
         # Solve the first intermediate step.
-        self.model.solve_single_step(self.a_list[-1], self.L_list[-1], self.preconditioner_list[-1], self.gfu, self.scheme_order - 1)
+        a, L, preconditioner = self._stage_forms()
+        self.model.solve_single_step(a, L, preconditioner, self.gfu, self.scheme_order - 1)
 
         # Update self.gfu_0_list and self.step.
         self._update_intermediate_step()
@@ -111,7 +129,8 @@ class TransientRKSolver(Solver):
             self._re_assemble()
 
             # Solve the next intermediate step.
-            self.model.solve_single_step(self.a_list[-self.step], self.L_list[-self.step], self.preconditioner_list[-self.step], self.gfu, self.scheme_order - self.step)
+            a, L, preconditioner = self._stage_forms()
+            self.model.solve_single_step(a, L, preconditioner, self.gfu, self.scheme_order - self.step)
 
             # Update self.gfu_0_list and self.step.
             self._update_intermediate_step()
@@ -124,7 +143,8 @@ class TransientRKSolver(Solver):
         self._re_assemble()
 
         # Solve the time step.
-        self.model.linearized_solve(self.a_list[0], self.L_list[0], self.preconditioner_list[0], self.gfu, 0)
+        a, L, preconditioner = self._stage_forms()
+        self.model.solve_single_step(a, L, preconditioner, self.gfu, 0)
 
     def _update_time_step(self) -> Tuple[bool, float, float, str]:
         # Set all intermediate step solutions to the current solution. Set all dt values to the next dt (may vary to
@@ -148,6 +168,52 @@ class TransientRKSolver(Solver):
 
         return True, -1.0, -1.0, ''
 
+    def _stage_forms(self) -> Tuple[List[ngs.BilinearForm], List[ngs.LinearForm], List[Optional[Preconditioner]]]:
+        """
+        Function to get the weak forms and preconditioner(s) to solve the current intermediate step with.
+
+        Returns:
+            Tuple[List[BilinearForm], List[LinearForm], List[Optional[Preconditioner]]]:
+                - a: The bilinear forms, which may belong to an earlier intermediate step with the same operator.
+                - L: The linear forms of the current intermediate step.
+                - preconditioner: The preconditioners that go with the bilinear forms.
+        """
+        stage = len(self.a_list) - self.step
+        operator = self.stage_operator[stage]
+
+        return self.a_list[operator], self.L_list[stage], self.preconditioner_list[operator]
+
+    def _find_stage_operator(self, stage: int) -> bool:
+        """
+        Function to check whether the bilinear forms of an intermediate step, which have just been assembled, are
+        identical to those of an earlier intermediate step so they can share one assembled matrix, preconditioner, and
+        factorization.
+
+        The implicit stages of RK 222 and RK 232 all use the same diagonal coefficient, so for models whose bilinear
+        forms only depend on dt the stage operators are usually identical. Whether they actually are depends on how
+        the model splits its terms between the time coefficient and ODE bilinear forms, so the assembled matrices are
+        compared the first time each stage is assembled. The result stays valid for later time steps since the time
+        step sizes of all stages are scaled together.
+
+        Args:
+            stage: The index of the intermediate step in a_list.
+
+        Returns:
+            True if the intermediate step shares the operator of an earlier intermediate step, else False.
+        """
+        self.stage_operator_checked[stage] = True
+
+        # The intermediate steps are solved in reverse order of a_list, so the earlier ones have already been assembled
+        # with the current time step size.
+        for earlier_stage in range(len(self.a_list) - 1, stage, -1):
+            if self.stage_operator[earlier_stage] == earlier_stage and \
+                    all(assembled_forms_match(a_1, a_2)
+                        for a_1, a_2 in zip(self.a_list[stage], self.a_list[earlier_stage])):
+                self.stage_operator[stage] = earlier_stage
+                return True
+
+        return False
+
     def _update_intermediate_step(self) -> None:
         # Set the appropriate intermediate step solution to the current solution.
         self.gfu_0_list[-(self.step + 1)].vec.data = self.gfu.vec
@@ -54,11 +54,7 @@ class TransientMultiStepSolver(Solver):
         a, L = implicit_euler(self.model, self.gfu_0_list, self.dt_param)
 
         if self.model.preconditioners is not None:
-            preconditioners = self.model.construct_preconditioners(a)
-
-            for preconditioner in preconditioners:
-                if preconditioner is not None:
-                    preconditioner.Update()
+            preconditioners = self.model.construct_preconditioners(a, self.dt_param[0])
         else:
             preconditioners = []
 
@@ -73,8 +69,7 @@ class TransientMultiStepSolver(Solver):
                 L[i].Assemble()
 
             for preconditioner in preconditioners:
-                if preconditioner is not None:
-                    preconditioner.Update()
+                self.model.preconditioner_policy.update(preconditioner)
 
             self.model.solve_single_step(a, L, preconditioners, self.gfu)
 
@@ -101,6 +96,10 @@ class TransientMultiStepSolver(Solver):
             print('Starting up.')
             print('---')
 
+        # The startup preconditioners are not used again.
+        for preconditioner in preconditioners:
+            self.model.preconditioner_policy.untrack(preconditioner)
+
         # Now that the startup is over set the dt for the next time step to the original dt given in the config file.
         self.dt_param[0].Set(self.dt_param_init.Get())
 
@@ -108,26 +107,50 @@ class TransientMultiStepSolver(Solver):
         self.model.apply_dirichlet_bcs_to(self.gfu)
 
     def _create_linear_and_bilinear_forms(self) -> None:
+        # Only the linear forms refer to the previous solutions. Unless some of the model's expressions are re-parsed
+        # with the new model variable values every time step, a new time step only needs to rotate the ordering of the
+        # storage of the previous solutions and bind new linear forms to it.
+        self.rotate_history = self.scheme_order > 1 and not self.model.expressions_depend_on_model_variables()
+        self.a, self.L = self._time_integration_forms(self.gfu_0_list)
+
+    def _time_integration_forms(self, gfu_0_list: List[ngs.GridFunction], linear_only: bool = False) \
+            -> Tuple[List[ngs.BilinearForm], List[ngs.LinearForm]]:
+        """
+        Function to create the weak forms of the time integration scheme for one ordering of the previous solutions.
+
+        Args:
+            gfu_0_list: The previous solutions ordered from most recent to oldest.
+            linear_only: Only create the linear forms, the list of bilinear forms is empty.
+
+        Returns:
+            Tuple[List[BilinearForm], List[LinearForm]]:
+                - a: The bilinear forms.
+                - L: The linear forms.
+        """
         if self.scheme == 'explicit euler':
-            self.a, self.L = explicit_euler(self.model, self.gfu_0_list, self.dt_param)
+            return explicit_euler(self.model, gfu_0_list, self.dt_param, linear_only=linear_only)
         elif self.scheme == 'implicit euler':
-            self.a, self.L = implicit_euler(self.model, self.gfu_0_list, self.dt_param)
+            return implicit_euler(self.model, gfu_0_list, self.dt_param, linear_only=linear_only)
         elif self.scheme == 'crank nicolson':
-            self.a, self.L = crank_nicolson(self.model, self.gfu_0_list, self.dt_param)
+            return crank_nicolson(self.model, gfu_0_list, self.dt_param, linear_only=linear_only)
         elif self.scheme == 'euler IMEX':
-            self.a, self.L = euler_IMEX(self.model, self.gfu_0_list, self.dt_param)
+            return euler_IMEX(self.model, gfu_0_list, self.dt_param, linear_only=linear_only)
         elif self.scheme == 'CNLF':
-            self.a, self.L = CNLF(self.model, self.gfu_0_list, self.dt_param)
+            return CNLF(self.model, gfu_0_list, self.dt_param, linear_only=linear_only)
         elif self.scheme == 'SBDF':
-            self.a, self.L = SBDF(self.model, self.gfu_0_list, self.dt_param)
+            return SBDF(self.model, gfu_0_list, self.dt_param, linear_only=linear_only)
         else:
             raise ValueError('Have not implemented {} time integration yet.'.format(self.scheme))
 
     def _create_preconditioners(self) -> None:
-        self.preconditioners = self.model.construct_preconditioners(self.a)
+        self.preconditioners = self.model.construct_preconditioners(self.a, self.dt_param[0])
 
     def _load_and_apply_initial_conditions(self) -> None:
-        self.gfu_0_list: List[ngs.GridFunction] = []
+        # The storage of the previous solutions is used as a ring buffer. gfu_0_list orders it from the most recent to
+        # the oldest previous solution, starting at history_offset.
+        self.gfu_0_ring: List[ngs.GridFunction] = []
+        self.history_offset = 0
+        self.rotate_history = False
 
         for i in range(self.scheme_order):
             gfu_0 = self.model.construct_gfu()
@@ -135,7 +158,9 @@ class TransientMultiStepSolver(Solver):
                 i_gfu = self.model.model_components[component_name]
                 i_ic = self.model.model_components_ic[component_name]
                 gfu_0.components[i_gfu].vec.data = self.model.IC.components[i_ic].vec
-            self.gfu_0_list.append(gfu_0)
+            self.gfu_0_ring.append(gfu_0)
+
+        self.gfu_0_list = self._ordered_history(self.history_offset)
 
         # Update the values of the model variables based on the initial condition and re-parse the model functions as
         # necessary.
@@ -148,16 +173,8 @@ class TransientMultiStepSolver(Solver):
         self.model.solve_single_step(self.a, self.L, self.preconditioners, self.gfu)
 
     def _update_time_step(self) -> Tuple[bool, float, float, str]:
-        # Update all previous timestep solutions.
-        for i in range(1, self.scheme_order):
-            self.gfu_0_list[-i].vec.data = self.gfu_0_list[-(i + 1)].vec
-
-        # Update data in previous timestep with new solution
-        self.gfu_0_list[0].vec.data = self.gfu.vec
-
-        # Update the list of time step parameters.
-        for i in range(1, self.scheme_order + 1):
-            self.dt_param[-i].Set(self.dt_param[-(i + 1)].Get())
+        # Update all previous timestep solutions and the list of time step parameters.
+        self._advance_history()
 
         # Update the values of the model variables based on the previous timestep and re-parse the model functions as
         # necessary.
@@ -167,3 +184,56 @@ class TransientMultiStepSolver(Solver):
         self.dt_param[0].Set(min(self.dt_param_init.Get(), self._dt_for_next_time_to_hit()))
 
         return True, -1.0, -1.0, ''
+
+    def _ordered_history(self, offset: int) -> List[ngs.GridFunction]:
+        """
+        Function to order the storage of the previous solutions from the most recent to the oldest previous solution.
+
+        Args:
+            offset: The index in the storage of the most recent previous solution.
+
+        Returns:
+            The previous solutions ordered from most recent to oldest.
+        """
+        return self.gfu_0_ring[offset:] + self.gfu_0_ring[:offset]
+
+    def _history_slot(self, time_level: int) -> int:
+        """
+        Function to get where a previous solution is kept in the storage of the previous solutions.
+
+        Args:
+            time_level: The index of the previous solution in gfu_0_list (0 for the most recent).
+
+        Returns:
+            The index of the previous solution in gfu_0_ring.
+        """
+        return (self.history_offset + time_level) % self.scheme_order
+
+    def _advance_history(self) -> None:
+        """
+        Function to make the just solved time step the most recent previous solution and shift the time step sizes.
+
+        If the weak forms exist for every ordering of the storage of the previous solutions, the storage of the oldest
+        previous solution is reused for the new one and the ordering is rotated. Otherwise every previous solution is
+        copied back one time level.
+        """
+        if self.rotate_history:
+            self.history_offset = self._history_slot(-1)
+            self.gfu_0_list = self._ordered_history(self.history_offset)
+            self._select_history_forms()
+        else:
+            for i in range(1, self.scheme_order):
+                self.gfu_0_list[-i].vec.data = self.gfu_0_list[-(i + 1)].vec
+
+        self.gfu_0_list[0].vec.data = self.gfu.vec
+
+        # The time step sizes are parameters in the weak forms, they are cheap to shift.
+        for i in range(1, self.scheme_order + 1):
+            self.dt_param[-i].Set(self.dt_param[-(i + 1)].Get())
+
+    def _select_history_forms(self) -> None:
+        """
+        Function to bind new linear forms to the current ordering of the previous solutions. The bilinear forms don't
+        refer to the previous solutions and are kept.
+        """
+        self.L = self._time_integration_forms(self.gfu_0_list, linear_only=True)[1]
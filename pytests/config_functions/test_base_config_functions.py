@@ -19,6 +19,7 @@ import pytest
 from opencmp.config_functions import ConfigParser,ConfigFunctions
 import os
 import ngsolve as ngs
+from netgen.geom2d import unit_square
 
 
 class TestInitialization:
@@ -112,4 +113,35 @@ class TestFindRelPathForFile:
 
 class TestReParse:
     """ Class to test ConfigFunction.re_parse. """
-    # TODO:
+
+    def test_1(self):
+        """ Check that an expression is only re-parsed when the model variables it uses are replaced. """
+        test_config_functions = ConfigFunctions('pytests/config_functions/example_config', 'import_functions.py', None,
+                                                ngs.Parameter(1.5))
+        t_param = [ngs.Parameter(1.5), ngs.Parameter(1.0)]
+        mesh = ngs.Mesh(unit_square.GenerateMesh(maxh=0.5))
+        u_0 = ngs.GridFunction(ngs.L2(mesh))
+        u_1 = ngs.GridFunction(ngs.L2(mesh))
+        param_dict = {'a': None}
+
+        test_config_functions.re_parse(param_dict, {'a': 'u*t'}, t_param, [{'u': u_0}, {'u': u_1}], mesh)
+        val = param_dict['a']
+        assert len(val) == 2
+        assert test_config_functions.re_parses == 1
+        assert test_config_functions.re_parse_hits == 0
+
+        # The same objects give the same coefficientfunctions, which follow any change of their values.
+        test_config_functions.re_parse(param_dict, {'a': 'u*t'}, t_param, [{'u': u_0}, {'u': u_1}], mesh)
+        assert all(item is cached_item for item, cached_item in zip(param_dict['a'], val))
+        assert test_config_functions.re_parses == 1
+        assert test_config_functions.re_parse_hits == 1
+
+        # A new object for a model variable requires a new coefficientfunction.
+        test_config_functions.re_parse(param_dict, {'a': 'u*t'}, t_param, [{'u': u_1}, {'u': u_0}], mesh)
+        assert param_dict['a'][0] is not val[0]
+        assert test_config_functions.re_parses == 2
+        assert test_config_functions.re_parse_hits == 1
+
+        test_config_functions.reset_re_parse_counters()
+        assert test_config_functions.re_parses == 0
+        assert test_config_functions.re_parse_hits == 0
@@ -0,0 +1,82 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+from opencmp.config_functions import BCFunctions
+import ngsolve as ngs
+from ngsolve import Mesh
+
+
+class TestSetDirichletBoundaryConditions:
+    """ Class to test BCFunctions.set_dirichlet_boundary_conditions. """
+
+    def test_1(self):
+        """ Check that time-independent Dirichlet BCs are only built once. """
+        mesh = Mesh('pytests/mesh_files/unit_square_coarse.vol')
+        t_param = [ngs.Parameter(0.1), ngs.Parameter(0.0)]
+        fes = ngs.H1(mesh, order=2, dirichlet='left|right')
+        test_bc_functions = BCFunctions('pytests/full_system/poisson/transient_coarse/bc_dir/bc_config',
+                                        'import_functions.py', mesh, ['dirichlet', 'neumann', 'robin'], t_param)
+        BC, dirichlet_names = test_bc_functions.set_boundary_conditions(['dirichlet', 'neumann', 'robin'])
+
+        g_D = test_bc_functions.set_dirichlet_boundary_conditions(BC, mesh, [fes.TrialFunction()], {'u': 0})
+        assert len(g_D['u']) == 2
+        assert test_bc_functions.dirichlet_time_independent['u']
+
+        # Nothing changed, so the same coefficientfunctions are returned.
+        g_D_2 = test_bc_functions.set_dirichlet_boundary_conditions(BC, mesh, [fes.TrialFunction()], {'u': 0})
+        assert g_D_2['u'] is g_D['u']
+
+        # New BC values require new coefficientfunctions.
+        BC['dirichlet']['u']['left'] = [1.0, 1.0]
+        g_D_3 = test_bc_functions.set_dirichlet_boundary_conditions(BC, mesh, [fes.TrialFunction()], {'u': 0})
+        assert g_D_3['u'] is not g_D['u']
+        assert test_bc_functions.dirichlet_time_independent['u']
+
+    def test_2(self):
+        """ Check that time-dependent Dirichlet BCs are recognized as such. """
+        mesh = Mesh('pytests/mesh_files/unit_square_coarse.vol')
+        t_param = [ngs.Parameter(0.1), ngs.Parameter(0.0)]
+        fes = ngs.VectorH1(mesh, order=2, dirichlet='left|right|top|bottom')
+        test_bc_functions = BCFunctions('pytests/full_system/ins/sinusoidal_transient/bc_dir/bc_config',
+                                        'import_functions.py', mesh, ['dirichlet', 'stress'], t_param)
+        BC, dirichlet_names = test_bc_functions.set_boundary_conditions(['dirichlet', 'stress'])
+
+        g_D = test_bc_functions.set_dirichlet_boundary_conditions(BC, mesh, [fes.TrialFunction()], {'u': 0})
+        assert len(g_D['u']) == 2
+        assert not test_bc_functions.dirichlet_time_independent['u']
+
+        g_D_2 = test_bc_functions.set_dirichlet_boundary_conditions(BC, mesh, [fes.TrialFunction()], {'u': 0})
+        assert g_D_2['u'] is g_D['u']
+
+    def test_3(self):
+        """
+        Check that Dirichlet BCs that only depend on space are time-independent and that BC values replaced after
+        parsing (ex: by a controller) are not assumed to be.
+        """
+        mesh = Mesh('pytests/mesh_files/unit_square_coarse.vol')
+        t_param = [ngs.Parameter(0.1), ngs.Parameter(0.0)]
+        fes = ngs.H1(mesh, order=2, dirichlet='left|right')
+        test_bc_functions = BCFunctions('pytests/full_system/poisson/h_convergence/bc_dir/bc_config',
+                                        'import_functions.py', mesh, ['dirichlet', 'neumann', 'robin'], t_param)
+        BC, dirichlet_names = test_bc_functions.set_boundary_conditions(['dirichlet', 'neumann', 'robin'])
+
+        test_bc_functions.set_dirichlet_boundary_conditions(BC, mesh, [fes.TrialFunction()], {'u': 0})
+        assert test_bc_functions.dirichlet_time_independent['u']
+
+        BC['dirichlet']['u']['left'] = [ngs.CoefficientFunction(1.0 - ngs.exp(-t)) for t in t_param]
+        test_bc_functions.set_dirichlet_boundary_conditions(BC, mesh, [fes.TrialFunction()], {'u': 0})
+        assert not test_bc_functions.dirichlet_time_independent['u']
@@ -0,0 +1,101 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+import json
+
+from opencmp.config_functions import parse_arithmetic
+from opencmp.config_functions.load_config import parse_str
+import ngsolve as ngs
+from netgen.geom2d import unit_square
+
+
+class TestParsedExpressions:
+    """ Class to test storing parsed expressions on disk. """
+
+    def test_1(self, tmp_path, monkeypatch):
+        """ Check that stored parsed expressions are loaded back the way they were parsed. """
+        monkeypatch.setattr(parse_arithmetic, '_parsed_expressions', {})
+        monkeypatch.setattr(parse_arithmetic, '_stored_expressions', set())
+        monkeypatch.setattr(parse_arithmetic, '_used_expressions', set())
+
+        parse_str('sin(x)*exp(-2*t)', '.', [ngs.Parameter(0.0)])
+        expr_stack = parse_arithmetic._parsed_expressions['sin(x)*exp(-2*t)']
+        assert parse_arithmetic.save_parsed_expressions(str(tmp_path)) == 1
+
+        # Nothing new to store.
+        assert parse_arithmetic.save_parsed_expressions(str(tmp_path)) == 0
+
+        monkeypatch.setattr(parse_arithmetic, '_parsed_expressions', {})
+        monkeypatch.setattr(parse_arithmetic, '_stored_expressions', set())
+        assert parse_arithmetic.load_parsed_expressions(str(tmp_path)) == 1
+        assert parse_arithmetic._parsed_expressions['sin(x)*exp(-2*t)'] == expr_stack
+
+    def test_2(self, tmp_path):
+        """ Check that nothing is loaded if no parsed expressions have been stored. """
+        assert parse_arithmetic.load_parsed_expressions(str(tmp_path)) == 0
+
+    def test_3(self, tmp_path, monkeypatch):
+        """ Check that a file that doesn't hold parsed expressions is ignored. """
+        monkeypatch.setattr(parse_arithmetic, '_parsed_expressions', {})
+        monkeypatch.setattr(parse_arithmetic, '_stored_expressions', set())
+        file_name = parse_arithmetic._parsed_expressions_file(str(tmp_path))
+
+        for contents in ['[["x"]]', '{"x": 1.0}', '{"x": [1.0]}', '"x"']:
+            with open(file_name, 'w') as f:
+                f.write(contents)
+            assert parse_arithmetic.load_parsed_expressions(str(tmp_path)) == 0
+            assert parse_arithmetic._parsed_expressions == {}
+
+    def test_4(self, tmp_path, monkeypatch):
+        """ Check that the least recently stored parsed expressions are dropped once the file is full. """
+        monkeypatch.setattr(parse_arithmetic, '_parsed_expressions', {})
+        monkeypatch.setattr(parse_arithmetic, '_stored_expressions', set())
+        monkeypatch.setattr(parse_arithmetic, '_used_expressions', set())
+        monkeypatch.setattr(parse_arithmetic, '_MAX_STORED_EXPRESSIONS', 3)
+        file_name = parse_arithmetic._parsed_expressions_file(str(tmp_path))
+
+        # Parsed expressions stored by other runs.
+        with open(file_name, 'w') as f:
+            json.dump({'x': ['x'], 'y': ['y'], 'z': ['z']}, f)
+        assert parse_arithmetic.load_parsed_expressions(str(tmp_path)) == 3
+
+        parse_str('z', '.', None)
+        parse_str('sin(x)', '.', None)
+        assert parse_arithmetic.save_parsed_expressions(str(tmp_path)) == 1
+
+        with open(file_name, 'r') as f:
+            assert set(json.load(f).keys()) == {'y', 'z', 'sin(x)'}
+
+
+class TestImportFunctions:
+    """ Class to test importing Python functions from the main run directory. """
+
+    def test_1(self, tmp_path):
+        """ Check that the file of Python functions is imported again after it changes. """
+        mesh = ngs.Mesh(unit_square.GenerateMesh(maxh=0.5))
+        t_param = [ngs.Parameter(0.0)]
+
+        with open(tmp_path / 'import_functions.py', 'w') as f:
+            f.write('def value(t_param, new_variables, mesh, time_step):\n    return 1.0\n')
+        val, variable_eval = parse_str('IMPORT(value)', str(tmp_path), t_param, mesh=mesh)
+        assert val == [1.0]
+        assert callable(variable_eval)
+
+        with open(tmp_path / 'import_functions.py', 'w') as f:
+            f.write('def value(t_param, new_variables, mesh, time_step):\n    return 2.0\n')
+        val, variable_eval = parse_str('IMPORT(value)', str(tmp_path), t_param, mesh=mesh)
+        assert val == [2.0]
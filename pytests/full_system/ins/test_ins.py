@@ -16,9 +16,12 @@
 ########################################################################################################################
 
 import pytest
-from pytest import CaptureFixture, fixture
+import logging
+import re
+from pytest import CaptureFixture, LogCaptureFixture, fixture
 from opencmp.helpers.testing import automated_output_check
 from opencmp.config_functions import ConfigParser
+from opencmp.run import get_model_class, get_solver_class
 
 
 @fixture
@@ -61,6 +64,47 @@ class TestStationary:
         # Run
         automated_output_check(capsys, pipe_velocity_flow, [2e-7, 5e-8, 1.5e-4, 3.5e-5])
 
+    def test_pipe_flow_velocity_newton_cg(self, capsys: CaptureFixture, pipe_velocity_flow: ConfigParser) -> None:
+        # Use continuous elements
+        pipe_velocity_flow['DG']['DG'] = 'False'
+        # Change linearization method
+        pipe_velocity_flow['SOLVER']['linearization_method'] = 'Newton'
+        # Run
+        automated_output_check(capsys, pipe_velocity_flow, [2e-7, 5e-8, 1.1e-4, 3e-5])
+
+    def test_pipe_flow_velocity_newton_convergence_cg(self, caplog: LogCaptureFixture,
+                                                      pipe_velocity_flow: ConfigParser) -> None:
+        # Use continuous elements
+        pipe_velocity_flow['DG']['DG'] = 'False'
+        pipe_velocity_flow['ERROR ANALYSIS']['check_error'] = 'False'
+
+        # Solve with both linearizations and record the error of each nonlinear iteration
+        errors = {}
+        for linearization in ['Oseen', 'Newton']:
+            pipe_velocity_flow['SOLVER']['linearization_method'] = linearization
+            caplog.clear()
+            with caplog.at_level(logging.INFO):
+                solver = get_solver_class(pipe_velocity_flow)(get_model_class('INS', False), pipe_velocity_flow)
+                solver.solve()
+            errors[linearization] = [float(match.group(1)) for match in
+                                     (re.match(r'Nonlinear iteration \d+ with error: (\S+)', msg)
+                                      for msg in caplog.messages) if match]
+            assert len(errors[linearization]) == solver.num_iterations
+
+        # Newton needs far fewer iterations than the Oseen linearization and converges quadratically once close to the
+        # solution, until the integrated error reaches round-off
+        assert 2 * len(errors['Newton']) <= len(errors['Oseen'])
+        assert errors['Newton'][-1] < 10.0 * errors['Newton'][-2] ** 2 + 1e-10
+        assert errors['Newton'][-2] < 1e-3 * errors['Newton'][-3]
+
+    def test_pipe_flow_velocity_jfnk_cg(self, capsys: CaptureFixture, pipe_velocity_flow: ConfigParser) -> None:
+        # Use continuous elements
+        pipe_velocity_flow['DG']['DG'] = 'False'
+        # Solve with Jacobian-free Newton-Krylov
+        pipe_velocity_flow['SOLVER']['nonlinear_solver'] = 'JFNK'
+        # Run
+        automated_output_check(capsys, pipe_velocity_flow, [2e-7, 5e-8, 1.1e-4, 3e-5])
+
     def test_pipe_flow_velocity_dg(self, capsys: CaptureFixture, pipe_velocity_flow: ConfigParser) -> None:
         # Change from CG to DG
         pipe_velocity_flow['DG']['DG'] = 'True'
@@ -69,6 +113,15 @@ class TestStationary:
         # Run
         automated_output_check(capsys, pipe_velocity_flow, [2e-7, 5e-8, 4.5e-7, 2e-12])
 
+    def test_pipe_flow_velocity_hdg(self, capsys: CaptureFixture, pipe_velocity_flow: ConfigParser) -> None:
+        # Change from CG to HDG
+        pipe_velocity_flow['DG']['DG'] = 'True'
+        pipe_velocity_flow['DG']['HDG'] = 'True'
+        # Change elements
+        pipe_velocity_flow['FINITE ELEMENT SPACE']['elements'] = 'u -> HDiv\np -> L2'
+        # Run
+        automated_output_check(capsys, pipe_velocity_flow, [2e-7, 5e-8, 4.5e-7, 2e-12])
+
 
 class TestTransient:
     def test_sinusoidal_oseen_implicit_euler_cg(self, capsys: CaptureFixture,
@@ -76,6 +129,27 @@ class TestTransient:
         # Run
         automated_output_check(capsys, sinusoidal_transient, [1e-4, 2e-3])
 
+    def test_sinusoidal_oseen_implicit_euler_compiled_cg(self, capsys: CaptureFixture,
+                                                         sinusoidal_transient: ConfigParser) -> None:
+        # Compile the BC expressions
+        sinusoidal_transient['OTHER']['compile_expressions'] = 'True'
+        # Run
+        automated_output_check(capsys, sinusoidal_transient, [1e-4, 2e-3])
+
+    def test_sinusoidal_oseen_implicit_euler_predictor_cg(self, capsys: CaptureFixture,
+                                                          sinusoidal_transient: ConfigParser) -> None:
+        # Linearize around the linear extrapolation of the previous time steps
+        sinusoidal_transient['TRANSIENT']['predictor_order'] = '1'
+        # Run
+        automated_output_check(capsys, sinusoidal_transient, [1e-4, 2e-3])
+
+    def test_sinusoidal_newton_implicit_euler_cg(self, capsys: CaptureFixture,
+                                                 sinusoidal_transient: ConfigParser) -> None:
+        # Change linearization method
+        sinusoidal_transient['SOLVER']['linearization_method'] = 'Newton'
+        # Run
+        automated_output_check(capsys, sinusoidal_transient, [1e-4, 2e-3])
+
     @pytest.mark.slow
     def test_sinusoidal_oseen_implicit_euler_dg(self, capsys: CaptureFixture,
                                                 sinusoidal_transient: ConfigParser) -> None:
@@ -86,6 +160,47 @@ class TestTransient:
         # Run
         automated_output_check(capsys, sinusoidal_transient, [1e-4, 5e-11])
 
+    def test_sinusoidal_oseen_implicit_euler_inexact_cg(self, capsys: CaptureFixture,
+                                                        sinusoidal_transient: ConfigParser) -> None:
+        # Solve each Oseen iteration only as accurately as the Picard iteration needs
+        sinusoidal_transient['SOLVER']['linear_solver'] = 'GMRes'
+        sinusoidal_transient['SOLVER']['preconditioner'] = 'block triangular'
+        sinusoidal_transient['SOLVER']['linear_tolerance'] = '1e-6'
+        sinusoidal_transient['SOLVER']['linear_max_iterations'] = '300'
+        sinusoidal_transient['SOLVER']['adaptive_linear_tolerance'] = 'True'
+        # Run
+        automated_output_check(capsys, sinusoidal_transient, [1e-4, 2e-3])
+
+    def test_sinusoidal_oseen_implicit_euler_lagged_preconditioner_cg(self, capsys: CaptureFixture,
+                                                                      sinusoidal_transient: ConfigParser) -> None:
+        # Reuse the preconditioner until the number of GMRes iterations grows
+        sinusoidal_transient['SOLVER']['linear_solver'] = 'GMRes'
+        sinusoidal_transient['SOLVER']['preconditioner'] = 'direct'
+        sinusoidal_transient['SOLVER']['linear_tolerance'] = '1e-8'
+        sinusoidal_transient['SOLVER']['linear_max_iterations'] = '300'
+        sinusoidal_transient['SOLVER']['preconditioner_update_interval'] = '0'
+        sinusoidal_transient['SOLVER']['preconditioner_iteration_growth'] = '1.5'
+        # Run
+        automated_output_check(capsys, sinusoidal_transient, [1e-4, 2e-3])
+
+    def test_sinusoidal_oseen_implicit_euler_anderson_cg(self, capsys: CaptureFixture,
+                                                         sinusoidal_transient: ConfigParser) -> None:
+        # Mix the Oseen iterations of each time step with Anderson mixing
+        sinusoidal_transient['SOLVER']['nonlinear_solver'] = 'Anderson'
+        sinusoidal_transient['SOLVER']['anderson_vectors'] = '3'
+        # Run
+        automated_output_check(capsys, sinusoidal_transient, [1e-4, 2e-3])
+
+    def test_sinusoidal_oseen_implicit_euler_hdg(self, capsys: CaptureFixture,
+                                                 sinusoidal_transient: ConfigParser) -> None:
+        # Change from CG to HDG
+        sinusoidal_transient['DG']['DG'] = 'True'
+        sinusoidal_transient['DG']['HDG'] = 'True'
+        # Change elements
+        sinusoidal_transient['FINITE ELEMENT SPACE']['elements'] = 'u -> HDiv\np -> L2'
+        # Run
+        automated_output_check(capsys, sinusoidal_transient, [1e-4, 5e-11])
+
     def test_sinusoidal_oseen_crank_nicolson_cg(self, capsys: CaptureFixture,
                                                 sinusoidal_transient: ConfigParser) -> None:
         # Change time discretization scheme
@@ -124,6 +239,20 @@ class TestTransient:
         # Run
         automated_output_check(capsys, sinusoidal_transient, [2.5e-3, 1e-3])
 
+    def test_sinusoidal_oseen_adaptive_bdf2_cg(self, capsys: CaptureFixture,
+                                               sinusoidal_transient: ConfigParser) -> None:
+        # Change the time integration scheme
+        sinusoidal_transient['TRANSIENT']['scheme'] = 'adaptive BDF2'
+        # Run
+        automated_output_check(capsys, sinusoidal_transient, [1e-4, 2e-3])
+
+    def test_sinusoidal_oseen_adaptive_esdirk_cg(self, capsys: CaptureFixture,
+                                                 sinusoidal_transient: ConfigParser) -> None:
+        # Change the time integration scheme
+        sinusoidal_transient['TRANSIENT']['scheme'] = 'adaptive ESDIRK'
+        # Run
+        automated_output_check(capsys, sinusoidal_transient, [1e-4, 2e-3])
+
     # @pytest.mark.slow
     #def test_sinusoidal_oseen_adaptive_three_step_cg(self, capsys: CaptureFixture,
     #                                                sinusoidal_transient: ConfigParser) -> None:
@@ -160,6 +160,15 @@ class TestDiffusion:
         expected_errors = [4e-9, 4e-9, 3e-16]
         automated_output_check(capsys, diffusion, expected_errors)
 
+    def test_rk_222_cg(self, capsys: CaptureFixture, diffusion: ConfigParser) -> None:
+        # Change liniearization scheme
+        diffusion['SOLVER']['linearization_method'] = 'IMEX'
+        # Change time discretization
+        diffusion['TRANSIENT']['scheme'] = 'RK 222'
+        # Run
+        expected_errors = [5e-11, 5e-11, 4e-16]
+        automated_output_check(capsys, diffusion, expected_errors)
+
     # def test_imex_euler_dg(self, capsys: CaptureFixture, diffusion: ConfigParser) -> None:
     #     # Change from CG to DG
     #     diffusion['DG']['DG'] = 'True'
@@ -682,6 +691,13 @@ class TestPureConvection:
         expected_errors = [1e-8]
         automated_output_check(capsys, purely_convective, expected_errors)
 
+    def test_implicit_euler_hdg(self, capsys: CaptureFixture, purely_convective: ConfigParser) -> None:
+        # Hybridize the DG discretization
+        purely_convective['DG']['HDG'] = 'True'
+        # Run
+        expected_errors = [1e-11]
+        automated_output_check(capsys, purely_convective, expected_errors)
+
     def test_crank_nicolson_dg(self, capsys: CaptureFixture, purely_convective: ConfigParser) -> None:
         # Change time discretization
         purely_convective['TRANSIENT']['scheme'] = 'crank nicolson'
@@ -15,9 +15,12 @@
 # <https://www.gnu.org/licenses/>.                                                                                     #
 ########################################################################################################################
 
-from pytest import CaptureFixture, fixture
-from opencmp.helpers.testing import automated_output_check, manual_output_check
+import shutil
+from pathlib import Path
+from pytest import CaptureFixture, fixture, importorskip, mark
+from opencmp.helpers.testing import automated_output_check, manual_output_check, run_example
 from opencmp.config_functions import ConfigParser
+from opencmp.run import get_model_class, get_solver_class
 
 
 @fixture
@@ -85,6 +88,61 @@ class TestTransient:
         # Run
         automated_output_check(capsys, square_coarse_transient, [9e-6])
 
+    def test_implicit_euler_split_bilinear_forms_cg(self, capsys: CaptureFixture,
+                                                    square_coarse_transient: ConfigParser) -> None:
+        # Change scheme
+        square_coarse_transient['TRANSIENT']['scheme'] = 'implicit euler'
+        # Assemble the bilinear form once from its constant and dt-proportional parts
+        square_coarse_transient['SOLVER']['split_bilinear_forms'] = 'True'
+        # Run
+        automated_output_check(capsys, square_coarse_transient, [9e-6])
+
+    def test_implicit_euler_static_condensation_cg(self, capsys: CaptureFixture,
+                                                   square_coarse_transient: ConfigParser) -> None:
+        # Change scheme
+        square_coarse_transient['TRANSIENT']['scheme'] = 'implicit euler'
+        # Use a high enough order to have element-interior DOFs and condense them out
+        square_coarse_transient['FINITE ELEMENT SPACE']['interpolant_order'] = '4'
+        square_coarse_transient['SOLVER']['static_condensation'] = 'True'
+        # Run
+        automated_output_check(capsys, square_coarse_transient, [9e-6])
+
+    def test_implicit_euler_static_condensation_iterative_cg(self, capsys: CaptureFixture,
+                                                             square_coarse_transient: ConfigParser) -> None:
+        # Change scheme
+        square_coarse_transient['TRANSIENT']['scheme'] = 'implicit euler'
+        # Solve the condensed system with preconditioned CG
+        square_coarse_transient['FINITE ELEMENT SPACE']['interpolant_order'] = '4'
+        square_coarse_transient['SOLVER']['static_condensation'] = 'True'
+        square_coarse_transient['SOLVER']['linear_solver'] = 'CG'
+        square_coarse_transient['SOLVER']['preconditioner'] = 'bddc'
+        square_coarse_transient['SOLVER']['linear_tolerance'] = '1e-12'
+        # Run
+        automated_output_check(capsys, square_coarse_transient, [9e-6])
+
+    def test_implicit_euler_amg_cg(self, capsys: CaptureFixture, square_coarse_transient: ConfigParser) -> None:
+        importorskip('pyamg')
+        # Change scheme
+        square_coarse_transient['TRANSIENT']['scheme'] = 'implicit euler'
+        # Solve with CG preconditioned by algebraic multigrid
+        square_coarse_transient['SOLVER']['linear_solver'] = 'CG'
+        square_coarse_transient['SOLVER']['preconditioner'] = 'amg'
+        square_coarse_transient['SOLVER']['linear_tolerance'] = '1e-12'
+        # Run
+        automated_output_check(capsys, square_coarse_transient, [9e-6])
+
+    def test_implicit_euler_steady_state_cg(self, capsys: CaptureFixture,
+                                            square_coarse_transient: ConfigParser) -> None:
+        # Change scheme
+        square_coarse_transient['TRANSIENT']['scheme'] = 'implicit euler'
+        # End the run once the solution has nearly decayed to zero
+        square_coarse_transient['TRANSIENT']['steady_state_tolerance'] = 'absolute -> 1e-3'
+        # Run
+        run_example(square_coarse_transient)
+        captured = capsys.readouterr()
+        steady_state_time = float(captured.out.split('Steady state reached at t = ')[1].split('.\n')[0])
+        assert 0.5 < steady_state_time < 1.0
+
     def test_crank_nicolson_dg(self, capsys: CaptureFixture, square_coarse_transient: ConfigParser) -> None:
         # Change scheme
         square_coarse_transient['TRANSIENT']['scheme'] = 'crank nicolson'
@@ -120,3 +178,70 @@ class TestTransient:
         square_coarse_transient['DG']['DG'] = 'True'
         # Run
         automated_output_check(capsys, square_coarse_transient, [9e-6])
+
+    def test_bdf2_adaptive_cg(self, capsys: CaptureFixture, square_coarse_transient: ConfigParser) -> None:
+        # Change scheme
+        square_coarse_transient['TRANSIENT']['scheme'] = 'adaptive BDF2'
+        # Run
+        automated_output_check(capsys, square_coarse_transient, [9e-6])
+
+    def test_bdf2_adaptive_dg(self, capsys: CaptureFixture, square_coarse_transient: ConfigParser) -> None:
+        # Change scheme
+        square_coarse_transient['TRANSIENT']['scheme'] = 'adaptive BDF2'
+        # Change from CG to DG
+        square_coarse_transient['DG']['DG'] = 'True'
+        # Run
+        automated_output_check(capsys, square_coarse_transient, [9e-6])
+
+    def test_bdf3_adaptive_cg(self, capsys: CaptureFixture, square_coarse_transient: ConfigParser) -> None:
+        # Change scheme and the gains of the time step controller
+        square_coarse_transient['TRANSIENT']['scheme'] = 'adaptive BDF3'
+        square_coarse_transient['TRANSIENT']['dt_controller_gains'] = '0.6, 0.2'
+        # Run
+        automated_output_check(capsys, square_coarse_transient, [9e-6])
+
+    def test_esdirk_adaptive_cg(self, capsys: CaptureFixture, square_coarse_transient: ConfigParser) -> None:
+        # Change scheme
+        square_coarse_transient['TRANSIENT']['scheme'] = 'adaptive ESDIRK'
+        # Run
+        automated_output_check(capsys, square_coarse_transient, [9e-6])
+
+    def test_esdirk_adaptive_dg(self, capsys: CaptureFixture, square_coarse_transient: ConfigParser) -> None:
+        # Change scheme
+        square_coarse_transient['TRANSIENT']['scheme'] = 'adaptive ESDIRK'
+        # Change from CG to DG
+        square_coarse_transient['DG']['DG'] = 'True'
+        # Run
+        automated_output_check(capsys, square_coarse_transient, [9e-6])
+
+    def test_bdf2_adaptive_dt_ladder_cg(self, capsys: CaptureFixture, square_coarse_transient: ConfigParser) -> None:
+        # Change scheme
+        square_coarse_transient['TRANSIENT']['scheme'] = 'adaptive BDF2'
+        # Restrict dt to a ladder and keep the factorizations of several time step sizes
+        square_coarse_transient['TRANSIENT']['dt_ladder_steps'] = '4'
+        square_coarse_transient['SOLVER']['factorization_cache_size'] = '8'
+        # Run
+        automated_output_check(capsys, square_coarse_transient, [9e-6])
+
+
+class TestTimeInvariance:
+    @mark.parametrize('robin, time_invariant', [('[2.0, 0.0]', True),
+                                                ('[1.0 + x, 0.0]', True),
+                                                ('[1.0 + t, 0.0]', False)])
+    def test_robin_coefficient(self, tmp_path: Path, square_coarse_transient: ConfigParser, robin: str,
+                               time_invariant: bool) -> None:
+        """ Check that the factorization is only reused if the Robin BC coefficient doesn't depend on time. """
+        run_dir = tmp_path / 'transient_coarse'
+        shutil.copytree('pytests/full_system/poisson/transient_coarse', run_dir)
+        with open(run_dir / 'bc_dir' / 'bc_config', 'w') as f:
+            f.write('[DIRICHLET]\nu = left -> 0.0\n    right -> 0.0\n\n[NEUMANN]\nu = bottom -> 0.0\n\n'
+                    '[ROBIN]\nu = top -> {}\n'.format(robin))
+
+        square_coarse_transient['OTHER']['run_dir'] = str(run_dir)
+        square_coarse_transient['TRANSIENT']['scheme'] = 'implicit euler'
+        square_coarse_transient['SOLVER']['split_bilinear_forms'] = 'True'
+        solver = get_solver_class(square_coarse_transient)(get_model_class('Poisson', False), square_coarse_transient)
+
+        assert solver.model.bilinear_form_is_time_invariant() == time_invariant
+        assert solver.model.factorization_cache.enabled == time_invariant
+        assert solver.split_assembly.enabled == time_invariant
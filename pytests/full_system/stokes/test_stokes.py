@@ -15,9 +15,12 @@
 # <https://www.gnu.org/licenses/>.                                                                                     #
 ########################################################################################################################
 
-from pytest import CaptureFixture, fixture
+from pathlib import Path
+from pytest import CaptureFixture, fixture, mark
+from netgen.geom2d import SplineGeometry
 from opencmp.helpers.testing import automated_output_check
 from opencmp.config_functions import ConfigParser
+from opencmp.run import get_model_class, get_solver_class
 
 
 @fixture
@@ -43,3 +46,57 @@ class TestStationary:
         pipe_unstructured_stationary['FINITE ELEMENT SPACE']['elements'] = 'u -> HDiv\np -> L2'
         # Run
         automated_output_check(capsys, pipe_unstructured_stationary, [1e-10, 6e-12, 3e-11, 2e-12, 1e-11, 2e-11, 3e-10])
+
+    def test_stationary_block_diagonal_cg(self, capsys: CaptureFixture, pipe_unstructured_stationary: ConfigParser) -> None:
+        # Use MinRes with the block diagonal saddle point preconditioner
+        pipe_unstructured_stationary['SOLVER']['linear_solver'] = 'MinRes'
+        pipe_unstructured_stationary['SOLVER']['preconditioner'] = 'block diagonal'
+        pipe_unstructured_stationary['SOLVER']['linear_tolerance'] = '1e-14'
+        pipe_unstructured_stationary['SOLVER']['linear_max_iterations'] = '1000'
+        # Run
+        automated_output_check(capsys, pipe_unstructured_stationary, [1e-10, 6e-12, 3e-11, 2e-12, 6e-10, 2e-11, 3e-10])
+
+    def test_stationary_block_triangular_dg(self, capsys: CaptureFixture,
+                                            pipe_unstructured_stationary: ConfigParser) -> None:
+        # Change from CG to DG
+        pipe_unstructured_stationary['DG']['DG'] = 'True'
+        # Change function spaces
+        pipe_unstructured_stationary['FINITE ELEMENT SPACE']['elements'] = 'u -> HDiv\np -> L2'
+        # Use GMRes with the block triangular saddle point preconditioner
+        pipe_unstructured_stationary['SOLVER']['linear_solver'] = 'GMRes'
+        pipe_unstructured_stationary['SOLVER']['preconditioner'] = 'block triangular'
+        pipe_unstructured_stationary['SOLVER']['linear_tolerance'] = '1e-14'
+        pipe_unstructured_stationary['SOLVER']['linear_max_iterations'] = '1000'
+        # Run
+        automated_output_check(capsys, pipe_unstructured_stationary, [1e-10, 6e-12, 3e-11, 2e-12, 1e-11, 2e-11, 3e-10])
+
+
+class TestBlockPreconditioners:
+    @mark.parametrize('linear_solver, preconditioner', [('MinRes', 'block diagonal'), ('GMRes', 'block triangular')])
+    def test_mesh_independence(self, tmp_path: Path, pipe_unstructured_stationary: ConfigParser, linear_solver: str,
+                               preconditioner: str) -> None:
+        pipe_unstructured_stationary['SOLVER']['linear_solver'] = linear_solver
+        pipe_unstructured_stationary['SOLVER']['preconditioner'] = preconditioner
+        pipe_unstructured_stationary['SOLVER']['linear_tolerance'] = '1e-8'
+        pipe_unstructured_stationary['SOLVER']['linear_max_iterations'] = '1000'
+        pipe_unstructured_stationary['ERROR ANALYSIS']['check_error'] = 'False'
+
+        # Solve on a unit square with the same BCs as the pipe, halving the mesh size each time.
+        iterations = []
+        for maxh in [0.2, 0.1, 0.05]:
+            geo = SplineGeometry()
+            geo.AddRectangle((0, 0), (1, 1), bcs=['wall', 'outlet', 'wall', 'inlet'])
+            mesh_filename = str(tmp_path / 'square_{}.vol'.format(maxh))
+            geo.GenerateMesh(maxh=maxh).Save(mesh_filename)
+            pipe_unstructured_stationary['MESH']['filename'] = mesh_filename
+
+            solver = get_solver_class(pipe_unstructured_stationary)(get_model_class('Stokes', False),
+                                                                   pipe_unstructured_stationary)
+            solver.solve()
+
+            assert solver.model.linear_solve_stats.num_unconverged == 0
+            iterations.append(solver.model.linear_solve_stats.total_iterations)
+
+        # The number of iterations must not grow as the mesh is refined.
+        assert max(iterations) < 100
+        assert max(iterations) <= 1.1 * min(iterations)
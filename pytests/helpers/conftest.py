@@ -0,0 +1,56 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+from pytest import fixture
+from ngsolve import BilinearForm, H1, Mesh, Parameter, dx, grad
+from opencmp.config_functions.expanded_config_parser import ConfigParser
+from opencmp.helpers.io import load_mesh
+
+
+@fixture
+def mesh() -> Mesh:
+    """
+    Function to return a coarse mesh of the unit square.
+
+    Returns:
+        The mesh.
+    """
+    c = ConfigParser('pytests/helpers/mesh/config_blank')
+    c['MESH'] = {'filename': 'pytests/mesh_files/unit_square_coarse.vol'}
+
+    return load_mesh(c)
+
+
+@fixture
+def assembled_form(mesh: Mesh) -> BilinearForm:
+    """
+    Function to return an assembled bilinear form for a small Poisson problem.
+
+    Args:
+        mesh: The mesh.
+
+    Returns:
+        The assembled bilinear form.
+    """
+    fes = H1(mesh, order=2, dirichlet='.*')
+    u, v = fes.TnT()
+
+    a = BilinearForm(fes)
+    a += (u * v + Parameter(0.1) * grad(u) * grad(v)) * dx
+    a.Assemble()
+
+    return a
@@ -0,0 +1,136 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+import numpy as np
+from opencmp.helpers.anderson import AndersonAccelerator
+
+
+def _fixed_point_problem(n: int = 50):
+    """
+    A linear fixed-point problem x = Mx + b whose plain iteration converges slowly.
+    """
+    rng = np.random.default_rng(0)
+    q, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    mat = q @ np.diag(np.linspace(0.0, 0.98, n)) @ q.T
+    b = rng.standard_normal(n)
+
+    return mat, b, np.linalg.solve(np.eye(n) - mat, b)
+
+
+def _iterate(mat, b, accelerator=None, max_iterations=300):
+    x = np.zeros(b.size)
+    if accelerator is not None:
+        accelerator.reset(b.size)
+
+    for i in range(max_iterations):
+        f = mat @ x + b - x
+        if np.linalg.norm(f) < 1e-10:
+            return x, i
+
+        if accelerator is None:
+            x += f
+        else:
+            accelerator.update(x, f)
+
+    return x, max_iterations
+
+
+class TestAndersonAccelerator:
+    """
+    Test Anderson mixing of fixed-point iterations.
+    """
+    def test_accelerates(self):
+        mat, b, solution = _fixed_point_problem()
+
+        _, plain_iterations = _iterate(mat, b)
+        x, anderson_iterations = _iterate(mat, b, AndersonAccelerator(keep_vectors=5, mixing_parameter=1.0))
+
+        assert np.allclose(x, solution, atol=1e-8)
+        assert anderson_iterations < plain_iterations
+
+    def test_ring_buffer(self):
+        mat, b, solution = _fixed_point_problem()
+
+        # Many more iterations than vectors kept, so the ring buffer wraps around repeatedly.
+        accelerator = AndersonAccelerator(keep_vectors=2, mixing_parameter=1.0)
+        x, _ = _iterate(mat, b, accelerator)
+
+        assert np.allclose(x, solution, atol=1e-8)
+        assert accelerator._num_vectors <= 2
+
+        # The Gram matrix kept up to date row by row matches the one of the final history.
+        num = accelerator._num_vectors
+        df = accelerator._df_hist[:num]
+        assert np.allclose(accelerator._gram[:num, :num], df @ df.T)
+
+        # So do the Cholesky factors updated as the oldest entry is dropped and the newest added.
+        order = accelerator._order(num)
+        gram = df[order] @ df[order].T
+        regularized = gram + accelerator.regularization ** 2 * np.diag(np.diag(gram))
+        assert np.allclose(accelerator._chol_gram[:num, :num], np.linalg.cholesky(gram))
+        assert np.allclose(accelerator._chol_mat[:num, :num], np.linalg.cholesky(regularized))
+
+        # The buffers are not re-allocated for a new solve of the same size.
+        dx_hist = accelerator._dx_hist
+        df_hist = accelerator._df_hist
+        accelerator.reset(b.size)
+        assert accelerator._dx_hist is dx_hist
+
+        # Each update after the first pushes the previous step into the ring buffer, in place.
+        x = np.zeros(b.size)
+        steps = []
+        for _ in range(4):
+            x_prev = x.copy()
+            accelerator.update(x, mat @ x + b - x)
+            steps.append(x - x_prev)
+
+            assert accelerator._dx_hist is dx_hist
+            assert accelerator._df_hist is df_hist
+
+        # The third step overwrote the oldest entry, the first step, and the second step is kept.
+        assert accelerator._num_vectors == 2
+        assert np.allclose(dx_hist[0], steps[2])
+        assert np.allclose(dx_hist[1], steps[1])
+
+    def test_first_update(self):
+        accelerator = AndersonAccelerator(mixing_parameter=0.5)
+        accelerator.reset(3)
+
+        # Without any history the update is linear mixing.
+        x = np.ones(3)
+        accelerator.update(x, np.array([2.0, 0.0, -2.0]))
+        assert np.allclose(x, [2.0, 1.0, 0.0])
+
+    def test_estimated_mixing_parameter(self):
+        accelerator = AndersonAccelerator()
+        accelerator.reset(2)
+
+        x = np.array([3.0, 4.0])
+        accelerator.update(x, np.array([10.0, 0.0]))
+
+        # min(1, 0.5 * max(1, |x|) / |f|)
+        assert np.isclose(accelerator.alpha, 0.25)
+
+    def test_singular(self):
+        accelerator = AndersonAccelerator(mixing_parameter=1.0)
+        accelerator.reset(2)
+
+        # Residual changes that are multiples of each other start the mixing over.
+        x = np.zeros(2)
+        accelerator.update(x, np.array([1.0, 0.0]))
+        accelerator.update(x, np.array([2.0, 0.0]))
+        accelerator.update(x, np.array([4.0, 0.0]))
+        assert accelerator._num_vectors == 0
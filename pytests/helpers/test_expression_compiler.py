@@ -0,0 +1,88 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+import gc
+
+from ngsolve import CoefficientFunction, GridFunction, H1, Integrate, Mesh, Parameter, sin, x, y
+from opencmp.helpers.expression_compiler import ExpressionCompiler
+
+
+class TestExpressionCompiler:
+    """ Class to test the compilation of parsed coefficientfunctions. """
+
+    def test_compile_in_place(self, mesh: Mesh):
+        """ Check that nested dictionaries and lists are compiled in place and still follow their parameters. """
+        compiler = ExpressionCompiler()
+        t = Parameter(0.5)
+        cf = sin(x * t) + y
+        vals = {'source': {'u': [cf, 2.0]}}
+        inner = vals['source']['u']
+
+        compiler.compile(vals)
+
+        assert vals['source']['u'] is inner
+        assert inner[0] is not cf
+        assert isinstance(inner[0], CoefficientFunction)
+        assert inner[1] == 2.0
+        assert compiler.compilations == 1
+
+        assert abs(Integrate(inner[0], mesh) - Integrate(cf, mesh)) < 1e-12
+        t.Set(1.5)
+        assert abs(Integrate(inner[0], mesh) - Integrate(cf, mesh)) < 1e-12
+
+    def test_reuse(self):
+        """ Check that a coefficientfunction is only compiled once. """
+        compiler = ExpressionCompiler()
+        cf = sin(x) * y
+        compiled = compiler.compile(cf)
+
+        assert compiler.compile(cf) is compiled
+        assert compiler.compile(compiled) is compiled
+        assert compiler.compilations == 1
+        assert compiler.reuses == 2
+
+    def test_release(self):
+        """ Check that the cache doesn't keep replaced coefficientfunctions alive. """
+        compiler = ExpressionCompiler()
+        t = Parameter(0.0)
+        kept = compiler.compile(sin(x * t))
+
+        # Simulate re-parsing an expression at every time step, only the latest value is kept by the model.
+        for i in range(50):
+            t.Set(i)
+            val = compiler.compile([sin(x * t) + y])
+        gc.collect()
+
+        assert compiler.compilations == 51
+        assert len(compiler._compiled) == 0
+        assert len(compiler._outputs) == 2
+        assert compiler.compile(kept) is kept
+        assert compiler.compile(val[0]) is val[0]
+
+    def test_skip(self, mesh: Mesh):
+        """ Check that parameters, gridfunctions, and values that aren't coefficientfunctions are left as is. """
+        compiler = ExpressionCompiler()
+        t = Parameter(0.5)
+        gfu = GridFunction(H1(mesh))
+        vals = [t, gfu, 1.0, 'file.sol', None]
+
+        compiler.compile(vals)
+
+        assert vals[0] is t
+        assert vals[1] is gfu
+        assert vals[2:] == [1.0, 'file.sol', None]
+        assert compiler.compilations == 0
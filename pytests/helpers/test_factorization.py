@@ -0,0 +1,192 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+from ngsolve import BilinearForm, Parameter, dx, grad
+from opencmp.helpers.factorization import FactorizationCache, assembled_forms_match
+
+
+class TestFactorizationCache:
+    """
+    Test the caching of direct solver factorizations.
+    """
+    def test_disabled(self, assembled_form: BilinearForm):
+        cache = FactorizationCache()
+
+        inv_1 = cache.get_inverse(assembled_form, assembled_form.space.FreeDofs(), 'sparsecholesky')
+        inv_2 = cache.get_inverse(assembled_form, assembled_form.space.FreeDofs(), 'sparsecholesky')
+
+        assert inv_1 is not inv_2
+        assert cache.hits == 0
+        assert cache.misses == 2
+
+    def test_reuse(self, assembled_form: BilinearForm):
+        cache = FactorizationCache()
+        cache.enabled = True
+
+        inv_1 = cache.get_inverse(assembled_form, assembled_form.space.FreeDofs(), 'sparsecholesky')
+        inv_2 = cache.get_inverse(assembled_form, assembled_form.space.FreeDofs(), 'sparsecholesky')
+
+        assert inv_1 is inv_2
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_clear(self, assembled_form: BilinearForm):
+        cache = FactorizationCache()
+        cache.enabled = True
+        cache.numeric_refactorization = True
+
+        inv_1 = cache.get_inverse(assembled_form, assembled_form.space.FreeDofs(), 'sparsecholesky')
+        cache.clear()
+        inv_2 = cache.get_inverse(assembled_form, assembled_form.space.FreeDofs(), 'sparsecholesky')
+
+        assert inv_1 is not inv_2
+        assert cache.hits == 0
+        assert cache.refactorizations == 0
+        assert cache.misses == 2
+
+    def test_invalidate(self, assembled_form: BilinearForm):
+        cache = FactorizationCache()
+        cache.enabled = True
+
+        inv_1 = cache.get_inverse(assembled_form, assembled_form.space.FreeDofs(), 'sparsecholesky')
+        cache.invalidate()
+        inv_2 = cache.get_inverse(assembled_form, assembled_form.space.FreeDofs(), 'sparsecholesky')
+
+        assert inv_1 is not inv_2
+        assert cache.hits == 0
+        assert cache.misses == 2
+
+    def test_numeric_refactorization(self, assembled_form: BilinearForm):
+        cache = FactorizationCache()
+        cache.enabled = True
+        cache.numeric_refactorization = True
+        freedofs = assembled_form.space.FreeDofs()
+
+        inv_1 = cache.get_inverse(assembled_form, freedofs, 'sparsecholesky')
+
+        # Change the matrix values but not the sparsity pattern.
+        assembled_form.mat.AsVector().data = 2.0 * assembled_form.mat.AsVector()
+        cache.invalidate()
+        inv_2 = cache.get_inverse(assembled_form, freedofs, 'sparsecholesky')
+
+        assert inv_1 is inv_2
+        assert cache.hits == 0
+        assert cache.refactorizations == 1
+        assert cache.misses == 1
+
+        # The refactorized inverse must match a factorization from scratch.
+        f = assembled_form.mat.CreateColVector()
+        f.SetRandom()
+        x_1 = f.CreateVector()
+        x_1.data = inv_2 * f
+        x_2 = f.CreateVector()
+        x_2.data = assembled_form.mat.Inverse(freedofs=freedofs, inverse='sparsecholesky') * f
+        x_1.data -= x_2
+
+        assert x_1.Norm() < 1e-10 * x_2.Norm()
+
+    def test_numeric_refactorization_without_reuse(self, assembled_form: BilinearForm):
+        cache = FactorizationCache()
+        cache.numeric_refactorization = True
+
+        inv_1 = cache.get_inverse(assembled_form, assembled_form.space.FreeDofs(), 'sparsecholesky')
+        inv_2 = cache.get_inverse(assembled_form, assembled_form.space.FreeDofs(), 'sparsecholesky')
+
+        # Without reuse every solve after the first is assumed to have new matrix values.
+        assert inv_1 is inv_2
+        assert cache.hits == 0
+        assert cache.refactorizations == 1
+        assert cache.misses == 1
+
+    def test_states(self, assembled_form: BilinearForm):
+        cache = FactorizationCache()
+        cache.enabled = True
+        cache.numeric_refactorization = True
+        cache.max_states = 2
+        freedofs = assembled_form.space.FreeDofs()
+
+        cache.set_state(0.1)
+        inv_1 = cache.get_inverse(assembled_form, freedofs, 'sparsecholesky')
+        cache.set_state(0.2)
+        inv_2 = cache.get_inverse(assembled_form, freedofs, 'sparsecholesky')
+
+        # Returning to an earlier state reuses its factorization.
+        cache.set_state(0.1)
+        assert cache.get_inverse(assembled_form, freedofs, 'sparsecholesky') is inv_1
+        assert inv_1 is not inv_2
+        assert cache.hits == 1
+        assert cache.misses == 2
+
+        # A third state takes over the factorization of the least recently used state.
+        cache.set_state(0.3)
+        assert cache.get_inverse(assembled_form, freedofs, 'sparsecholesky') is inv_2
+        assert cache.refactorizations == 1
+        assert cache.evictions == 1
+        assert len(cache) == 2
+        assert cache.hit_rate == 0.25
+
+    def test_memory_limit(self, assembled_form: BilinearForm):
+        cache = FactorizationCache()
+        cache.enabled = True
+        cache.max_states = 3
+        freedofs = assembled_form.space.FreeDofs()
+
+        cache.set_state(0.1)
+        cache.get_inverse(assembled_form, freedofs, 'sparsecholesky')
+
+        # Only leave room for a single factorization.
+        cache.max_memory = 1.5 * cache.memory
+        cache.set_state(0.2)
+        cache.get_inverse(assembled_form, freedofs, 'sparsecholesky')
+
+        assert len(cache) == 1
+        assert cache.evictions == 1
+
+
+class TestAssembledFormsMatch:
+    """
+    Test the detection of identical assembled operators.
+    """
+    def test_match(self, assembled_form: BilinearForm):
+        u, v = assembled_form.space.TnT()
+
+        # Same operator, built with the coefficients split up differently.
+        a = BilinearForm(assembled_form.space)
+        a += u * v * dx
+        a += Parameter(0.05) * grad(u) * grad(v) * dx
+        a += 0.05 * grad(u) * grad(v) * dx
+        a.Assemble()
+
+        assert assembled_forms_match(a, assembled_form)
+
+    def test_different_values(self, assembled_form: BilinearForm):
+        u, v = assembled_form.space.TnT()
+
+        a = BilinearForm(assembled_form.space)
+        a += (u * v + Parameter(0.2) * grad(u) * grad(v)) * dx
+        a.Assemble()
+
+        assert not assembled_forms_match(a, assembled_form)
+
+    def test_condensed(self, assembled_form: BilinearForm):
+        u, v = assembled_form.space.TnT()
+
+        a = BilinearForm(assembled_form.space, condense=True)
+        a += (u * v + Parameter(0.1) * grad(u) * grad(v)) * dx
+        a.Assemble()
+
+        assert not assembled_forms_match(a, assembled_form)
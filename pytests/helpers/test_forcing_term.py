@@ -0,0 +1,62 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+from numpy import isclose
+from opencmp.helpers.forcing_term import ForcingTerm
+
+
+class TestForcingTerm:
+    """
+    Test the choice of linear solver tolerances for inexact nonlinear solves.
+    """
+    def test_first_iteration(self):
+        forcing_term = ForcingTerm(1e-8, maximum=0.1)
+
+        # Nothing is known about the convergence rate yet.
+        forcing_term.update(1.0)
+        assert forcing_term.tolerance == 0.1
+
+    def test_converging(self):
+        forcing_term = ForcingTerm(1e-8, maximum=0.1)
+
+        forcing_term.update(1.0)
+        forcing_term.update(0.1)
+
+        # gamma * (0.1 / 1.0)^2
+        assert isclose(forcing_term.tolerance, 0.009)
+
+        # Rapid convergence is bounded by the smallest tolerance.
+        forcing_term.update(1e-12)
+        assert forcing_term.tolerance == 1e-8
+
+    def test_safeguard(self):
+        forcing_term = ForcingTerm(1e-8, maximum=0.5)
+
+        # The tolerance can't drop far below gamma * previous^alpha while that is still large.
+        forcing_term.update(1.0)
+        forcing_term.update(0.01)
+        assert isclose(forcing_term.tolerance, 0.9 * 0.5**2)
+
+    def test_reset(self):
+        forcing_term = ForcingTerm(1e-8, maximum=0.1)
+
+        forcing_term.update(1.0)
+        forcing_term.update(0.1)
+        forcing_term.reset()
+
+        assert forcing_term.tolerance == 0.1
+        forcing_term.update(0.05)
+        assert forcing_term.tolerance == 0.1
@@ -0,0 +1,96 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+import numpy as np
+from ngsolve import BaseVector, BitArray, Projector, solvers
+from ngsolve.la import CreateVVector
+from opencmp.helpers.jfnk import FiniteDifferenceJacobian
+
+
+def _residual(x: BaseVector, r: BaseVector) -> None:
+    """
+    The residual of x_i^2 = i + 1.
+    """
+    r.FV().NumPy()[:] = x.FV().NumPy() ** 2 - np.arange(1, x.size + 1)
+
+
+class TestFiniteDifferenceJacobian:
+    """
+    Test the finite difference approximation of the Jacobian used by the JFNK nonlinear solver.
+    """
+    def test_product(self):
+        freedofs = BitArray(4)
+        freedofs.Set()
+
+        x = CreateVVector(4)
+        x.FV().NumPy()[:] = [1.0, 2.0, 3.0, 4.0]
+        r = x.CreateVector()
+        _residual(x, r)
+
+        jacobian = FiniteDifferenceJacobian(_residual, x, r, freedofs)
+        v = x.CreateVector()
+        v.FV().NumPy()[:] = [1.0, -1.0, 0.5, 0.0]
+        y = x.CreateVector()
+        jacobian.Mult(v, y)
+
+        # J = diag(2 x)
+        assert np.allclose(y.FV().NumPy(), [2.0, -4.0, 3.0, 0.0], rtol=1e-6, atol=1e-6)
+        assert jacobian.num_evaluations == 1
+
+        # The product with zero doesn't need a residual evaluation.
+        v[:] = 0.0
+        jacobian.Mult(v, y)
+        assert np.allclose(y.FV().NumPy(), 0.0)
+        assert jacobian.num_evaluations == 1
+
+    def test_constrained_dofs(self):
+        freedofs = BitArray(3)
+        freedofs.Set()
+        freedofs.Clear(1)
+
+        x = CreateVVector(3)
+        x.FV().NumPy()[:] = [1.0, 1.0, 1.0]
+        r = x.CreateVector()
+        _residual(x, r)
+
+        jacobian = FiniteDifferenceJacobian(_residual, x, r, freedofs)
+        v = x.CreateVector()
+        v.FV().NumPy()[:] = [1.0, 1.0, 1.0]
+        y = x.CreateVector()
+        jacobian.Mult(v, y)
+
+        assert np.allclose(y.FV().NumPy(), [2.0, 0.0, 2.0], rtol=1e-6, atol=1e-6)
+
+    def test_newton(self):
+        freedofs = BitArray(3)
+        freedofs.Set()
+
+        # Newton's method with the Jacobian products solved by GMRes converges to sqrt(i + 1).
+        x = CreateVVector(3)
+        x.FV().NumPy()[:] = 1.0
+        r = x.CreateVector()
+        dx = x.CreateVector()
+        rhs = x.CreateVector()
+        for _ in range(8):
+            _residual(x, r)
+            rhs.data = -1.0 * r
+            dx[:] = 0.0
+            solver = solvers.GMResSolver(mat=FiniteDifferenceJacobian(_residual, x, r, freedofs),
+                                         pre=Projector(freedofs, True), tol=1e-12, maxiter=10, printrates=False)
+            solver.Solve(rhs=rhs, sol=dx, initialize=False)
+            x.data += dx
+
+        assert np.allclose(x.FV().NumPy(), np.sqrt([1.0, 2.0, 3.0]))
@@ -0,0 +1,81 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+from opencmp.helpers.linear_solve_stats import LinearSolveResult, LinearSolveStatistics
+
+
+class TestLinearSolveStatistics:
+    """
+    Test the aggregation of linear solve results.
+    """
+    def test_record(self):
+        stats = LinearSolveStatistics()
+
+        stats.record(LinearSolveResult('CG', 10, 1e-9, True, 0.5))
+        stats.record(LinearSolveResult('CG', 30, 1e-3, False, 1.5))
+
+        assert stats.num_solves == 2
+        assert stats.total_iterations == 40
+        assert stats.max_iterations == 30
+        assert stats.num_unconverged == 1
+        assert stats.total_wall_time == 2.0
+        assert stats.last_result.iterations == 30
+
+    def test_end_step(self):
+        stats = LinearSolveStatistics()
+
+        stats.record(LinearSolveResult('CG', 10, 1e-9, True, 0.5))
+        stats.record(LinearSolveResult('CG', 12, 1e-9, True, 0.5))
+        stats.end_step(0.1, 0.1, False)
+        stats.record(LinearSolveResult('CG', 5, 1e-9, True, 0.25))
+        stats.end_step(0.05, 0.05, True)
+
+        assert len(stats.steps) == 2
+        assert stats.steps[0] == {'time': 0.1, 'dt': 0.1, 'accepted': False, 'solves': 2, 'iterations': 22,
+                                  'unconverged': 0, 'wall_time': 1.0, 'nonlinear_iterations': 0}
+        assert stats.steps[1]['iterations'] == 5
+        assert stats.step_solves == 0
+
+        # The run totals include every time step.
+        assert stats.num_solves == 3
+        assert stats.total_iterations == 27
+
+    def test_nonlinear_iterations(self):
+        stats = LinearSolveStatistics()
+
+        stats.record(LinearSolveResult('GMRes', 8, 1e-9, True, 0.5))
+        stats.record_nonlinear_iteration()
+        stats.record(LinearSolveResult('GMRes', 4, 1e-9, True, 0.25))
+        stats.record_nonlinear_iteration()
+        stats.end_step(0.1, 0.1, True)
+
+        assert stats.steps[0]['nonlinear_iterations'] == 2
+        assert stats.step_nonlinear_iterations == 0
+        assert stats.nonlinear_iterations == 2
+        assert stats.summary().endswith('2 nonlinear iterations.')
+
+    def test_reset(self):
+        stats = LinearSolveStatistics()
+
+        stats.record(LinearSolveResult('direct', 0, 1e-14, True, 0.5))
+        stats.end_step(0.1, 0.1, True)
+        stats.reset()
+
+        assert stats.num_solves == 0
+        assert stats.steps == []
+        assert stats.last_result is None
+        assert stats.summary() == 'No linear solves.'
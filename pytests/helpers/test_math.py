@@ -16,8 +16,9 @@
 ########################################################################################################################
 
 from pytest import fixture
-from opencmp.helpers.math import tanh, sig, H_t, H_s, Max, Min
-from numpy import isclose
+from opencmp.helpers.math import tanh, sig, H_t, H_s, Max, Min, extrapolation_coefficients, bdf_coefficients, \
+    bdf_error_coefficient, dt_ladder_value
+from numpy import exp, isclose
 from ngsolve import Parameter, CoefficientFunction, Mesh, x
 from typing import Tuple
 from opencmp.config_functions.expanded_config_parser import ConfigParser
@@ -468,3 +469,82 @@ class TestMin:
 
         assert isclose(-10.5, min_right_a)
         assert isclose(min_right_a, min_right_b)
+
+
+class TestExtrapolationCoefficients:
+    def test_single_time(self):
+        # A single known value can only be held constant
+        assert isclose(extrapolation_coefficients([1.0], 2.0), [1.0]).all()
+
+    def test_linear_uniform(self):
+        # u_n+1 = 2 u_n - u_n-1 for a constant time step
+        assert isclose(extrapolation_coefficients([1.0, 0.5], 1.5), [2.0, -1.0]).all()
+
+    def test_quadratic_variable_step(self):
+        times = [0.3, 0.2, 0.0]
+        t = 0.45
+
+        # Extrapolating a quadratic must be exact
+        coefficients = extrapolation_coefficients(times, t)
+        values = [1.0 + 2.0 * s - 3.0 * s**2 for s in times]
+
+        assert isclose(sum(c * v for c, v in zip(coefficients, values)), 1.0 + 2.0 * t - 3.0 * t**2)
+        assert isclose(sum(coefficients), 1.0)
+
+
+class TestBDFCoefficients:
+    def test_implicit_euler(self):
+        # (u_n+1 - u_n) / dt
+        assert isclose(bdf_coefficients([1.5, 1.0]), [2.0, -2.0]).all()
+
+    def test_bdf2_uniform(self):
+        # (3/2 u_n+1 - 2 u_n + 1/2 u_n-1) / dt
+        assert isclose(bdf_coefficients([1.0, 0.5, 0.0]), [3.0, -4.0, 1.0]).all()
+
+    def test_cubic_variable_step(self):
+        times = [0.45, 0.3, 0.2, 0.0]
+
+        # Differentiating a cubic must be exact
+        coefficients = bdf_coefficients(times)
+        values = [1.0 + 2.0 * s - 3.0 * s**2 + s**3 for s in times]
+
+        assert isclose(sum(c * v for c, v in zip(coefficients, values)), 2.0 - 6.0 * times[0] + 3.0 * times[0]**2)
+        assert isclose(sum(coefficients), 0.0)
+
+
+class TestBDFErrorCoefficient:
+    def test_uniform(self):
+        # C / (C* - C) with the error constants of BDF1 to BDF3 and of the extrapolation
+        assert isclose(bdf_error_coefficient([1.0, 0.9], 1.1), 1.0 / 3.0)
+        assert isclose(bdf_error_coefficient([1.0, 0.9, 0.8], 1.1), 2.0 / 11.0)
+        assert isclose(bdf_error_coefficient([1.0, 0.9, 0.8, 0.7], 1.1), 3.0 / 25.0)
+
+    def test_local_error(self):
+        # One variable-step BDF step of u' = -u starting from the exact solution u = exp(-t)
+        for times in [[1.0, 0.99], [1.0, 0.992, 0.98], [1.0, 0.99, 0.985, 0.97]]:
+            t = 1.012
+            order = len(times) - 1
+
+            weights = bdf_coefficients([t] + times[:order])
+            u = -sum(w * exp(-s) for w, s in zip(weights[1:], times[:order])) / (weights[0] + 1.0)
+            u_pred = sum(c * exp(-s) for c, s in zip(extrapolation_coefficients(times, t), times))
+
+            # The estimate must match the true local error to within the higher order terms
+            estimate = bdf_error_coefficient(times, t) * abs(u - u_pred)
+            assert isclose(estimate, abs(u - exp(-t)), rtol=0.05)
+
+
+class TestDtLadderValue:
+    def test_rounds_down(self):
+        # The ladder is 0.1, 0.1 * 2^(-1/4), 0.1 * 2^(-1/2), ...
+        assert isclose(dt_ladder_value(0.09, 0.1, 4), 0.1 * 2.0 ** -0.25)
+        assert isclose(dt_ladder_value(0.06, 0.1, 4), 0.1 * 2.0 ** -0.75)
+
+    def test_clamps_to_max(self):
+        assert dt_ladder_value(0.5, 0.1, 4) == 0.1
+
+    def test_values_on_ladder_are_exact(self):
+        # Halving a value on the ladder moves it down exactly four steps.
+        dt = dt_ladder_value(0.03, 0.1, 4)
+        assert dt_ladder_value(dt, 0.1, 4) == dt
+        assert dt_ladder_value(dt / 2.0, 0.1, 4) == dt_ladder_value(0.015, 0.1, 4)
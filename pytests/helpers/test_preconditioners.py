@@ -0,0 +1,201 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+from pytest import importorskip, raises
+from ngsolve import BilinearForm, Parameter
+from ngsolve.krylovspace import CGSolver
+from opencmp.helpers.preconditioners import AMGPreconditioner, PreconditionerUpdatePolicy, preconditioner_registry, \
+    register_preconditioner
+
+
+class TestRegisterPreconditioner:
+    """
+    Test the registry of preconditioners that can be selected by name.
+    """
+    def test_builtin(self):
+        assert 'block diagonal' in preconditioner_registry
+        assert 'block triangular' in preconditioner_registry
+        assert 'amg' in preconditioner_registry
+
+    def test_register(self):
+        def constructor(model, a_assembled, dt):
+            return None
+
+        register_preconditioner('test preconditioner', constructor)
+        try:
+            assert preconditioner_registry['test preconditioner'] is constructor
+        finally:
+            del preconditioner_registry['test preconditioner']
+
+    def test_reserved_name(self):
+        with raises(ValueError):
+            register_preconditioner('None', lambda model, a_assembled, dt: None)
+
+
+class TestAMGPreconditioner:
+    """
+    Test the pyamg smoothed aggregation preconditioner.
+    """
+    def test_solve(self, assembled_form: BilinearForm):
+        importorskip('pyamg')
+        freedofs = assembled_form.space.FreeDofs()
+        pre = AMGPreconditioner(assembled_form, freedofs)
+        pre.Update()
+
+        f = assembled_form.mat.CreateColVector()
+        f.SetRandom()
+        x = f.CreateVector()
+        CGSolver(mat=assembled_form.mat, pre=pre, tol=1e-10, maxiter=100).Solve(rhs=f, sol=x)
+
+        # The result must match a direct solve on the free DOFs.
+        x_direct = f.CreateVector()
+        x_direct.data = assembled_form.mat.Inverse(freedofs=freedofs) * f
+        x.data -= x_direct
+
+        assert x.Norm() < 1e-8 * x_direct.Norm()
+
+    def test_constrained_dofs(self, assembled_form: BilinearForm):
+        importorskip('pyamg')
+        freedofs = assembled_form.space.FreeDofs()
+        pre = AMGPreconditioner(assembled_form, freedofs)
+
+        x = assembled_form.mat.CreateColVector()
+        x.SetRandom()
+        y = x.CreateVector()
+        y.data = pre * x
+
+        assert all(y[i] == 0.0 for i in range(len(y)) if not freedofs[i])
+
+    def test_hierarchy_reuse(self, assembled_form: BilinearForm):
+        importorskip('pyamg')
+        pre = AMGPreconditioner(assembled_form, assembled_form.space.FreeDofs())
+
+        # Reassembling with unchanged values must keep the hierarchy.
+        pre.Update()
+        assembled_form.Assemble()
+        pre.Update()
+
+        assert pre.num_builds == 1
+
+        # Changing the values must rebuild it.
+        assembled_form.mat.AsVector().data = 2.0 * assembled_form.mat.AsVector()
+        pre.Update()
+
+        assert pre.num_builds == 2
+
+
+class CountingPreconditioner:
+    """
+    Preconditioner stand-in that counts how often it has been rebuilt.
+    """
+    def __init__(self) -> None:
+        self.num_updates = 0
+
+    def Update(self) -> None:
+        self.num_updates += 1
+
+
+class TestPreconditionerUpdatePolicy:
+    """
+    Test the policy that decides when preconditioners are rebuilt.
+    """
+    def test_default(self):
+        policy = PreconditionerUpdatePolicy()
+        pre = CountingPreconditioner()
+        policy.track(pre)
+
+        for _ in range(3):
+            assert policy.update(pre)
+
+        assert pre.num_updates == 3
+        assert not policy.lagged
+
+    def test_interval(self):
+        policy = PreconditionerUpdatePolicy(interval=3)
+        pre = CountingPreconditioner()
+        policy.track(pre)
+
+        assert [policy.update(pre) for _ in range(7)] == [True, False, False, True, False, False, True]
+        assert policy.rebuilds == 3
+        assert policy.reuses == 4
+
+    def test_dt_change(self):
+        policy = PreconditionerUpdatePolicy(interval=0, dt_change=0.1)
+        pre = CountingPreconditioner()
+        dt = Parameter(1.0)
+        policy.track(pre, dt)
+
+        assert policy.update(pre)
+        dt.Set(1.05)
+        assert not policy.update(pre)
+        dt.Set(1.2)
+        assert policy.update(pre)
+
+    def test_iteration_growth(self):
+        policy = PreconditionerUpdatePolicy(interval=0, iteration_growth=1.5)
+        pre = CountingPreconditioner()
+        policy.track(pre)
+
+        assert policy.update(pre)
+        policy.record_iterations(pre, 10)
+        policy.record_iterations(pre, 15)
+        assert not policy.update(pre)
+        policy.record_iterations(pre, 16)
+        assert policy.update(pre)
+
+        # The first solve after the rebuild is the new reference.
+        policy.record_iterations(pre, 20)
+        assert not policy.update(pre)
+
+    def test_not_reusable(self):
+        policy = PreconditionerUpdatePolicy(interval=0)
+        pre = CountingPreconditioner()
+        policy.track(pre, reusable=False)
+
+        for _ in range(3):
+            assert policy.update(pre)
+
+    def test_none(self):
+        policy = PreconditionerUpdatePolicy(interval=0)
+
+        assert not policy.update(None)
+        assert policy.rebuilds == 0
+
+    def test_untrack(self):
+        policy = PreconditionerUpdatePolicy(interval=0)
+        pre = CountingPreconditioner()
+        policy.track(pre)
+        policy.update(pre)
+
+        policy.untrack(pre)
+        assert len(policy._states) == 0
+
+        # Untracking a preconditioner that isn't tracked does nothing.
+        policy.untrack(pre)
+        policy.untrack(None)
+
+    def test_replaced(self):
+        policy = PreconditionerUpdatePolicy(interval=0)
+        pre = CountingPreconditioner()
+        policy.track(pre)
+        policy.update(pre)
+
+        # A replaced preconditioner is not kept alive by the policy and its entry is dropped.
+        pre = CountingPreconditioner()
+        policy.track(pre)
+        assert len(policy._states) == 1
+        assert policy.update(pre)
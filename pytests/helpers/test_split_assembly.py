@@ -0,0 +1,130 @@
+########################################################################################################################
+# Copyright 2021 the authors (see AUTHORS file for full list).                                                         #
+#                                                                                                                      #
+# This file is part of OpenCMP.                                                                                        #
+#                                                                                                                      #
+# OpenCMP is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public  #
+# License as published by the Free Software Foundation, either version 2.1 of the License, or (at your option) any     #
+# later version.                                                                                                       #
+#                                                                                                                      #
+# OpenCMP is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied        #
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more  #
+# details.                                                                                                             #
+#                                                                                                                      #
+# You should have received a copy of the GNU Lesser General Public License along with OpenCMP. If not, see             #
+# <https://www.gnu.org/licenses/>.                                                                                     #
+########################################################################################################################
+
+from typing import Tuple
+from ngsolve import BaseVector, BilinearForm, H1, Mesh, Parameter, dx, grad
+from opencmp.helpers.split_assembly import SplitAssemblyCache
+
+
+def implicit_euler_form(mesh: Mesh, affine: bool = True) -> Tuple[BilinearForm, Parameter]:
+    """
+    Function to return the bilinear form of an implicit Euler step of the heat equation.
+
+    Args:
+        mesh: The mesh.
+        affine: If False the diffusion term is scaled by dt^2 instead of dt.
+
+    Returns:
+        The bilinear form and the time step parameter.
+    """
+    fes = H1(mesh, order=2, dirichlet='.*')
+    u, v = fes.TnT()
+    dt = Parameter(0.1)
+
+    a = BilinearForm(fes)
+    a += u * v * dx
+    a += (dt if affine else dt * dt) * grad(u) * grad(v) * dx
+
+    return a, dt
+
+
+def assembled_values(a: BilinearForm) -> BaseVector:
+    """
+    Function to return a copy of the matrix values of a fully assembled bilinear form.
+
+    Args:
+        a: The bilinear form.
+
+    Returns:
+        The matrix values.
+    """
+    a.Assemble()
+    values = a.mat.AsVector().CreateVector()
+    values.data = a.mat.AsVector()
+
+    return values
+
+
+class TestSplitAssemblyCache:
+    """
+    Test the assembly of bilinear forms from their constant and dt-proportional parts.
+    """
+    def test_disabled(self, mesh: Mesh):
+        cache = SplitAssemblyCache()
+        a, dt = implicit_euler_form(mesh)
+
+        cache.assemble(a, dt)
+        cache.assemble(a, dt)
+
+        assert cache.assemblies == 2
+        assert cache.combinations == 0
+
+    def test_reuse(self, mesh: Mesh):
+        cache = SplitAssemblyCache()
+        cache.enabled = True
+        a, dt = implicit_euler_form(mesh)
+
+        cache.assemble(a, dt)
+        cache.assemble(a, dt)
+
+        assert cache.assemblies == 3
+        assert cache.reuses == 1
+
+    def test_combination(self, mesh: Mesh):
+        cache = SplitAssemblyCache()
+        cache.enabled = True
+        a, dt = implicit_euler_form(mesh)
+
+        cache.assemble(a, dt)
+        dt.Set(0.37)
+        cache.assemble(a, dt)
+
+        assert cache.assemblies == 3
+        assert cache.combinations == 1
+
+        # The combined matrix must match a full assembly with the new dt.
+        values = a.mat.AsVector().CreateVector()
+        values.data = a.mat.AsVector()
+        expected = assembled_values(a)
+        values.data -= expected
+
+        assert values.Norm() < 1e-12 * expected.Norm()
+
+    def test_not_affine(self, mesh: Mesh):
+        cache = SplitAssemblyCache()
+        cache.enabled = True
+        a, dt = implicit_euler_form(mesh, affine=False)
+
+        cache.assemble(a, dt)
+        dt.Set(0.37)
+        cache.assemble(a, dt)
+
+        # The bilinear form is assembled in full every time after the split fails.
+        assert cache.assemblies == 4
+        assert cache.combinations == 0
+
+    def test_clear(self, mesh: Mesh):
+        cache = SplitAssemblyCache()
+        cache.enabled = True
+        a, dt = implicit_euler_form(mesh)
+
+        cache.assemble(a, dt)
+        cache.clear()
+        cache.assemble(a, dt)
+
+        assert cache.assemblies == 6
+        assert cache.reuses == 0